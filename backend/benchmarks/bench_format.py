@@ -0,0 +1,117 @@
+"""
+Group workbook formatting benchmark.
+
+Builds the unformatted group workbook from a few synthetic Step II reports,
+copies its rows up to ``--rows`` people (the report sheets only differ in how
+many people they list), then times format_xl on it and records the size of the
+formatted .xlsx and its number of conditional formatting rules. Run it before
+and after a formatting change to compare.
+
+Usage:
+    python backend/benchmarks/bench_format.py [--rows 500] [--repeat 3]
+                                              [--output results.json]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+
+import openpyxl as xl
+from common import quiet, time_call, write_results
+from synthetic import generate_reports
+
+from MBTInfo import group_report
+from MBTInfo.formatting import format_xl
+
+SOURCE_PEOPLE = 20
+
+# Sheet -> first row listing a person
+PERSON_SHEETS = {
+    "MBTI Results": 2,
+    "Facet Table": 2,
+    "Communicating": 4,
+    "Managing Change": 4,
+    "Managing Conflict": 4,
+}
+
+
+def build_unformatted_workbook(work_dir, seed):
+    """Run the group pipeline up to formatting and return the workbook path."""
+    input_dir = os.path.join(work_dir, "input")
+    unformatted_path = os.path.join(work_dir, "unformatted.xlsx")
+    generate_reports(input_dir, SOURCE_PEOPLE, seed)
+
+    def keep_unformatted(excel_file, **kwargs):
+        shutil.copy(excel_file, unformatted_path)
+
+    pipeline_format_xl = group_report.format_xl
+    group_report.format_xl = keep_unformatted
+    try:
+        group_report.process_group_report_fixed(
+            input_dir, os.path.join(work_dir, "output"), "bench_group.xlsx"
+        )
+    finally:
+        group_report.format_xl = pipeline_format_xl
+    return unformatted_path
+
+
+def scale_workbook(path, rows):
+    """Repeat the people of every person sheet until each lists ``rows`` people."""
+    workbook = xl.load_workbook(path)
+    for sheet_name, first_row in PERSON_SHEETS.items():
+        sheet = workbook[sheet_name]
+        people = [
+            list(values)
+            for values in sheet.iter_rows(min_row=first_row, values_only=True)
+            if values[0]
+        ]
+        for index in range(len(people), rows):
+            values = list(people[index % len(people)])
+            values[0] = f"{values[0]} ({index // len(people)})"
+            sheet.append(values)
+    workbook.save(path)
+
+
+def count_rules(path):
+    workbook = xl.load_workbook(path)
+    return sum(
+        len(formatting.rules)
+        for sheet in workbook.worksheets
+        for formatting in sheet.conditional_formatting
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        with quiet():
+            unformatted_path = build_unformatted_workbook(work_dir, args.seed)
+        scale_workbook(unformatted_path, args.rows)
+        formatted_path = os.path.join(work_dir, "formatted.xlsx")
+
+        def format_copy():
+            shutil.copy(unformatted_path, formatted_path)
+            format_xl(formatted_path)
+
+        with quiet():
+            stats, _ = time_call(format_copy, repeat=args.repeat)
+        stats["rows"] = args.rows
+        stats["xlsx_bytes"] = os.path.getsize(formatted_path)
+        stats["conditional_format_rules"] = count_rules(formatted_path)
+
+    print(
+        f"{args.rows} rows: {stats['xlsx_bytes'] / 1024:.0f} KiB, "
+        f"{stats['conditional_format_rules']} conditional formatting rules"
+    )
+    write_results("format", {"format_xl": stats}, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+End-to-end pipeline benchmark on synthetic Step II reports.
+
+Generates ``--people`` synthetic report PDFs and times each stage separately:
+text extraction, parsing, group workbook build, and personal, dual and
+translated PDF generation. Results are printed and, with ``--output``, written
+as JSON so runs can be compared across commits.
+
+Usage:
+    python backend/benchmarks/bench_pipeline.py [--people 10] [--repeat 3]
+                                                [--output results.json]
+"""
+
+import argparse
+import os
+import tempfile
+
+from common import quiet, time_call, write_results
+from synthetic import generate_reports
+
+from MBTInfo.consts import MEDIA_PATH
+from MBTInfo.data_extractor import extract_and_save_text
+from MBTInfo.dual_report import create_placeholder_image, generate_dual_report
+from MBTInfo.group_report import process_group_report_fixed
+from MBTInfo.personal_report import generate_personal_report
+from MBTInfo.renderer import render_pdf
+from MBTInfo.utils import (
+    check_communication,
+    check_managing_change,
+    check_managing_conflict,
+    collect_qualities,
+    find_and_parse_mbti_scores,
+    get_all_info,
+    get_three_repeating_explanations,
+)
+from MBTInterpret.mbti_to_pdf import generate_mbti_report
+
+TRANSLATED_GRAPH_COUNT = 7
+
+
+def extract_all(pdf_paths, text_dir):
+    return [extract_and_save_text(pdf_path, text_dir) for pdf_path in pdf_paths]
+
+
+def parse_all(text_paths):
+    for text_path in text_paths:
+        get_all_info(text_path)
+        find_and_parse_mbti_scores(text_path)
+        collect_qualities(text_path)
+        check_communication(text_path)
+        check_managing_change(text_path)
+        check_managing_conflict(text_path)
+        get_three_repeating_explanations(text_path)
+
+
+def write_translated_inputs(work_dir, pages=18):
+    """Write a translated text file and placeholder graphs for generate_mbti_report."""
+    text_path = os.path.join(work_dir, "translated_fixed.txt")
+    with open(text_path, "w", encoding="utf-8") as f:
+        for number in range(1, pages + 1):
+            f.write(f"--- Page {number} ---\n")
+            f.write("טקסט **מודגש** ו__מסומן__ בדוח המתורגם\n" * 25)
+
+    placeholder = create_placeholder_image()
+    image_paths = []
+    for index in range(TRANSLATED_GRAPH_COUNT):
+        image_paths.append(os.path.join(work_dir, f"graph_{index}.png"))
+        with open(image_paths[-1], "wb") as f:
+            f.write(placeholder)
+    return text_path, image_paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--people", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        input_dir = os.path.join(work_dir, "input")
+        output_dir = os.path.join(work_dir, "output")
+        text_dir = os.path.join(output_dir, "textfiles")
+        pdf_paths = generate_reports(input_dir, args.people, args.seed)
+
+        with quiet():
+            results["extract_text"], text_paths = time_call(
+                extract_all, pdf_paths, text_dir, repeat=args.repeat
+            )
+            results["parse"], _ = time_call(parse_all, text_paths, repeat=args.repeat)
+            results["group_workbook"], _ = time_call(
+                process_group_report_fixed,
+                input_dir,
+                os.path.join(output_dir, "group"),
+                "bench_group.xlsx",
+                repeat=args.repeat,
+            )
+            results["personal_pdf"], _ = time_call(
+                generate_personal_report,
+                pdf_paths[0],
+                output_dir,
+                "bench_personal.pdf",
+                repeat=args.repeat,
+            )
+            if len(pdf_paths) > 1:
+                results["dual_pdf"], _ = time_call(
+                    generate_dual_report,
+                    pdf_paths[0],
+                    pdf_paths[1],
+                    output_dir,
+                    repeat=args.repeat,
+                )
+            text_path, image_paths = write_translated_inputs(work_dir)
+            results["translated_pdf"], _ = time_call(
+                generate_mbti_report,
+                text_path,
+                os.path.join(output_dir, "bench_translated.html"),
+                os.path.join(output_dir, "bench_translated.pdf"),
+                str(MEDIA_PATH / "full_logo.png"),
+                'דו"ח MBTI בתרגום לעברית עבור: ',
+                image_paths,
+                render_pdf,
+                repeat=args.repeat,
+            )
+
+    for stats in results.values():
+        stats["people"] = args.people
+    write_results("pipeline", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
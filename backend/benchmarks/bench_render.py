@@ -0,0 +1,141 @@
+"""
+Render benchmark for each report type.
+
+Times HTML assembly and WeasyPrint PDF rendering of the personal, dual,
+translated and group data reports from synthetic input, so no source PDFs,
+OpenAI key or running server are needed.
+
+Usage:
+    python backend/benchmarks/bench_render.py [--repeat 5] [--html-only]
+                                              [--output results.json]
+"""
+
+import argparse
+import os
+import tempfile
+
+from common import quiet, time_call, write_results
+
+from MBTInfo.consts import MEDIA_PATH
+from MBTInfo.dual_report import build_dual_report_html, create_placeholder_image
+from MBTInfo.html_templates import get_html_report_template
+from MBTInfo.personal_report import generate_html_report
+from MBTInfo.renderer import LOGO_ASSET_URL, render_pdf, task_url
+from MBTInterpret.mbti_to_pdf import generate_html_content
+
+BENCH_ID = "bench"
+FACETS = ["questioning", "critical", "tough"]
+
+
+def build_personal():
+    info = {"name": "Bench Person", "type": "INTJ", "dominant": "Intuition"}
+    explanations = {
+        facet: [f"{facet} explanation {i} " * 20 for i in range(3)] for facet in FACETS
+    }
+    descriptors = {facet: f"{facet} descriptor " * 30 for facet in FACETS}
+    with quiet():
+        html = generate_html_report(
+            info, {}, [], [], [], explanations, descriptors, f"{BENCH_ID}.pdf"
+        )
+    return html, "personal", {}
+
+
+def build_dual():
+    graph_urls = {}
+    resources = {}
+    placeholder = create_placeholder_image()
+    for name in ["first", "EI", "TF", "JP", "SN", "dominant"]:
+        graph_urls[name] = task_url(BENCH_ID, f"{name}.png")
+        resources[graph_urls[name]] = placeholder
+    html = build_dual_report_html(
+        {"name": "Person One", "type": "ENFP"},
+        {"name": "Person Two", "type": "ISTJ"},
+        graph_urls,
+        LOGO_ASSET_URL,
+    )
+    return html, "dual", resources
+
+
+def build_translated():
+    placeholder = create_placeholder_image()
+    header_url = task_url(BENCH_ID, "logo.png")
+    resources = {header_url: (MEDIA_PATH / "full_logo.png").read_bytes()}
+    image_urls = []
+    for index in range(7):
+        image_urls.append(task_url(BENCH_ID, f"graph_{index}.png"))
+        resources[image_urls[-1]] = placeholder
+    pages = [
+        f"{number} --- " + "טקסט **מודגש** ו__מסומן__ בדוח המתורגם\n" * 25
+        for number in range(1, 19)
+    ]
+    html = generate_html_content(
+        header_url,
+        pages,
+        image_urls,
+        "All rights reserved. TEMBTI©.",
+        'דו"ח MBTI בתרגום לעברית עבור: ',
+    )
+    return html, "translated", resources
+
+
+def _table(header, rows):
+    head = "".join(f"<th>{cell}</th>" for cell in header)
+    body = "".join(
+        "<tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>" for row in rows
+    )
+    return f"<table><tr>{head}</tr>{body}</table>"
+
+
+def build_group_data(people=200):
+    html = get_html_report_template(
+        people,
+        "2024-01-01",
+        _table(["Type", "Count"], [("INTJ", people)]),
+        _table(["Dichotomy", "Count"], [("E", people // 2), ("I", people // 2)]),
+        _table(["Dominant", "Count"], [("Intuition", people)]),
+        _table(
+            ["Name", "Type", "Dominant"],
+            [(f"Person {i}", "INTJ", "Intuition") for i in range(people)],
+        ),
+    )
+    return html, "group_data", {}
+
+
+REPORTS = {
+    "personal": build_personal,
+    "dual": build_dual,
+    "translated": build_translated,
+    "group_data": build_group_data,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--html-only", action="store_true")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, build in REPORTS.items():
+            results[f"{name}.html"], (html, template, resources) = time_call(
+                build, repeat=args.repeat
+            )
+            if args.html_only:
+                continue
+            output_path = os.path.join(tmp_dir, f"{name}.pdf")
+            results[f"{name}.pdf"], _ = time_call(
+                render_pdf,
+                html,
+                output_path,
+                template=template,
+                resources=resources,
+                repeat=args.repeat,
+            )
+
+    write_results("render", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
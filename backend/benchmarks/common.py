@@ -0,0 +1,101 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Importing this module puts backend/src on sys.path and, unless already set,
+points PROJECT_BASE_DIR at a throwaway workspace holding a copy of
+backend/media, so benchmarks never write into the repository.
+"""
+
+import atexit
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_DIR = REPO_ROOT / "backend" / "src"
+
+if "PROJECT_BASE_DIR" not in os.environ:
+    WORKSPACE = Path(tempfile.mkdtemp(prefix="mbti_bench_"))
+    shutil.copytree(REPO_ROOT / "backend" / "media", WORKSPACE / "backend" / "media")
+    atexit.register(shutil.rmtree, WORKSPACE, ignore_errors=True)
+    os.environ["PROJECT_BASE_DIR"] = str(WORKSPACE)
+else:
+    WORKSPACE = Path(os.environ["PROJECT_BASE_DIR"])
+
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+
+@contextlib.contextmanager
+def quiet():
+    """Swallow the pipeline's progress prints while a stage is timed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def time_call(func, *args, repeat=5, **kwargs):
+    """
+    Call a function repeatedly and summarise its wall-clock time.
+
+    Returns:
+        tuple: (stats dict in milliseconds, result of the last call)
+    """
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        timings.append((time.perf_counter() - start) * 1000)
+    stats = {
+        "runs": repeat,
+        "min_ms": round(min(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "max_ms": round(max(timings), 3),
+    }
+    return stats, result
+
+
+def git_commit():
+    """Return the current git commit hash, or None outside a git checkout."""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(name, results, output_path=None):
+    """
+    Print benchmark results and optionally save them as JSON.
+
+    Args:
+        name: Benchmark name
+        results: dict of stage name -> time_call() stats
+        output_path: Optional JSON file to write
+    """
+    report = {
+        "benchmark": name,
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "results": results,
+    }
+    for stage, stats in results.items():
+        print(f"{stage:<40} median {stats['median_ms']:>10.1f} ms")
+    if output_path:
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Results written to {output_path}")
+    return report
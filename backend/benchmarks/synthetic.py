@@ -0,0 +1,150 @@
+"""
+Synthetic MBTI Step II reports for benchmarking.
+
+The generated PDFs mimic the parts of a real Step II interpretive report that
+the parsers in MBTInfo.utils rely on: the name/date lines on the first page,
+the dichotomy score line, "in-preference" / "midzone" / "out-of-preference"
+facet results, "|<page>" page markers and the communication, change and
+conflict management sections on pages 9, 11 and 12.
+
+Usage:
+    python backend/benchmarks/synthetic.py OUTPUT_DIR [--count 10] [--seed 0]
+"""
+
+import argparse
+import os
+import random
+
+import common  # noqa: F401  (puts backend/src on sys.path)
+import fitz
+
+from MBTInfo.consts import FACETS, MBTI_TYPES
+
+PAGE_COUNT = 16
+LINES_PER_PAGE = 60
+FACET_PAIRS = list(zip(FACETS[::2], FACETS[1::2]))
+DICHOTOMY_PAIRS = [
+    ("EXTRAVERSION", "INTROVERSION"),
+    ("SENSING", "INTUITION"),
+    ("THINKING", "FEELING"),
+    ("JUDGING", "PERCEIVING"),
+]
+SECTION_PAGES = {
+    9: "YOUR FACET RESULT COMMUNICATION STYLE ENHANCING YOUR STYLE",
+    11: "YOUR FACET RESULT CHANGE MANAGEMENT STYLE ENHANCING YOUR STYLE",
+    12: "YOUR FACET RESULT CONFLICT MANAGEMENT STYLE ENHANCING YOUR STYLE",
+}
+FILLER = "This paragraph stands in for the narrative text of the report."
+
+
+def _pole_letter(pole):
+    return "N" if pole == "INTUITION" else pole[0]
+
+
+def _type_and_scores(rng):
+    mbti_type = rng.choice(MBTI_TYPES)
+    scores = []
+    for first, second in DICHOTOMY_PAIRS:
+        strength = rng.randint(1, 30)
+        if _pole_letter(first) in mbti_type:
+            scores += [(first, strength), (second, 0)]
+        else:
+            scores += [(first, 0), (second, strength)]
+    return mbti_type, scores
+
+
+def build_report_pages(name, rng):
+    """
+    Build the text of each page of a synthetic report.
+
+    Args:
+        name: Person name written on the first page
+        rng: random.Random used for the type, scores and facet results
+
+    Returns:
+        list of page texts (first page first)
+    """
+    mbti_type, scores = _type_and_scores(rng)
+    header = ["MBTI Step II", "Interpretive Report", "Developed by", "Naomi"]
+    header += ["Quenk", "Jean", "Kummerow", "Report prepared for"]
+    pages = [header + [name, "January 1, 2024", f"Reported type: {mbti_type}"]]
+
+    score_line = " ".join(f"{pole} | {score}" for pole, score in scores)
+    pages.append(["|2", "YOUR PREFERENCE CLARITY", score_line])
+
+    # The parsers drop the first match of each result kind, so every kind
+    # opens with an introductory sentence
+    results = [
+        ("Facets you score on the side of your", "in-preference"),
+        ("Facets where you fall in the", "midzone"),
+        ("Facets on the opposite side are", "out-of-preference"),
+    ]
+    facet_results = {}
+    for first, second in FACET_PAIRS:
+        kind = rng.choice(["in-preference", "midzone", "out-of-preference"])
+        facet = rng.choice([first, second])
+        facet_results[facet] = kind
+        results.append((f"{first} and {second}: your result was {facet}", kind))
+    result_pages = [[f"|{page_number}"] for page_number in range(3, 9)]
+    for index, (line, kind) in enumerate(results):
+        result_pages[index * len(result_pages) // len(results)] += [line, kind]
+    pages += result_pages
+
+    repeating = rng.sample(list(facet_results), 3)
+    for page_number in range(9, PAGE_COUNT + 1):
+        lines = [f"|{page_number}"]
+        if page_number in SECTION_PAGES:
+            lines.append(SECTION_PAGES[page_number])
+            extra = rng.sample(list(facet_results), 2)
+            lines += [f"{facet} {FILLER.lower()}" for facet in repeating + extra]
+        pages.append(lines)
+
+    return [
+        "\n".join((lines + [FILLER] * LINES_PER_PAGE)[:LINES_PER_PAGE])
+        for lines in pages
+    ]
+
+
+def write_report_pdf(pages, output_path):
+    """Write page texts to a PDF with PyMuPDF."""
+    document = fitz.open()
+    for text in pages:
+        page = document.new_page()
+        page.insert_text((36, 36), text, fontsize=8)
+    document.save(output_path)
+    document.close()
+    return output_path
+
+
+def generate_reports(output_dir, count, seed=0):
+    """
+    Write ``count`` synthetic report PDFs.
+
+    Returns:
+        list of PDF paths
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    rng = random.Random(seed)
+    paths = []
+    for index in range(count):
+        name = f"Person-{index:04d}"
+        pages = build_report_pages(name.replace("-", " "), rng)
+        paths.append(
+            write_report_pdf(pages, os.path.join(output_dir, f"{name}-bench.pdf"))
+        )
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("output_dir")
+    parser.add_argument("--count", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = generate_reports(args.output_dir, args.count, args.seed)
+    print(f"✅ Wrote {len(paths)} synthetic reports to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,8 +7,8 @@ import pandas as pd
 import PyPDF2
 from dotenv import load_dotenv
 from pdf2image import convert_from_path
-from weasyprint import HTML
 
+from .aggregates import load_aggregates
 from .consts import (
     ALL_MBTI_TYPES,
     COL_DOMINANT,
@@ -39,15 +39,20 @@ from .consts import (
     REPORT_DATA_PDF,
     REPORT_DUAL_PDF,
     SHEET_NAME_DATA,
-    SHEET_NAME_MBTI_RESULTS,
+    STAGE_TIMEOUTS,
     UNKNOWN_VALUE,
     VALIDATION_SYSTEM_PROMPT,
 )
+from .dataset import load_records, records_frame
 from .html_templates import get_html_report_template
+from .renderer import render_pdf
+from .telemetry import timed
 
 load_dotenv()
 openai.api_key = os.getenv("OPENAI_API_KEY")
-client = openai.OpenAI()
+# A hung request fails instead of holding a report worker
+openai.timeout = STAGE_TIMEOUTS["gpt"]
+client = openai.OpenAI(timeout=STAGE_TIMEOUTS["gpt"])
 
 
 def extract_data_from_excel_fixed(
@@ -59,22 +64,23 @@ def extract_data_from_excel_fixed(
 
     os.makedirs(output_dir, exist_ok=True)
 
-    print("Reading MBTI Results sheet (the actual data)...")
-    mbti_df = pd.read_excel(excel_path, sheet_name=SHEET_NAME_MBTI_RESULTS)
+    print("Loading the group's records...")
+    mbti_df = records_frame(load_records(excel_path))
 
     print(f"MBTI Results shape: {mbti_df.shape}")
     print("Sample data:")
     print(mbti_df.head())
 
-    # Create the summary that the Data sheet was supposed to show
-    type_counts = mbti_df[COL_TYPE].value_counts()
+    # Counts of the Data sheet, from the report's aggregates
+    aggregates = load_aggregates(excel_path)
+    type_counts = aggregates["types"]
     print("\nMBTI Type Counts:")
     print(type_counts)
 
     # Create a proper data structure for the PDF
     summary_data = {MBTI_TYPES_KEY: [], COUNT_KEY: [], PERCENTAGE_KEY: []}
 
-    total_people = len(mbti_df)
+    total_people = aggregates["people"]
 
     for mbti_type in ALL_MBTI_TYPES:
         count = type_counts.get(mbti_type, 0)
@@ -85,30 +91,24 @@ def extract_data_from_excel_fixed(
 
     summary_df = pd.DataFrame(summary_data)
 
-    # Function to determine dominant function
-    def get_dominant_function(mbti_type):
-        """Determine dominant cognitive function based on MBTI type"""
-        if not mbti_type or len(mbti_type) != 4:
-            return UNKNOWN_VALUE
-
-        return DOMINANT_FUNCTIONS.get(mbti_type, UNKNOWN_VALUE)
-
-    individual_results = []
-    for _, row in mbti_df.iterrows():
-        name = row.get(COL_NAME, UNKNOWN_VALUE)
-        mbti_type = row.get(COL_TYPE, UNKNOWN_VALUE)
-        dominant = get_dominant_function(mbti_type)
-        individual_results.append(
-            {COL_NAME: name, COL_MBTI_TYPE: mbti_type, COL_DOMINANT: dominant}
-        )
-
-    individual_df = pd.DataFrame(individual_results)
+    # One row per person; types without a known dominant function (missing
+    # or malformed) show as unknown
+    individual_df = pd.DataFrame(
+        {
+            COL_NAME: mbti_df.get(COL_NAME, UNKNOWN_VALUE),
+            COL_MBTI_TYPE: mbti_df.get(COL_TYPE, UNKNOWN_VALUE),
+        },
+        index=mbti_df.index,
+    )
+    individual_df[COL_DOMINANT] = (
+        individual_df[COL_MBTI_TYPE].map(DOMINANT_FUNCTIONS).fillna(UNKNOWN_VALUE)
+    )
 
-    dichotomy_data = calculate_dichotomy_analysis(mbti_df, total_people)
+    dichotomy_data = calculate_dichotomy_analysis(aggregates)
     dichotomy_df = pd.DataFrame(dichotomy_data)
 
     # Add dominant function analysis
-    dominant_counts = individual_df[COL_DOMINANT].value_counts()
+    dominant_counts = aggregates["dominant"]
     dominant_analysis = []
     for func in DOMINANT_FUNCTIONS_LIST:
         count = dominant_counts.get(func, 0)
@@ -135,48 +135,20 @@ def extract_data_from_excel_fixed(
     )
 
     output_path = os.path.join(output_dir, REPORT_DATA_PDF)
-    HTML(string=html_content).write_pdf(output_path)
+    render_pdf(html_content, output_path, template="group_data")
     print(f"Enhanced data report saved to: {output_path}")
     return output_path
 
 
-def calculate_dichotomy_analysis(mbti_df, total_people):
+def calculate_dichotomy_analysis(aggregates):
     dichotomy_data = {}
+    total_people = aggregates["people"]
     if total_people > 0:
-        e_count = len([t for t in mbti_df[COL_TYPE] if t and t[0] == "E"])
-        i_count = len([t for t in mbti_df[COL_TYPE] if t and t[0] == "I"])
-        s_count = len([t for t in mbti_df[COL_TYPE] if t and t[1] == "S"])
-        n_count = len([t for t in mbti_df[COL_TYPE] if t and t[1] == "N"])
-        t_count = len([t for t in mbti_df[COL_TYPE] if t and t[2] == "T"])
-        f_count = len([t for t in mbti_df[COL_TYPE] if t and t[2] == "F"])
-        j_count = len([t for t in mbti_df[COL_TYPE] if t and t[3] == "J"])
-        p_count = len([t for t in mbti_df[COL_TYPE] if t and t[3] == "P"])
-
+        counts = [aggregates["dichotomies"][letter] for letter in "EISNTFJP"]
         dichotomy_data = {
             "Dichotomy": DICHOTOMY_NAMES,
-            "Count": [
-                e_count,
-                i_count,
-                s_count,
-                n_count,
-                t_count,
-                f_count,
-                j_count,
-                p_count,
-            ],
-            "Percentage": [
-                f"{c / total_people * 100:.1f}%"
-                for c in [
-                    e_count,
-                    i_count,
-                    s_count,
-                    n_count,
-                    t_count,
-                    f_count,
-                    j_count,
-                    p_count,
-                ]
-            ],
+            "Count": counts,
+            "Percentage": [f"{c / total_people * 100:.1f}%" for c in counts],
         }
     return dichotomy_data
 
@@ -223,6 +195,7 @@ def group_user_prompt(
     return GROUP_USER_PROMPT.strip()
 
 
+@timed("gpt")
 def ask_gpt_with_images(content_blocks, prompt, model=MODEL_GPT4O):
     messages = [
         {"role": "system", "content": prompt},
@@ -301,6 +274,7 @@ def process_pdf_with_gpt(pdf_path, content_blocks):
         return {"status": "not_mbti", "reason": validation_response}
 
 
+@timed("gpt")
 def upload_file_and_ask_question(
     file_path, question, system_prompt, model=MODEL_GPT4_TURBO
 ):
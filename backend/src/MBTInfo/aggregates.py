@@ -0,0 +1,169 @@
+"""
+Group aggregates: the counts behind the group workbook's Data sheet.
+
+compute_aggregates counts types, dichotomy letters, facet preferences,
+internal/external letter pairs and dominant functions from the parsed records
+with column operations, once per report. The Data sheet is written from these
+values rather than COUNTIF formulas, which openpyxl cannot evaluate (pandas and
+other readers saw empty cells), and save_aggregates stores them next to the
+workbook for the group insight and data report.
+"""
+
+import json
+import os
+
+import pandas as pd
+
+from .consts import (
+    AGGREGATES_FILE_SUFFIX,
+    COL_TYPE,
+    DOMINANT_FUNCTIONS,
+    EXTERNAL_TYPES,
+    FACETS,
+    INTERNAL_TYPES,
+    MBTI_TYPES,
+)
+from .dataset import load_records, records_frame
+
+# (first facet, second facet) of each facet dichotomy, in report order
+FACET_PAIRS = list(zip(FACETS[::2], FACETS[1::2]))
+
+# Letters of each dichotomy, in type order
+DICHOTOMY_LETTERS = ("EI", "SN", "TF", "JP")
+
+# 16x4 lookup of each type's letters, one column per dichotomy. Letter, pair
+# and dominant counts are sums of the 16 type counts over this table, so the
+# records are only scanned once for types.
+TYPE_LETTERS = pd.DataFrame(
+    [list(mbti_type) for mbti_type in MBTI_TYPES],
+    index=MBTI_TYPES,
+    columns=DICHOTOMY_LETTERS,
+)
+TYPE_DOMINANTS = pd.Series(DOMINANT_FUNCTIONS).reindex(MBTI_TYPES)
+
+
+# Count groups of an aggregates dict, besides the number of people
+AGGREGATE_GROUPS = (
+    "types",
+    "dichotomies",
+    "internal",
+    "external",
+    "dominant",
+    "facets",
+    "midzone",
+)
+
+
+def facet_pair_name(first, second):
+    return f"{first}-{second}"
+
+
+def _counts(type_counts, groups, keys):
+    """Sum the type counts by group (a per-type Series) for the given keys."""
+    counts = type_counts.groupby(groups).sum()
+    return {key: int(counts.get(key, 0)) for key in keys}
+
+
+def compute_aggregates(records):
+    """
+    Count the group's types, preferences and facets.
+
+    Letter, pair and dominant counts only include valid MBTI types. A facet
+    counts as clear for a person when it is IN-PREF or OUT-OF-PREF, and a
+    facet dichotomy is MIDZONE when either of its facets is.
+
+    Args:
+        records: DataFrame with a Type column and one column per facet
+
+    Returns:
+        dict: {"people": int, "types", "dichotomies", "internal", "external",
+        "dominant", "facets", "midzone": {name: count}}
+    """
+    types = records[COL_TYPE].fillna("").astype(str).str.strip().str.upper()
+    type_counts = types.value_counts().reindex(MBTI_TYPES, fill_value=0)
+
+    dichotomies = {}
+    for letters in DICHOTOMY_LETTERS:
+        dichotomies.update(_counts(type_counts, TYPE_LETTERS[letters], letters))
+
+    states = records.reindex(columns=FACETS)
+    clear = states.isin(("IN-PREF", "OUT-OF-PREF")).sum()
+    midzone = states.eq("MIDZONE")
+
+    return {
+        "people": len(records),
+        "types": {mbti_type: int(count) for mbti_type, count in type_counts.items()},
+        "dichotomies": dichotomies,
+        "internal": _counts(
+            type_counts, TYPE_LETTERS["SN"] + TYPE_LETTERS["TF"], INTERNAL_TYPES
+        ),
+        "external": _counts(
+            type_counts, TYPE_LETTERS["EI"] + TYPE_LETTERS["JP"], EXTERNAL_TYPES
+        ),
+        "dominant": _counts(
+            type_counts, TYPE_DOMINANTS, sorted(set(DOMINANT_FUNCTIONS.values()))
+        ),
+        "facets": {facet: int(clear[facet]) for facet in FACETS},
+        "midzone": {
+            facet_pair_name(first, second): int(
+                (midzone[first] | midzone[second]).sum()
+            )
+            for first, second in FACET_PAIRS
+        },
+    }
+
+
+def aggregates_frame(aggregates):
+    """
+    Aggregates as one table (Group, Category, Count), e.g. for the AI prompt.
+    """
+    rows = [
+        (group, category, count)
+        for group in AGGREGATE_GROUPS
+        for category, count in aggregates[group].items()
+    ]
+    return pd.DataFrame(rows, columns=["Group", "Category", "Count"])
+
+
+def merge_aggregates(*aggregates):
+    """
+    Aggregates of several groups of people taken together.
+
+    Every count is a number of people, so the counts of e.g. a group and the
+    people added to it are summed instead of recounting all the records.
+    """
+    merged = {"people": sum(counts["people"] for counts in aggregates)}
+    for group in AGGREGATE_GROUPS:
+        merged[group] = {}
+        for counts in aggregates:
+            for category, count in counts[group].items():
+                merged[group][category] = merged[group].get(category, 0) + count
+    return merged
+
+
+def aggregates_path(excel_path):
+    return os.path.splitext(excel_path)[0] + AGGREGATES_FILE_SUFFIX
+
+
+def save_aggregates(excel_path, aggregates):
+    """Write a workbook's aggregates to its sidecar JSON file."""
+    path = aggregates_path(excel_path)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(aggregates, f, indent=2)
+    return path
+
+
+def load_aggregates(excel_path):
+    """
+    Aggregates of a group workbook.
+
+    Reads the sidecar JSON, or computes them from the workbook's records for
+    workbooks built before sidecars were written.
+    """
+    path = aggregates_path(excel_path)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    print(f"⚠️ No aggregates file for {excel_path}, counting its records")
+    return compute_aggregates(records_frame(load_records(excel_path)))
@@ -0,0 +1,639 @@
+"""
+Report pipeline jobs.
+
+Each job is an async function taking JSON-serialisable arguments, run by the
+API's in-process job queue or by a report worker (python -m MBTInfo.worker).
+Jobs report through update_task_status and never raise.
+"""
+
+import asyncio
+import os
+import traceback
+from datetime import datetime
+from pathlib import Path
+
+from MBTInterpret.main import create_translated_pdf
+
+from .aggregates import aggregates_frame, load_aggregates
+from .consts import MEDIA_DIR, OUTPUT_DIR, PERSONAL_BATCH_WORKERS, TEMP_DIR
+from .dual_report import generate_dual_report
+from .extract_image import extract_multiple_graphs_from_pdf
+from .group_report import append_group_report, process_group_report_fixed
+from .MBTInsight import (
+    extract_data_from_excel_fixed,
+    group_user_prompt,
+    process_pdf_with_gpt,
+)
+from .personal_report import generate_personal_report
+from .renderer import read_stylesheet, render_pdf
+from .tasks import (
+    TaskCancelled,
+    TaskItem,
+    cancellation_check,
+    stage_deadline,
+    task_progress_callback,
+    update_task_status,
+)
+from .telemetry import span
+from .templating import render_template
+from .utils import sanitize_filename, sanitize_path_component
+
+# Insight HTML is also served to browsers, so its stylesheet stays inline
+INSIGHT_REPORT_CSS = read_stylesheet("insight")
+
+
+def wrap_html_with_header(
+    content_html,
+    report_title="MBTI Insight Report",
+    subject_name="",
+    logo_url="/media/full_logo.png",
+):
+    """Wraps the provided HTML content with full HTML structure, CSS, and header."""
+    # Build the logo image HTML if logo_url is provided
+    logo_html = f'<img src="{logo_url}" alt="Logo" />' if logo_url else ""
+
+    # Build the title HTML
+    title_html = f"<h1>{report_title}</h1>" if report_title else ""
+    subtitle_html = f"<h2>{subject_name}</h2>" if subject_name else ""
+
+    # Build the header section
+    header_html = ""
+    if logo_html or title_html or subtitle_html:
+        header_html = render_template(
+            "insight_header", logo=logo_html, title=title_html, subtitle=subtitle_html
+        )
+
+    full_html = render_template(
+        "insight_report",
+        report_title=report_title,
+        subject_name=subject_name,
+        styles=INSIGHT_REPORT_CSS,
+        header=header_html,
+        content=content_html,
+    )
+    return full_html
+
+
+async def group_insight_background(task_id: str, excel_path: str, req_data: dict):
+    """Background task for generating group insight"""
+    try:
+        update_task_status(task_id, "processing", "Extracting data from Excel...")
+
+        table_pdf_path = await asyncio.to_thread(
+            extract_data_from_excel_fixed, excel_path
+        )
+        print(f"Data table PDF generated at: {table_pdf_path}")
+
+        update_task_status(task_id, "processing", "Building analysis prompt...")
+
+        user_prompt = group_user_prompt(
+            req_data.get("group_name", ""),
+            req_data.get("industry", ""),
+            req_data.get("team_type", ""),
+            req_data.get("analysis_goal", ""),
+            req_data.get("roles", ""),
+            req_data.get("existing_challenges", ""),
+        )
+        print("GROUP USER PROMPT:", user_prompt)
+
+        update_task_status(task_id, "processing", "Analyzing team data with AI...")
+
+        df = aggregates_frame(load_aggregates(excel_path))
+        html_table = df.to_html(index=False)
+        content_blocks = [
+            {"type": "text", "text": user_prompt},
+            {"type": "text", "text": html_table},
+        ]
+
+        ai_result = await asyncio.to_thread(
+            process_pdf_with_gpt, table_pdf_path, content_blocks
+        )
+        print("AI RESULT:", ai_result)
+
+        if ai_result.get("status") != "ok" or "insight" not in ai_result:
+            update_task_status(
+                task_id,
+                "failed",
+                f"AI analysis failed: {ai_result.get('reason', 'Unknown error')}",
+            )
+            return
+
+        update_task_status(task_id, "processing", "Generating insight report...")
+
+        output_dir = os.path.join(OUTPUT_DIR, "insights")
+        os.makedirs(output_dir, exist_ok=True)
+
+        insight_filename = f"group_insight_{task_id[:8]}.html"
+        insight_path = os.path.join(output_dir, insight_filename)
+
+        wrapped_html = wrap_html_with_header(
+            ai_result["insight"],
+            report_title="Group MBTI Analysis",
+            subject_name=req_data.get("group_name", ""),
+            logo_url="/media/full_logo.png",
+        )
+
+        with open(insight_path, "w", encoding="utf-8") as f:
+            f.write(wrapped_html)
+
+        # Generate PDF version
+        insight_pdf_filename = f"group_insight_{task_id[:8]}.pdf"
+        insight_pdf_path = os.path.join(output_dir, insight_pdf_filename)
+
+        try:
+            await asyncio.to_thread(
+                render_pdf,
+                wrapped_html,
+                insight_pdf_path,
+                base_url=os.path.dirname(insight_path),
+            )
+            insight_pdf_url = f"/output/insights/{insight_pdf_filename}"
+        except Exception as e:
+            print(f"PDF generation failed: {e}")
+            insight_pdf_url = None
+
+        # Update task status
+        update_task_status(
+            task_id,
+            "completed",
+            "Group insight generated successfully",
+            insight_path,
+            file_type="html",
+            insight_pdf_url=insight_pdf_url,
+        )
+
+    except Exception as e:
+        update_task_status(
+            task_id, "failed", f"Group insight generation failed: {str(e)}"
+        )
+        print(f"Error in group insight background: {str(e)}")
+        traceback.print_exc()
+
+
+async def insight_background(
+    task_id: str,
+    pdf_path: str,
+    relationship_type: str = None,
+    relationship_goals: str = None,
+):
+    """Background task for generating MBTI insights for personal/dual reports"""
+    try:
+        update_task_status(
+            task_id, "processing", "Generating MBTI Insight with GPT-4o..."
+        )
+
+        # Build user prompt for dual reports with relationship context
+        user_prompt = ""
+        if relationship_type:
+            user_prompt += "Supplementary information for MBTI couple report:\n"
+            user_prompt += f"Relationship type: {relationship_type}\n"
+        if relationship_goals:
+            user_prompt += f"Relationship goals: {relationship_goals}\n"
+
+        # Build content blocks for GPT
+        content_blocks = []
+        if user_prompt:
+            content_blocks.append({"type": "text", "text": user_prompt})
+
+        # Process the PDF with GPT
+        result = await asyncio.to_thread(
+            process_pdf_with_gpt, pdf_path, content_blocks if content_blocks else None
+        )
+
+        # Generate file names based on PDF
+        pdf_stub = os.path.splitext(os.path.basename(pdf_path))[0][:6]
+        insight_html_filename = f"insight_{pdf_stub}.html"
+        insight_html_path = os.path.join(
+            os.path.dirname(pdf_path), insight_html_filename
+        )
+
+        if result.get("status") == "ok" and "insight" in result:
+            # Extract subject name for header (from filename)
+            subject_name = ""
+            try:
+                base_name = os.path.basename(pdf_path)
+                if "_" in base_name:
+                    subject_name = (
+                        base_name.replace(".pdf", "").replace("_", " ").strip()
+                    )
+            except Exception:
+                subject_name = ""
+
+            # Wrap with header and structure
+            html_with_header = wrap_html_with_header(
+                result["insight"],
+                report_title="MBTI Insight Report",
+                subject_name=subject_name,
+                logo_url="/media/full_logo.png",
+            )
+
+            # Save HTML for preview/download
+            with open(insight_html_path, "w", encoding="utf-8") as f:
+                f.write(html_with_header)
+
+            # Generate PDF from HTML
+            insight_pdf_filename = f"insight_{pdf_stub}.pdf"
+            insight_pdf_path = os.path.join(
+                os.path.dirname(pdf_path), insight_pdf_filename
+            )
+
+            try:
+                await asyncio.to_thread(
+                    render_pdf,
+                    html_with_header,
+                    insight_pdf_path,
+                    base_url=os.path.dirname(insight_html_path),
+                )
+                print(f"PDF generated successfully: {insight_pdf_path}")
+            except Exception as e:
+                print(f"PDF generation from insight HTML failed: {e}")
+                insight_pdf_path = None
+
+            insight_pdf_url = None
+            if insight_pdf_path and os.path.exists(insight_pdf_path):
+                rel_dir = os.path.relpath(os.path.dirname(pdf_path), OUTPUT_DIR)
+                insight_pdf_url = f"/output/{rel_dir}/{insight_pdf_filename}".replace(
+                    "\\", "/"
+                )
+
+            # Update task status with completion
+            update_task_status(
+                task_id,
+                "completed",
+                "Insight generated successfully.",
+                insight_html_path,
+                file_type="html",
+                insight_pdf_url=insight_pdf_url,
+            )
+
+            print(
+                f"Insight generated successfully. HTML: {insight_html_path}, PDF: {insight_pdf_url}"
+            )
+
+        else:
+            update_task_status(
+                task_id,
+                "failed",
+                f"Insight generation failed: {result.get('reason', 'Unknown error')}",
+            )
+    except Exception as e:
+        print(f"Error in insight_background: {str(e)}")
+        traceback.print_exc()
+        update_task_status(task_id, "failed", f"Insight error: {str(e)}")
+
+
+async def translate_pdf_background(task_id: str, pdf_path: str):
+    """Background task for translating a PDF"""
+    try:
+        update_task_status(task_id, "processing", "Translating PDF...")
+
+        # Create task-specific directory in TEMP_DIR
+        task_dir = os.path.join(TEMP_DIR, task_id)
+        os.makedirs(task_dir, exist_ok=True)
+
+        # Await the create_translated_pdf function
+        output_pdf_path = await create_translated_pdf(
+            pdf_path,
+            task_dir,
+            render_pdf=render_pdf,
+            span=span,
+            progress=task_progress_callback(task_id, "translated"),
+        )
+
+        # Store file_path in task storage (existing /report/{task_id}/pdf endpoint will handle serving)
+        # Set file_type to enable Get Insight button
+        update_task_status(
+            task_id,
+            "completed",
+            "Translation completed successfully",
+            output_pdf_path,
+            file_type="pdf_view",
+        )
+
+    except Exception as e:
+        update_task_status(task_id, "failed", f"Translation failed: {str(e)}")
+        print(f"Error translating PDF: {str(e)}")
+        traceback.print_exc()
+
+
+# Background task functions
+
+
+async def create_group_report_background(task_id: str, folder_path: str):
+    """Simple fixed version of group report background task"""
+    try:
+        update_task_status(
+            task_id, "processing", "Creating group report (with fixes)..."
+        )
+
+        # Use task_id for unique filename since folder_path is now "all_pdfs"
+        output_filename = f"group_report_{task_id}.xlsx"
+        output_path = os.path.join(OUTPUT_DIR, output_filename)
+
+        # Remove existing file if present
+        if os.path.exists(output_path):
+            try:
+                os.remove(output_path)
+                print(f"Removed existing: {output_path}")
+            except PermissionError:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                output_filename = f"group_report_{task_id}_{timestamp}.xlsx"
+                output_path = os.path.join(OUTPUT_DIR, output_filename)
+
+        # Debug: List PDF files before processing
+        pdf_files = [f for f in os.listdir(folder_path) if f.lower().endswith(".pdf")]
+        print(f"📄 About to process {len(pdf_files)} PDF files:")
+        for i, pdf in enumerate(pdf_files[:5]):  # Show first 5
+            print(f"  {i + 1}. {pdf}")
+        if len(pdf_files) > 5:
+            print(f"  ... and {len(pdf_files) - 5} more")
+
+        # Use the fixed processing function. It runs in a worker thread so
+        # status polls are answered while it reports progress.
+        workbook = await asyncio.to_thread(
+            process_group_report_fixed,
+            folder_path,
+            OUTPUT_DIR,
+            output_filename,
+            progress=task_progress_callback(task_id, "group"),
+        )
+
+        if workbook and hasattr(workbook, "close"):
+            workbook.close()
+
+        # Verify the output file exists
+        if os.path.exists(output_path):
+            print(f"✅ Excel file created successfully: {output_path}")
+
+            # Update task status with excel_path stored properly
+            update_task_status(
+                task_id,
+                "completed",
+                "Group report created successfully",
+                excel_path=output_path,  # Store the full path
+                file_type="xlsx",
+            )
+        else:
+            # File wasn't created - this is a failure
+            error_msg = f"Excel file was not created at {output_path}. Check PDF processing logs."
+            print(f"❌ {error_msg}")
+            update_task_status(task_id, "failed", error_msg)
+
+    except Exception as e:
+        error_msg = f"Group report creation failed: {str(e)}"
+        print(f"❌ {error_msg}")
+        import traceback
+
+        traceback.print_exc()
+        update_task_status(task_id, "failed", error_msg)
+
+
+async def append_group_report_background(
+    task_id: str, source_excel: str, folder_path: str
+):
+    """Build a new group report from an existing one plus the PDFs of a folder"""
+    try:
+        update_task_status(task_id, "processing", "Adding people to group report...")
+
+        output_filename = f"group_report_{task_id}.xlsx"
+        output_path = os.path.join(OUTPUT_DIR, output_filename)
+
+        workbook = await asyncio.to_thread(
+            append_group_report,
+            source_excel,
+            folder_path,
+            OUTPUT_DIR,
+            output_filename,
+            progress=task_progress_callback(task_id, "group"),
+        )
+
+        if workbook and hasattr(workbook, "close"):
+            workbook.close()
+
+        if workbook and os.path.exists(output_path):
+            print(f"✅ Excel file created successfully: {output_path}")
+            update_task_status(
+                task_id,
+                "completed",
+                "Group report updated successfully",
+                excel_path=output_path,
+                file_type="xlsx",
+            )
+        else:
+            error_msg = f"Excel file was not created at {output_path}. Check PDF processing logs."
+            print(f"❌ {error_msg}")
+            update_task_status(task_id, "failed", error_msg)
+
+    except Exception as e:
+        error_msg = f"Group report update failed: {str(e)}"
+        print(f"❌ {error_msg}")
+        traceback.print_exc()
+        update_task_status(task_id, "failed", error_msg)
+
+
+# Preference graphs cropped from each report page for the personal report
+PERSONAL_GRAPH_RECTS = {
+    4: {"EIGraph": (0.1, 0.12, 0.9, 0.44)},
+    5: {"SNgraph": (0.1, 0.12, 0.9, 0.44)},
+    6: {"TFgraph": (0.1, 0.12, 0.9, 0.44)},
+    7: {"JPgraph": (0.1, 0.12, 0.9, 0.44)},
+}
+
+
+def extract_personal_graphs(pdf_path):
+    """Crop the preference graphs into MEDIA_DIR/<pdf name>/screenshots."""
+    for page_num, rect_coords_dict in PERSONAL_GRAPH_RECTS.items():
+        extract_multiple_graphs_from_pdf(
+            pdf_path, MEDIA_DIR, page_num, rect_coords_dict, zoom=2
+        )
+
+
+async def create_personal_report_background(task_id: str, pdf_path: str):
+    """Background task for creating personal report"""
+    try:
+        update_task_status(task_id, "processing", "Extracting images from PDF...")
+        progress = task_progress_callback(task_id, "personal")
+        progress("extract")
+        await asyncio.to_thread(extract_personal_graphs, pdf_path)
+
+        update_task_status(task_id, "processing", "Generating personal report...")
+        name_without_ext = Path(pdf_path).stem
+        person_name = sanitize_filename(name_without_ext)
+
+        task_dir = os.path.join(TEMP_DIR, task_id)
+        os.makedirs(task_dir, exist_ok=True)
+
+        output_filename = f"{person_name}_personal_report_{task_id}.pdf"
+        full_output_path = os.path.join(task_dir, output_filename)
+
+        await asyncio.to_thread(
+            generate_personal_report,
+            pdf_path,
+            task_dir,
+            output_filename,
+            progress=progress,
+        )
+
+        if not os.path.exists(full_output_path):
+            raise FileNotFoundError(f"Failed to generate PDF at {full_output_path}")
+
+        update_task_status(
+            task_id,
+            "completed",
+            "Personal report created successfully",
+            full_output_path,
+            file_type="pdf_view",
+        )
+
+    except Exception as e:
+        update_task_status(
+            task_id, "failed", f"Personal report creation failed: {str(e)}"
+        )
+
+
+def _build_personal_report(pdf_path, output_dir, progress):
+    extract_personal_graphs(pdf_path)
+    output_filename = f"{Path(pdf_path).stem}_personal_report.pdf"
+    return generate_personal_report(
+        pdf_path, output_dir, output_filename, progress=progress
+    )
+
+
+async def create_personal_reports_batch_background(task_id: str, pdf_paths: list):
+    """
+    Background task for creating a personal report for each PDF of a batch.
+
+    Up to PERSONAL_BATCH_WORKERS reports are built at once. Each file's result
+    is recorded in the task's items as soon as it finishes, which is what
+    /report/{task_id}/zip streams. A file that fails does not stop the others,
+    but cancelling the task (or this job) cancels the reports not yet started.
+    """
+    try:
+        output_dir = os.path.join(TEMP_DIR, task_id, "reports")
+        os.makedirs(output_dir, exist_ok=True)
+        items = [TaskItem(name=Path(path).stem, status="pending") for path in pdf_paths]
+        update_task_status(
+            task_id,
+            "processing",
+            f"Creating {len(items)} personal reports...",
+            items=items,
+            items_done=0,
+            items_total=len(items),
+        )
+        check = cancellation_check(task_id)
+        workers = asyncio.Semaphore(PERSONAL_BATCH_WORKERS)
+        done = 0
+
+        async def build(item, pdf_path):
+            nonlocal done
+            async with workers:
+                check()
+                item.status = "processing"
+                try:
+                    item.file_path = await asyncio.to_thread(
+                        _build_personal_report, pdf_path, output_dir, check
+                    )
+                    item.status = "completed"
+                except TaskCancelled:
+                    raise
+                except Exception as e:
+                    item.status = "failed"
+                    item.message = str(e)
+            done += 1
+            update_task_status(
+                task_id,
+                "processing",
+                f"Created {done} of {len(items)} personal reports",
+                items=items,
+                items_done=done,
+                # A large batch may take longer than one STAGE_TIMEOUT
+                deadline_at=stage_deadline(),
+            )
+
+        builds = [
+            asyncio.create_task(build(item, path))
+            for item, path in zip(items, pdf_paths)
+        ]
+        try:
+            await asyncio.gather(*builds)
+        except BaseException:
+            # Cancelled, or a report raised TaskCancelled: stop the reports
+            # still waiting for a worker (running ones stop at their next
+            # stage once the task is stopped)
+            for pending in builds:
+                pending.cancel()
+            await asyncio.gather(*builds, return_exceptions=True)
+            raise
+
+        failed = sum(item.status == "failed" for item in items)
+        if failed == len(items):
+            update_task_status(
+                task_id, "failed", "No personal report could be created", items=items
+            )
+            return
+        message = f"Created {len(items) - failed} personal reports"
+        if failed:
+            message += f" ({failed} failed)"
+        update_task_status(
+            task_id, "completed", message, output_dir, file_type="zip", items=items
+        )
+
+    except Exception as e:
+        update_task_status(
+            task_id, "failed", f"Personal reports batch failed: {str(e)}"
+        )
+        print(f"Error processing personal reports batch: {str(e)}")
+        traceback.print_exc()
+
+
+async def create_dual_report_background(
+    task_id: str, pdf1_path: str, pdf2_path: str, output_path: str
+):
+    """Background task for creating dual report (to be implemented)"""
+    try:
+        update_task_status(task_id, "processing", "Creating dual report...")
+        print(output_path)
+        first_name = sanitize_path_component(pdf1_path)
+        second_name = sanitize_path_component(pdf2_path)
+        identifier = f"{first_name}_{second_name}"
+        output_dir = os.path.join(output_path, identifier)
+        os.makedirs(output_dir, exist_ok=True)
+        _, final_path = await asyncio.to_thread(
+            generate_dual_report,
+            pdf1_path,
+            pdf2_path,
+            output_dir,
+            progress=task_progress_callback(task_id, "dual"),
+        )
+
+        if not os.path.exists(final_path):
+            raise FileNotFoundError(f"Generated dual report not found at {final_path}")
+
+        update_task_status(
+            task_id,
+            "completed",
+            "Dual comparison report created successfully",
+            final_path,
+            file_type="pdf_view",
+        )
+
+    except Exception as e:
+        update_task_status(task_id, "failed", f"Dual report creation failed: {str(e)}")
+        print(f"Error processing dual report: {str(e)}")
+        traceback.print_exc()
+
+
+# Job functions by name, for jobs stored in the task database
+JOB_FUNCTIONS = {
+    func.__name__: func
+    for func in (
+        group_insight_background,
+        insight_background,
+        translate_pdf_background,
+        create_group_report_background,
+        append_group_report_background,
+        create_personal_report_background,
+        create_personal_reports_batch_background,
+        create_dual_report_background,
+    )
+}
@@ -6,9 +6,10 @@ from openpyxl.chart.legend import Legend
 from openpyxl.chart.series import SeriesLabel
 from openpyxl.chart.shapes import GraphicalProperties
 from openpyxl.drawing.line import LineProperties
-from openpyxl.styles import Font, PatternFill
+from openpyxl.styles import Font
 
 # local import
+from .aggregates import FACET_PAIRS, compute_aggregates, facet_pair_name
 from .consts import (
     CHART_BAR_COLORS,
     CHART_HEIGHT_DICHOTOMY,
@@ -27,6 +28,14 @@ from .consts import (
     CHART_TITLE_MAIN_DISTRIBUTION,
     CHART_WIDTH_DICHOTOMY,
     CHART_WIDTH_STANDARD,
+    DASHBOARD_CHART_COLUMNS,
+    DASHBOARD_DICHOTOMY_CHART_ROW,
+    DASHBOARD_FACET_CHART_ROW,
+    DASHBOARD_FACET_CHART_ROW_STEP,
+    DATA_BLOCK_ROWS,
+    DATA_DICHOTOMY_FIRST_ROW,
+    DATA_DOMINANT_FUNCTION_ORDER,
+    DATA_FACET_FIRST_ROW,
     DICHOTOMY_COLORS,
     EXCEL_DEFAULT_COLUMN_WIDTH,
     EXTERNAL_TYPES,
@@ -44,23 +53,34 @@ from .consts import (
     HEADER_LIFESTYLE_STRUCTURE,
     HEADER_MBTI_TYPE_DATA,
     INTERNAL_TYPES,
-    LABEL_EXTROVERSION,
-    LABEL_FEELING,
-    LABEL_INTROVERSION,
-    LABEL_INTUITION,
-    LABEL_JUDGING,
-    LABEL_PERCELVING,
-    LABEL_SENSING,
-    LABEL_THINKING,
     MBTI_COLORS,
+    MBTI_LETTERS,
     MBTI_TYPES,
     SHEET_NAME_DASHBOARD,
     SHEET_NAME_DATA,
+    SHEET_NAME_MBTI_RESULTS,
     SHEET_ORDER_PREFERRED,
 )
+from .dataset import records_frame, sheet_records
+from .formatting import apply_column_widths, solid_fill, text_widths
+from .telemetry import timed
 
 
-def create_distribution_charts(workbook):
+@timed("chart")
+def create_distribution_charts(workbook, aggregates=None):
+    """
+    Write the Data sheet and the Dashboard charts that plot it.
+
+    Args:
+        workbook: Group workbook with an MBTI Results sheet
+        aggregates: compute_aggregates result, computed from the MBTI Results
+            sheet when None
+    """
+    if aggregates is None:
+        aggregates = compute_aggregates(
+            records_frame(sheet_records(workbook[SHEET_NAME_MBTI_RESULTS]))
+        )
+
     # Create or get the data sheet
     if SHEET_NAME_DATA in workbook.sheetnames:
         data_sheet = workbook[SHEET_NAME_DATA]
@@ -81,431 +101,134 @@ def create_distribution_charts(workbook):
     chart_sheet["D1"].font = Font(bold=True, size=FONT_SIZE_DASHBOARD_TITLE)
 
     # Prepare data in the data sheet
-    prepare_main_distribution_data(data_sheet)
-    prepare_dichotomy_data(data_sheet)
-    prepare_external_internal_data(data_sheet)
-    prepare_dominant_function_data(data_sheet)
+    layout = dashboard_layout(aggregates)
+    prepare_main_distribution_data(data_sheet, aggregates)
+    prepare_dichotomy_data(data_sheet, layout)
+    prepare_external_internal_data(data_sheet, aggregates)
+    prepare_dominant_function_data(data_sheet, aggregates)
 
     # Create charts in the dashboard sheet
     create_main_distribution_chart(data_sheet, chart_sheet)
-    create_dichotomy_charts(data_sheet, chart_sheet)
+    create_dichotomy_charts(data_sheet, chart_sheet, layout)
     create_external_internal_charts(data_sheet, chart_sheet)
-    create_facet_bar_charts(data_sheet, chart_sheet)
+    create_facet_bar_charts(data_sheet, chart_sheet, layout)
     create_dominant_chart(data_sheet, chart_sheet)
     # create_legend_for_facet_graphs(chart_sheet)
 
     # Adjust column widths for data sheet
-    adjust_column_widths(data_sheet)
+    apply_column_widths(data_sheet, text_widths(data_sheet.iter_rows(values_only=True)))
 
     # Hide gridlines in the dashboard for a cleaner look
     chart_sheet.sheet_view.showGridLines = False
 
 
-def prepare_main_distribution_data(data_sheet):
+# Data sheet header and Dashboard chart title of each dichotomy, in type order
+DICHOTOMY_BLOCKS = [
+    ("EI", HEADER_ENERGY_ORIENTATION, CHART_TITLE_ENERGY_ORIENTATION),
+    ("SN", HEADER_INFORMATION_GATHERING, CHART_TITLE_INFORMATION_GATHERING),
+    ("TF", HEADER_DECISION_MAKING, CHART_TITLE_DECISION_MAKING),
+    ("JP", HEADER_LIFESTYLE_STRUCTURE, CHART_TITLE_LIFESTYLE_STRUCTURE),
+]
+
+BOLD = Font(bold=True)
+
+
+def dashboard_layout(aggregates):
+    """
+    Blocks of the Data sheet and the Dashboard bar charts that plot them.
+
+    Every block is a title in column D followed by its rows, labels in
+    column D and counts in column E, and starts DATA_BLOCK_ROWS rows after
+    the previous one. Dichotomy blocks list the two preferences; facet
+    blocks (one per facet pair, in FACETS order) the two facets and MIDZONE.
+    Each dichotomy has a column of DASHBOARD_CHART_COLUMNS, with its facet
+    charts below its dichotomy chart.
+
+    Returns:
+        list of dicts: kind ("dichotomy" or "facet"), row (title row), title,
+        rows [(label, count, fill colour or None)], chart_title, chart
+        (anchor cell on the Dashboard)
+    """
+    layout = []
+    for index, (letters, header, chart_title) in enumerate(DICHOTOMY_BLOCKS):
+        labels = [MBTI_LETTERS[letter] for letter in letters]
+        column = DASHBOARD_CHART_COLUMNS[index]
+        layout.append(
+            {
+                "kind": "dichotomy",
+                "row": DATA_DICHOTOMY_FIRST_ROW + index * DATA_BLOCK_ROWS,
+                "title": header,
+                "rows": [
+                    (label, aggregates["dichotomies"][letter], DICHOTOMY_COLORS[label])
+                    for letter, label in zip(letters, labels)
+                ],
+                "chart_title": chart_title,
+                "chart": f"{column}{DASHBOARD_DICHOTOMY_CHART_ROW}",
+            }
+        )
+
+    pairs_per_dichotomy = len(FACET_PAIRS) // len(DICHOTOMY_BLOCKS)
+    for index, (first, second) in enumerate(FACET_PAIRS):
+        name = facet_pair_name(first, second)
+        dichotomy, position = divmod(index, pairs_per_dichotomy)
+        column = DASHBOARD_CHART_COLUMNS[dichotomy]
+        chart_row = (
+            DASHBOARD_FACET_CHART_ROW + position * DASHBOARD_FACET_CHART_ROW_STEP
+        )
+        layout.append(
+            {
+                "kind": "facet",
+                "row": DATA_FACET_FIRST_ROW + index * DATA_BLOCK_ROWS,
+                "title": name,
+                "rows": [
+                    (first, aggregates["facets"][first], None),
+                    (second, aggregates["facets"][second], None),
+                    ("MIDZONE", aggregates["midzone"][name], None),
+                ],
+                "chart_title": name,
+                "chart": f"{column}{chart_row}",
+            }
+        )
+    return layout
+
+
+def block_ranges(block):
+    """Labels and data ranges (e.g. "D3:D4", "D3:E4") of a layout block's rows."""
+    first = block["row"] + 1
+    last = block["row"] + len(block["rows"])
+    return f"D{first}:D{last}", f"D{first}:E{last}"
+
+
+def prepare_main_distribution_data(data_sheet, aggregates):
     # Write headers
     data_sheet["A1"] = HEADER_MBTI_TYPE_DATA
-    data_sheet["A1"].font = Font(bold=True)
+    data_sheet["A1"].font = BOLD
 
-    # Write MBTI types and count formulas
+    # Write MBTI types and their counts
     for row, mbti_type in enumerate(MBTI_TYPES, start=2):
-        data_sheet[f"A{row}"] = mbti_type
-        data_sheet[f"B{row}"] = f"=COUNTIF(Table1[Type],A{row})"
+        type_cell = data_sheet.cell(row=row, column=1, value=mbti_type)
+        data_sheet.cell(row=row, column=2, value=aggregates["types"][mbti_type])
         if mbti_type in MBTI_COLORS:
-            data_sheet[f"A{row}"].fill = PatternFill(
-                start_color=MBTI_COLORS[mbti_type],
-                end_color=MBTI_COLORS[mbti_type],
-                fill_type="solid",
-            )
+            type_cell.fill = solid_fill(MBTI_COLORS[mbti_type])
 
 
-def prepare_dichotomy_data(data_sheet):
+def prepare_dichotomy_data(data_sheet, layout):
     data_sheet["D1"] = HEADER_DICHOTOMIES_DATA
-    data_sheet["D1"].font = Font(bold=True)
+    data_sheet["D1"].font = BOLD
     data_sheet["E2"] = HEADER_COUNT
-    data_sheet["E2"].font = Font(bold=True)
-
-    # Energy source - E/I
-    data_sheet["D2"] = HEADER_ENERGY_ORIENTATION
-    data_sheet["D2"].font = Font(bold=True)
-    data_sheet["D3"] = LABEL_EXTROVERSION
-    data_sheet["D4"] = LABEL_INTROVERSION
-    data_sheet["E3"] = '=COUNTIF(Table1[Type], "*E*")'
-    data_sheet["E4"] = '=COUNTIF(Table1[Type], "*I*")'
-    data_sheet["D3"].fill = PatternFill(
-        start_color=DICHOTOMY_COLORS["Extroversion"],
-        end_color=DICHOTOMY_COLORS["Extroversion"],
-        fill_type="solid",
-    )
-    data_sheet["D4"].fill = PatternFill(
-        start_color=DICHOTOMY_COLORS["Introversion"],
-        end_color=DICHOTOMY_COLORS["Introversion"],
-        fill_type="solid",
-    )
-
-    # Information - S/N
-    data_sheet["D6"] = HEADER_INFORMATION_GATHERING
-    data_sheet["D6"].font = Font(bold=True)
-    data_sheet["D7"] = LABEL_SENSING
-    data_sheet["D8"] = LABEL_INTUITION
-    data_sheet["E7"] = '=COUNTIF(Table1[Type], "*S*")'
-    data_sheet["E8"] = '=COUNTIF(Table1[Type], "*N*")'
-    data_sheet["D7"].fill = PatternFill(
-        start_color=DICHOTOMY_COLORS["Sensing"],
-        end_color=DICHOTOMY_COLORS["Sensing"],
-        fill_type="solid",
-    )
-    data_sheet["D8"].fill = PatternFill(
-        start_color=DICHOTOMY_COLORS["Intuition"],
-        end_color=DICHOTOMY_COLORS["Intuition"],
-        fill_type="solid",
-    )
-
-    # Decisions - T/F
-    data_sheet["D10"] = HEADER_DECISION_MAKING
-    data_sheet["D10"].font = Font(bold=True)
-    data_sheet["D11"] = LABEL_THINKING
-    data_sheet["D12"] = LABEL_FEELING
-    data_sheet["E11"] = '=COUNTIF(Table1[Type], "*T*")'
-    data_sheet["E12"] = '=COUNTIF(Table1[Type], "*F*")'
-    data_sheet["D11"].fill = PatternFill(
-        start_color=DICHOTOMY_COLORS["Thinking"],
-        end_color=DICHOTOMY_COLORS["Thinking"],
-        fill_type="solid",
-    )
-    data_sheet["D12"].fill = PatternFill(
-        start_color=DICHOTOMY_COLORS["Feeling"],
-        end_color=DICHOTOMY_COLORS["Feeling"],
-        fill_type="solid",
-    )
-
-    # Lifestyle - J/P
-    data_sheet["D14"] = HEADER_LIFESTYLE_STRUCTURE
-    data_sheet["D14"].font = Font(bold=True)
-    data_sheet["D15"] = LABEL_JUDGING
-    data_sheet["D16"] = LABEL_PERCELVING
-    data_sheet["E15"] = '=COUNTIF(Table1[Type], "*J*")'
-    data_sheet["E16"] = '=COUNTIF(Table1[Type], "*P*")'
-    data_sheet["D15"].fill = PatternFill(
-        start_color=DICHOTOMY_COLORS["Judging"],
-        end_color=DICHOTOMY_COLORS["Judging"],
-        fill_type="solid",
-    )
-    data_sheet["D16"].fill = PatternFill(
-        start_color=DICHOTOMY_COLORS["Perceiving"],
-        end_color=DICHOTOMY_COLORS["Perceiving"],
-        fill_type="solid",
-    )
-
-    # calculate dichotomy preference
-    data_sheet["D19"] = HEADER_DICHOTOMY_PREFERENCE_DATA
-    data_sheet["D19"].font = Font(bold=True)
-
-    # titles Initiating-Receiving
-    data_sheet["D20"] = "Initiating-Receiving"
-    data_sheet["D20"].font = Font(bold=True)
-    data_sheet["D21"] = "Initiating"
-    data_sheet["D22"] = "Receiving"
-    data_sheet["D23"] = "MIDZONE"
-
-    # data for Initiating-Receiving
-    data_sheet["E21"] = (
-        '=COUNTIF(Table1[Initiating],"=IN-PREF")+COUNTIF(Table1[Initiating],"=OUT-OF-PREF")'
-    )
-    data_sheet["E22"] = (
-        '=COUNTIF(Table1[Receiving],"=IN-PREF")+COUNTIF(Table1[Receiving],"=OUT-OF-PREF")'
-    )
-    data_sheet["E23"] = '=COUNTIF(Table1[Initiating],"=MIDZONE")'
-
-    # titles Initiating-Receiving
-    data_sheet["D26"] = "Expressive-Contained"
-    data_sheet["D26"].font = Font(bold=True)
-    data_sheet["D27"] = "Expressive"
-    data_sheet["D28"] = "Contained"
-    data_sheet["D29"] = "MIDZONE"
-
-    # data for Initiating-Receiving
-    data_sheet["E26"] = (
-        '=COUNTIF(Table1[Expressive],"=IN-PREF")+COUNTIF(Table1[Expressive],"=OUT-OF-PREF")'
-    )
-    data_sheet["E27"] = (
-        '=COUNTIF(Table1[Contained],"=IN-PREF")+COUNTIF(Table1[Contained],"=OUT-OF-PREF")'
-    )
-    data_sheet["E28"] = '=COUNTIF(Table1[Contained],"=MIDZONE")'
-
-    # titles Gregarious-Intimate
-    data_sheet["D30"] = "Gregarious-Intimate"
-    data_sheet["D30"].font = Font(bold=True)
-    data_sheet["D31"] = "Gregarious"
-    data_sheet["D32"] = "Intimate"
-    data_sheet["D33"] = "MIDZONE"
-
-    # data for Gregarious-Intimate
-    data_sheet["E31"] = (
-        '=COUNTIF(Table1[Gregarious],"=IN-PREF")+COUNTIF(Table1[Gregarious],"=OUT-OF-PREF")'
-    )
-    data_sheet["E32"] = (
-        '=COUNTIF(Table1[Intimate],"=IN-PREF")+COUNTIF(Table1[Intimate],"=OUT-OF-PREF")'
-    )
-    data_sheet["E33"] = '=COUNTIF(Table1[Intimate],"=MIDZONE")'
-
-    # titles Active-Reflective
-    data_sheet["D36"] = "Active-Reflective"
-    data_sheet["D36"].font = Font(bold=True)
-    data_sheet["D37"] = "Active"
-    data_sheet["D38"] = "Reflective"
-    data_sheet["D39"] = "MIDZONE"
-
-    # data for Active-Reflective
-    data_sheet["E37"] = (
-        '=COUNTIF(Table1[Active],"=IN-PREF")+COUNTIF(Table1[Active],"=OUT-OF-PREF")'
-    )
-    data_sheet["E38"] = (
-        '=COUNTIF(Table1[Reflective],"=IN-PREF")+COUNTIF(Table1[Reflective],"=OUT-OF-PREF")'
-    )
-    data_sheet["E39"] = '=COUNTIF(Table1[Reflective],"=MIDZONE")'
-
-    # titles Enthusiastic-Quiet
-    data_sheet["D42"] = "Enthusiastic-Quiet"
-    data_sheet["D42"].font = Font(bold=True)
-    data_sheet["D43"] = "Enthusiastic"
-    data_sheet["D44"] = "Quiet"
-    data_sheet["D45"] = "MIDZONE"
-
-    # data for Enthusiastic-Quiet
-    data_sheet["E43"] = (
-        '=COUNTIF(Table1[Enthusiastic],"=IN-PREF")+COUNTIF(Table1[Enthusiastic],"=OUT-OF-PREF")'
-    )
-    data_sheet["E44"] = (
-        '=COUNTIF(Table1[Quiet],"=IN-PREF")+COUNTIF(Table1[Quiet],"=OUT-OF-PREF")'
-    )
-    data_sheet["E45"] = '=COUNTIF(Table1[Quiet],"=MIDZONE")'
-
-    # titles Concrete-Abstract
-    data_sheet["D48"] = "Concrete-Abstract"
-    data_sheet["D48"].font = Font(bold=True)
-    data_sheet["D49"] = "Concrete"
-    data_sheet["D50"] = "Abstract"
-    data_sheet["D51"] = "MIDZONE"
-
-    # data for Concrete-Abstract
-    data_sheet["E49"] = (
-        '=COUNTIF(Table1[Concrete],"=IN-PREF")+COUNTIF(Table1[Concrete],"=OUT-OF-PREF")'
-    )
-    data_sheet["E50"] = (
-        '=COUNTIF(Table1[Abstract],"=IN-PREF")+COUNTIF(Table1[Abstract],"=OUT-OF-PREF")'
-    )
-    data_sheet["E51"] = '=COUNTIF(Table1[Abstract],"=MIDZONE")'
-
-    # titles Realistic-Imaginative
-    data_sheet["D54"] = "Realistic-Imaginative"
-    data_sheet["D54"].font = Font(bold=True)
-    data_sheet["D55"] = "Realistic"
-    data_sheet["D56"] = "Imaginative"
-    data_sheet["D57"] = "MIDZONE"
-
-    # data for Realistic-Imaginative
-    data_sheet["E55"] = (
-        '=COUNTIF(Table1[Realistic],"=IN-PREF")+COUNTIF(Table1[Realistic],"=OUT-OF-PREF")'
-    )
-    data_sheet["E56"] = (
-        '=COUNTIF(Table1[Imaginative],"=IN-PREF")+COUNTIF(Table1[Imaginative],"=OUT-OF-PREF")'
-    )
-    data_sheet["E57"] = '=COUNTIF(Table1[Imaginative],"=MIDZONE")'
-
-    # titles Practical-Conceptual
-    data_sheet["D60"] = "Practical-Conceptual"
-    data_sheet["D60"].font = Font(bold=True)
-    data_sheet["D61"] = "Practical"
-    data_sheet["D62"] = "Conceptual"
-    data_sheet["D63"] = "MIDZONE (Practical-Conceptual)"
-    # data for Practical-Conceptual
-    data_sheet["E61"] = (
-        '=COUNTIF(Table1[Practical],"=IN-PREF")+COUNTIF(Table1[Practical],"=OUT-OF-PREF")'
-    )
-    data_sheet["E62"] = (
-        '=COUNTIF(Table1[Conceptual],"=IN-PREF")+COUNTIF(Table1[Conceptual],"=OUT-OF-PREF")'
-    )
-    data_sheet["E63"] = '=COUNTIF(Table1[Practical],"=MIDZONE")'
-
-    # titles Experiential-Theoretical
-    data_sheet["D66"] = "Experiential-Theoretical"
-    data_sheet["D66"].font = Font(bold=True)
-    data_sheet["D67"] = "Experiential"
-    data_sheet["D68"] = "Theoretical"
-    data_sheet["D69"] = "MIDZONE"
-    # data for Experiential-Theoretical
-    data_sheet["E67"] = (
-        '=COUNTIF(Table1[Experiential],"=IN-PREF")+COUNTIF(Table1[Experiential],"=OUT-OF-PREF")'
-    )
-    data_sheet["E68"] = (
-        '=COUNTIF(Table1[Theoretical],"=IN-PREF")+COUNTIF(Table1[Theoretical],"=OUT-OF-PREF")'
-    )
-    data_sheet["E69"] = '=COUNTIF(Table1[Theoretical],"=MIDZONE")'
-
-    # titles Traditional-Original
-    data_sheet["D72"] = "Traditional-Original"
-    data_sheet["D72"].font = Font(bold=True)
-    data_sheet["D73"] = "Traditional"
-    data_sheet["D74"] = "Original"
-    data_sheet["D75"] = "MIDZONE"
-    # data for Traditional-Original
-    data_sheet["E73"] = (
-        '=COUNTIF(Table1[Traditional],"=IN-PREF")+COUNTIF(Table1[Traditional],"=OUT-OF-PREF")'
-    )
-    data_sheet["E74"] = (
-        '=COUNTIF(Table1[Original],"=IN-PREF")+COUNTIF(Table1[Original],"=OUT-OF-PREF")'
-    )
-    data_sheet["E75"] = '=COUNTIF(Table1[Original],"=MIDZONE")'
-
-    # titles Logical-Empathetic
-    data_sheet["D78"] = "Logical-Empathetic"
-    data_sheet["D78"].font = Font(bold=True)
-    data_sheet["D79"] = "Logical"
-    data_sheet["D80"] = "Empathetic"
-    data_sheet["D81"] = "MIDZONE"
-    # data for Logical-Empathetic
-    data_sheet["E79"] = (
-        '=COUNTIF(Table1[Logical],"=IN-PREF")+COUNTIF(Table1[Logical],"=OUT-OF-PREF")'
-    )
-    data_sheet["E80"] = (
-        '=COUNTIF(Table1[Empathetic],"=IN-PREF")+COUNTIF(Table1[Empathetic],"=OUT-OF-PREF")'
-    )
-    data_sheet["E81"] = '=COUNTIF(Table1[Empathetic],"=MIDZONE")'
-
-    # titles Reasonable-Compassionate
-    data_sheet["D84"] = "Reasonable-Compassionate"
-    data_sheet["D84"].font = Font(bold=True)
-    data_sheet["D85"] = "Reasonable"
-    data_sheet["D86"] = "Compassionate"
-    data_sheet["D87"] = "MIDZONE"
-    # data for Reasonable-Compassionate
-    data_sheet["E85"] = (
-        '=COUNTIF(Table1[Reasonable],"=IN-PREF")+COUNTIF(Table1[Reasonable],"=OUT-OF-PREF")'
-    )
-    data_sheet["E86"] = (
-        '=COUNTIF(Table1[Compassionate],"=IN-PREF")+COUNTIF(Table1[Compassionate],"=OUT-OF-PREF")'
-    )
-    data_sheet["E87"] = '=COUNTIF(Table1[Compassionate],"=MIDZONE")'
-
-    # titles Questioning-Accommodating
-    data_sheet["D90"] = "Questioning-Accommodating"
-    data_sheet["D90"].font = Font(bold=True)
-    data_sheet["D91"] = "Questioning"
-    data_sheet["D92"] = "Accommodating"
-    data_sheet["D93"] = "MIDZONE"
-    # data for Questioning-Accommodating
-    data_sheet["E91"] = (
-        '=COUNTIF(Table1[Questioning],"=IN-PREF")+COUNTIF(Table1[Questioning],"=OUT-OF-PREF")'
-    )
-    data_sheet["E92"] = (
-        '=COUNTIF(Table1[Accommodating],"=IN-PREF")+COUNTIF(Table1[Accommodating],"=OUT-OF-PREF")'
-    )
-    data_sheet["E93"] = '=COUNTIF(Table1[Accommodating],"=MIDZONE")'
-
-    # titles Critical-Accepting
-    data_sheet["D96"] = "Critical-Accepting"
-    data_sheet["D96"].font = Font(bold=True)
-    data_sheet["D97"] = "Critical"
-    data_sheet["D98"] = "Accepting"
-    data_sheet["D99"] = "MIDZONE"
-    # data for Critical-Accepting
-    data_sheet["E97"] = (
-        '=COUNTIF(Table1[Critical],"=IN-PREF")+COUNTIF(Table1[Critical],"=OUT-OF-PREF")'
-    )
-    data_sheet["E98"] = (
-        '=COUNTIF(Table1[Accepting],"=IN-PREF")+COUNTIF(Table1[Accepting],"=OUT-OF-PREF")'
-    )
-    data_sheet["E99"] = '=COUNTIF(Table1[Accepting],"=MIDZONE")'
-
-    # titles Tough-Tender
-    data_sheet["D102"] = "Tough-Tender"
-    data_sheet["D102"].font = Font(bold=True)
-    data_sheet["D103"] = "Tough"
-    data_sheet["D104"] = "Tender"
-    data_sheet["D105"] = "MIDZONE"
-    # data for Tough-Tender
-    data_sheet["E103"] = (
-        '=COUNTIF(Table1[Tough],"=IN-PREF")+COUNTIF(Table1[Tough],"=OUT-OF-PREF")'
-    )
-    data_sheet["E104"] = (
-        '=COUNTIF(Table1[Tender],"=IN-PREF")+COUNTIF(Table1[Tender],"=OUT-OF-PREF")'
-    )
-    data_sheet["E105"] = '=COUNTIF(Table1[Tender],"=MIDZONE")'
-
-    # titles Systematic-Casual
-    data_sheet["D108"] = "Systematic-Casual"
-    data_sheet["D108"].font = Font(bold=True)
-    data_sheet["D109"] = "Systematic"
-    data_sheet["D110"] = "Casual"
-    data_sheet["D111"] = "MIDZONE"
-    # data for Systematic-Casual
-    data_sheet["E109"] = (
-        '=COUNTIF(Table1[Systematic],"=IN-PREF")+COUNTIF(Table1[Systematic],"=OUT-OF-PREF")'
-    )
-    data_sheet["E110"] = (
-        '=COUNTIF(Table1[Casual],"=IN-PREF")+COUNTIF(Table1[Casual],"=OUT-OF-PREF")'
-    )
-    data_sheet["E111"] = '=COUNTIF(Table1[Casual],"=MIDZONE")'
-
-    # titles Planful-Open-Ended
-    data_sheet["D114"] = "Planful-Open-Ended"
-    data_sheet["D114"].font = Font(bold=True)
-    data_sheet["D115"] = "Planful"
-    data_sheet["D116"] = "Open-Ended"
-    data_sheet["D117"] = "MIDZONE"
-    # data for Planful-Open-Ended
-    data_sheet["E115"] = (
-        '=COUNTIF(Table1[Planful],"=IN-PREF")+COUNTIF(Table1[Planful],"=OUT-OF-PREF")'
-    )
-    data_sheet["E116"] = (
-        '=COUNTIF(Table1[Open-Ended],"=IN-PREF")+COUNTIF(Table1[Open-Ended],"=OUT-OF-PREF")'
-    )
-    data_sheet["E117"] = '=COUNTIF(Table1[Open-Ended],"=MIDZONE")'
-
-    # titles Early Starting-Pressure-Prompted
-    data_sheet["D120"] = "Early Starting-Pressure-Prompted"
-    data_sheet["D120"].font = Font(bold=True)
-    data_sheet["D121"] = "Early Starting"
-    data_sheet["D122"] = "Pressure-Prompted"
-    data_sheet["D123"] = "MIDZONE"
-    # data for Early Starting-Pressure-Prompted
-    data_sheet["E121"] = (
-        '=COUNTIF(Table1[Early Starting],"=IN-PREF")+COUNTIF(Table1[Early Starting],"=OUT-OF-PREF")'
-    )
-    data_sheet["E122"] = (
-        '=COUNTIF(Table1[Pressure-Prompted],"=IN-PREF")+COUNTIF(Table1[Pressure-Prompted],"=OUT-OF-PREF")'
-    )
-    data_sheet["E123"] = '=COUNTIF(Table1[Early Starting],"=MIDZONE")'
-
-    # titles Scheduled-Spontaneous
-    data_sheet["D126"] = "Scheduled-Spontaneous"
-    data_sheet["D126"].font = Font(bold=True)
-    data_sheet["D127"] = "Schedule"
-    data_sheet["D128"] = "Spontaneous"
-    data_sheet["D129"] = "MIDZONE"
-    # data for Scheduled-Spontaneous
-    data_sheet["E127"] = (
-        '=COUNTIF(Table1[Scheduled],"=IN-PREF")+COUNTIF(Table1[Scheduled],"=OUT-OF-PREF")'
-    )
-    data_sheet["E128"] = (
-        '=COUNTIF(Table1[Spontaneous],"=IN-PREF")+COUNTIF(Table1[Spontaneous],"=OUT-OF-PREF")'
-    )
-    data_sheet["E129"] = '=COUNTIF(Table1[Spontaneous],"=MIDZONE")'
-
-    # titles Methodical-Emergent
-    data_sheet["D132"] = "Methodical-Emergent"
-    data_sheet["D132"].font = Font(bold=True)
-    data_sheet["D133"] = "Methodical"
-    data_sheet["D134"] = "Emergent"
-    data_sheet["D135"] = "MIDZONE"
-    # data for Methodical-Emergent
-    data_sheet["E133"] = (
-        '=COUNTIF(Table1[Methodical],"=IN-PREF")+COUNTIF(Table1[Methodical],"=OUT-OF-PREF")'
-    )
-    data_sheet["E134"] = (
-        '=COUNTIF(Table1[Emergent],"=IN-PREF")+COUNTIF(Table1[Emergent],"=OUT-OF-PREF")'
-    )
-    data_sheet["E135"] = '=COUNTIF(Table1[Emergent],"=MIDZONE")'
+    data_sheet["E2"].font = BOLD
+    data_sheet[f"D{DATA_FACET_FIRST_ROW - 1}"] = HEADER_DICHOTOMY_PREFERENCE_DATA
+    data_sheet[f"D{DATA_FACET_FIRST_ROW - 1}"].font = BOLD
+
+    for block in layout:
+        data_sheet.cell(row=block["row"], column=4, value=block["title"]).font = BOLD
+        for row, (label, count, color) in enumerate(
+            block["rows"], start=block["row"] + 1
+        ):
+            label_cell = data_sheet.cell(row=row, column=4, value=label)
+            data_sheet.cell(row=row, column=5, value=count)
+            if color:
+                label_cell.fill = solid_fill(color)
 
 
 def prepare_facet_legend(chart_sheet):
@@ -522,54 +245,34 @@ def prepare_facet_legend(chart_sheet):
     chart_sheet["X35"] = "MIDZONE"
 
 
-def prepare_external_internal_data(data_sheet):
+def prepare_external_internal_data(data_sheet, aggregates):
     data_sheet["G1"] = HEADER_INTERNAL_ANALYSIS
     data_sheet["G9"] = HEADER_EXTERNAL_ANALYSIS
-    data_sheet["G1"].font = Font(bold=True)
-    data_sheet["G9"].font = Font(bold=True)
+    data_sheet["G1"].font = BOLD
+    data_sheet["G9"].font = BOLD
     data_sheet["G2"] = "Internal"
     data_sheet["G10"] = "External"
     data_sheet["H2"] = HEADER_COUNT
     data_sheet["H10"] = HEADER_COUNT
-    data_sheet["H3"] = '=COUNTIF(Table1[Type], "*ST*")'
-    data_sheet["H4"] = '=COUNTIF(Table1[Type], "*SF*")'
-    data_sheet["H5"] = '=COUNTIF(Table1[Type], "*NF*")'
-    data_sheet["H6"] = '=COUNTIF(Table1[Type], "*NT*")'
-    data_sheet["H11"] = '=COUNTIF(Table1[Type], "I*J")'
-    data_sheet["H12"] = '=COUNTIF(Table1[Type], "I*P")'
-    data_sheet["H13"] = '=COUNTIF(Table1[Type], "E*J")'
-    data_sheet["H14"] = '=COUNTIF(Table1[Type], "E*P")'
-
-    # Insert INTERNAL_TYPES at G3->G6
-    for i, internal_type in enumerate(INTERNAL_TYPES):
-        data_sheet[f"G{3 + i}"] = internal_type
 
-    # Insert EXTERNAL_TYPES at G11->G14
-    for i, external_type in enumerate(EXTERNAL_TYPES):
-        data_sheet[f"G{11 + i}"] = external_type
+    # Internal pairs in G3:H6, external pairs in G11:H14
+    for first_row, pairs, counts in (
+        (3, INTERNAL_TYPES, aggregates["internal"]),
+        (11, EXTERNAL_TYPES, aggregates["external"]),
+    ):
+        for row, pair in enumerate(pairs, start=first_row):
+            data_sheet.cell(row=row, column=7, value=pair)
+            data_sheet.cell(row=row, column=8, value=counts[pair])
 
 
-def prepare_dominant_function_data(data_sheet):
+def prepare_dominant_function_data(data_sheet, aggregates):
     data_sheet["G17"] = HEADER_DOMINANT_FUNCTION_DATA
-    data_sheet["G17"].font = Font(bold=True)
+    data_sheet["G17"].font = BOLD
     data_sheet["G18"] = HEADER_DOMINANT_FUNCTION
     data_sheet["H18"] = HEADER_COUNT
-    data_sheet["G19"] = "Te"
-    data_sheet["H19"] = "=SUM(B17,B14)"
-    data_sheet["G20"] = "Ti"
-    data_sheet["H20"] = "=SUM(B9,B6)"
-    data_sheet["G21"] = "Ne"
-    data_sheet["H21"] = "=SUM(B12,B13)"
-    data_sheet["G22"] = "Ni"
-    data_sheet["H22"] = "=SUM(B4,B5)"
-    data_sheet["G23"] = "Fe"
-    data_sheet["H23"] = "=SUM(B16,B15)"
-    data_sheet["G24"] = "Fi"
-    data_sheet["H24"] = "=SUM(B8,B7)"
-    data_sheet["G25"] = "Se"
-    data_sheet["H25"] = "=SUM(B11,B10)"
-    data_sheet["G26"] = "Si"
-    data_sheet["H26"] = "=SUM(B3,B2)"
+    for row, function in enumerate(DATA_DOMINANT_FUNCTION_ORDER, start=19):
+        data_sheet.cell(row=row, column=7, value=function)
+        data_sheet.cell(row=row, column=8, value=aggregates["dominant"][function])
 
 
 def create_main_distribution_chart(data_sheet, chart_sheet):
@@ -603,35 +306,19 @@ def create_main_distribution_chart(data_sheet, chart_sheet):
     return main_chart
 
 
-def create_dichotomy_charts(data_sheet, chart_sheet):
-    # Create stacked bar charts for each dichotomy
-    create_stacked_dichotomy_chart(
-        data_sheet, chart_sheet, CHART_TITLE_ENERGY_ORIENTATION, "D3:D4", "D3:E4", "C24"
-    )
-    create_stacked_dichotomy_chart(
-        data_sheet,
-        chart_sheet,
-        CHART_TITLE_INFORMATION_GATHERING,
-        "D7:D8",
-        "D7:E8",
-        "K24",
-    )
-    create_stacked_dichotomy_chart(
-        data_sheet,
-        chart_sheet,
-        CHART_TITLE_DECISION_MAKING,
-        "D11:D12",
-        "D11:E12",
-        "S24",
-    )
-    create_stacked_dichotomy_chart(
-        data_sheet,
-        chart_sheet,
-        CHART_TITLE_LIFESTYLE_STRUCTURE,
-        "D15:D16",
-        "D15:E16",
-        "AA24",
-    )
+def create_dichotomy_charts(data_sheet, chart_sheet, layout):
+    # One stacked bar chart per dichotomy
+    for block in layout:
+        if block["kind"] == "dichotomy":
+            labels_range, data_range = block_ranges(block)
+            create_stacked_dichotomy_chart(
+                data_sheet,
+                chart_sheet,
+                block["chart_title"],
+                labels_range,
+                data_range,
+                block["chart"],
+            )
 
 
 def create_stacked_dichotomy_chart(
@@ -743,76 +430,19 @@ def create_dominant_chart(data_sheet, chart_sheet):
     chart_sheet.add_chart(dominant_pie, "K3")
 
 
-def create_facet_bar_charts(data_sheet, chart_sheet):
-    # Create pie charts for facet dichotomies, organized in rows
-
-    # Row 1: E/I facets
-    create_facet_bar_chart(
-        data_sheet, chart_sheet, "D20", "D21:D23", "D21:E23", "C33"
-    )  # Initiating-Receiving
-    create_facet_bar_chart(
-        data_sheet, chart_sheet, "D26", "D27:D29", "D27:E29", "C40"
-    )  # Expressive-Contained
-    create_facet_bar_chart(
-        data_sheet, chart_sheet, "D30", "D31:D33", "D31:E33", "C47"
-    )  # Gregarious-Intimate
-    create_facet_bar_chart(
-        data_sheet, chart_sheet, "D36", "D37:D39", "D37:E39", "C54"
-    )  # Active-Reflective
-    create_facet_bar_chart(
-        data_sheet, chart_sheet, "D42", "D43:D45", "D43:E45", "C61"
-    )  # Enthusiastic-Quiet
-
-    # Row 2: S/N facets
-    create_facet_bar_chart(
-        data_sheet, chart_sheet, "D48", "D49:D51", "D49:E51", "K33"
-    )  # Concrete-Abstract
-    create_facet_bar_chart(
-        data_sheet, chart_sheet, "D54", "D55:D57", "D55:E57", "K40"
-    )  # Realistic-Imaginative
-    create_facet_bar_chart(
-        data_sheet, chart_sheet, "D60", "D61:D63", "D61:E63", "K47"
-    )  # Practical-Conceptual
-    create_facet_bar_chart(
-        data_sheet, chart_sheet, "D66", "D67:D69", "D67:E69", "K54"
-    )  # Experiential-Theoretical
-    create_facet_bar_chart(
-        data_sheet, chart_sheet, "D72", "D73:D75", "D73:E75", "K61"
-    )  # Traditional-Original
-
-    # Row 3: T/F facets
-    create_facet_bar_chart(
-        data_sheet, chart_sheet, "D78", "D79:D81", "D79:E81", "S33"
-    )  # Logical-Empathetic
-    create_facet_bar_chart(
-        data_sheet, chart_sheet, "D84", "D85:D87", "D85:E87", "S40"
-    )  # Reasonable-Compassionate
-    create_facet_bar_chart(
-        data_sheet, chart_sheet, "D90", "D91:D93", "D91:E93", "S47"
-    )  # Questioning-Accommodating
-    create_facet_bar_chart(
-        data_sheet, chart_sheet, "D96", "D97:D99", "D97:E99", "S54"
-    )  # Critical-Accepting
-    create_facet_bar_chart(
-        data_sheet, chart_sheet, "D102", "D103:D105", "D103:E105", "S61"
-    )  # Tough-Tender
-
-    # Row 4: J/P facets
-    create_facet_bar_chart(
-        data_sheet, chart_sheet, "D108", "D109:D111", "D109:E111", "AA33"
-    )  # Systematic-Casual
-    create_facet_bar_chart(
-        data_sheet, chart_sheet, "D114", "D115:D117", "D115:E117", "AA40"
-    )  # Planful-Open-Ended
-    create_facet_bar_chart(
-        data_sheet, chart_sheet, "D120", "D121:D123", "D121:E123", "AA47"
-    )  # Early Starting-Pressure-Prompted
-    create_facet_bar_chart(
-        data_sheet, chart_sheet, "D126", "D127:D129", "D127:E129", "AA54"
-    )  # Scheduled-Spontaneous
-    create_facet_bar_chart(
-        data_sheet, chart_sheet, "D132", "D133:D135", "D133:E135", "AA61"
-    )  # Methodical-Emergent
+def create_facet_bar_charts(data_sheet, chart_sheet, layout):
+    # One stacked bar chart per facet pair, titled by its block's title cell
+    for block in layout:
+        if block["kind"] == "facet":
+            labels_range, data_range = block_ranges(block)
+            create_facet_bar_chart(
+                data_sheet,
+                chart_sheet,
+                f"D{block['row']}",
+                labels_range,
+                data_range,
+                block["chart"],
+            )
 
 
 def create_facet_bar_chart(
@@ -922,20 +552,6 @@ def create_legend_for_facet_graphs(chart_sheet):
     chart_sheet.add_chart(chart, "O22")
 
 
-def adjust_column_widths(sheet):
-    for column in sheet.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(cell.value)
-            except Exception:
-                pass
-        adjusted_width = max_length + 2
-        sheet.column_dimensions[column_letter].width = adjusted_width
-
-
 def reorder_sheets(workbook):
     """
     Reorders the sheets in the workbook to a logical order:
@@ -615,10 +615,95 @@ MEDIA_DIRECTORY_KEEP_ITEMS = {
 TEMP_DIR = "/tmp/tmp_pdf"
 OUTPUT_DIR = os.getenv("OUTPUT_DIR", str(PROJECT_BASE_DIR / "output"))
 INPUT_DIR = os.getenv("INPUT_DIR", str(PROJECT_BASE_DIR / "input"))
+MEDIA_DIR = os.getenv("MEDIA_DIR", str(PROJECT_BASE_DIR / "backend" / "media"))
 OUTPUT_DIR_FACET_GRAPH = os.getenv(
     "MEDIA_DIR", str(PROJECT_BASE_DIR / "backend" / "media")
 )
 
+# Report stylesheets, parsed once per process by renderer.py
+STYLES_DIR = Path(__file__).resolve().parent / "styles"
+REPORT_STYLESHEETS = {
+    "personal": "personal_report.css",
+    "dual": "dual_report.css",
+    "translated": "translated_report.css",
+    "group_data": "group_data_report.css",
+    "insight": "insight_report.css",
+}
+
+# Number of warm PDF render worker processes started with the server (0 = render
+# in the request process)
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", str(min(os.cpu_count() or 1, 4))))
+
+# Keep the intermediate HTML of rendered reports next to the PDF (for debugging)
+KEEP_RENDER_ARTIFACTS = os.getenv("KEEP_RENDER_ARTIFACTS", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# Report jobs of each kind that run at once; further jobs wait in the queue
+JOB_CAPACITY = {
+    "group": 1,
+    "personal_batch": 1,
+    "group_insight": 2,
+    "insight": 2,
+    "personal": 2,
+    "dual": 2,
+    "translate": 2,
+}
+
+# Interactive jobs take seconds and are started before batch jobs, which can
+# take minutes. Both share JOB_WORKERS, but batch jobs never use the last
+# INTERACTIVE_RESERVED_WORKERS of them.
+JOB_LANES = {
+    "personal": "interactive",
+    "dual": "interactive",
+    "insight": "interactive",
+    "translate": "interactive",
+    "group": "batch",
+    "personal_batch": "batch",
+    "group_insight": "batch",
+}
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+INTERACTIVE_RESERVED_WORKERS = int(os.getenv("INTERACTIVE_RESERVED_WORKERS", "2"))
+
+# Reports of a personal report batch built at once (their renders share the
+# RENDER_WORKERS pool)
+PERSONAL_BATCH_WORKERS = int(
+    os.getenv("PERSONAL_BATCH_WORKERS", str(min(os.cpu_count() or 1, 4)))
+)
+
+# Waiting jobs per kind before new requests are rejected with 429
+MAX_QUEUED_JOBS = int(os.getenv("MAX_QUEUED_JOBS", "20"))
+
+# "local" runs report jobs inside the API process; "sqlite" stores tasks and
+# jobs in TASK_DB_PATH for separate `python -m MBTInfo.worker` processes
+JOB_BACKEND = os.getenv("JOB_BACKEND", "local")
+TASK_DB_PATH = os.getenv("TASK_DB_PATH", os.path.join(OUTPUT_DIR, "tasks.sqlite3"))
+# A running job whose worker sent no heartbeat for this long is failed (the
+# worker was killed); workers send one every --poll seconds
+JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "60"))
+
+# Seconds a report job may spend in one pipeline stage before it is stopped and
+# marked failed; STAGE_TIMEOUT_<STAGE> overrides a single stage (e.g.
+# STAGE_TIMEOUT_RENDER=60). Jobs that report no stages get STAGE_TIMEOUT overall.
+STAGE_TIMEOUT = int(os.getenv("STAGE_TIMEOUT", "900"))
+STAGE_TIMEOUTS = {
+    stage: int(os.getenv(f"STAGE_TIMEOUT_{stage.upper()}", str(default)))
+    for stage, default in {
+        "extract": 120,
+        "parse": 120,
+        "xlsx_write": 300,
+        "xlsx_build": 300,
+        "xlsx_reorder": 300,
+        "chart": 120,
+        "format": 300,
+        "render": 180,
+        "gpt": 300,
+        "translation": 900,
+    }.items()
+}
+
 MEDIA_DIRECTORIES_TO_CHECK = [
     "backend/media",
     "./backend/media",
@@ -675,6 +760,11 @@ DOMINANT_FUNCTIONS = {
 # Excel/DataFrame Constants
 SHEET_NAME_DATA = "Data"
 SHEET_NAME_MBTI_RESULTS = "MBTI Results"
+# Group workbook counts (aggregates.py) and parsed records (dataset.py), saved
+# next to the .xlsx
+AGGREGATES_FILE_SUFFIX = "_aggregates.json"
+RECORDS_FILE_SUFFIX = "_records.json.gz"
+EXPORT_CHUNK_ROWS = 500  # Records per chunk of a streamed CSV/JSON export
 COL_TYPE = "Type"
 COL_NAME = "Name"
 COL_DOMINANT = "Dominant"
@@ -837,6 +927,21 @@ CHART_HEIGHT_FACET = 3.175
 CHART_STYLE = 10
 CHART_OVERLAP = 100
 
+# Dashboard layout: one chart column per dichotomy (E/I, S/N, T/F, J/P), with
+# the dichotomy's chart on DASHBOARD_DICHOTOMY_CHART_ROW and its facet charts
+# from DASHBOARD_FACET_CHART_ROW, every DASHBOARD_FACET_CHART_ROW_STEP rows
+DASHBOARD_CHART_COLUMNS = ["C", "K", "S", "AA"]
+DASHBOARD_DICHOTOMY_CHART_ROW = 24
+DASHBOARD_FACET_CHART_ROW = 33
+DASHBOARD_FACET_CHART_ROW_STEP = 7
+
+# Data sheet blocks behind those charts, one every DATA_BLOCK_ROWS rows:
+# dichotomies from DATA_DICHOTOMY_FIRST_ROW, facet pairs from
+# DATA_FACET_FIRST_ROW
+DATA_BLOCK_ROWS = 4
+DATA_DICHOTOMY_FIRST_ROW = 2
+DATA_FACET_FIRST_ROW = 20
+
 # Chart Bar Colors
 CHART_BAR_COLORS = ["4472C4", "C0504D"]  # Blue, Red (hex)
 
@@ -879,8 +984,15 @@ OPENAI_FILE_PURPOSE_USER_DATA = "user_data"
 
 # MBTI-related Constants
 DOMINANT_FUNCTIONS_LIST = ["Te", "Ti", "Fe", "Fi", "Se", "Si", "Ne", "Ni"]
+# The same functions as listed on the group workbook's Data sheet: thinking,
+# intuition, feeling, then sensing
+DATA_DOMINANT_FUNCTION_ORDER = sorted(
+    DOMINANT_FUNCTIONS_LIST, key=lambda function: "TNFS".index(function[0])
+)
 UNKNOWN_VALUE = "Unknown"
 
 # Format Constants
+COLUMN_WIDTH_PADDING = 2  # Characters added to a column's longest value
+COLUMN_WIDTH_SCALE = 1.2  # Width per character of the formatted sheets
 DATE_FORMAT_REPORT = "%Y-%m-%d %H:%M"
 IMAGE_FORMAT_PNG = "PNG"
@@ -1,5 +1,6 @@
 import os
 
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Alignment, Font
 from openpyxl.worksheet.table import Table, TableStyleInfo
 
@@ -14,6 +15,8 @@ from .consts import (
     SECTION_SHEET_TEXT_FILE_SUFFIX,
     SECTION_SHEET_TITLE_FONT_SIZE,
 )
+from .data_to_excel import add_declared_table, results_headers
+from .formatting import apply_column_widths, text_widths
 from .utils import (
     check_communication,
     check_managing_change,
@@ -49,6 +52,80 @@ def create_section_sheets(input_directory, workbook):
     return workbook
 
 
+def write_section_sheets(workbook, rows):
+    """
+    Stream the section sheets into a write-only workbook.
+
+    Each section's facets are taken from the MBTI Results rows, so the text
+    files are not parsed again, and the sheets list the same people in the
+    same order.
+
+    Args:
+        workbook: Workbook created with ``write_only=True``
+        rows: parse_pdf_record rows, one per person
+    """
+    result_headers = results_headers()
+    headers = _section_headers()
+    base_columns = len(SECTION_SHEET_BASE_HEADERS)
+    bold = Font(bold=True)
+
+    for section in SECTION_SHEET_NAMES:
+        first = result_headers.index(section)
+        people = [
+            row[:base_columns] + row[first : first + SECTION_SHEET_MAX_FACETS]
+            for row in rows
+        ]
+        sheet = workbook.create_sheet(title=section)
+
+        apply_column_widths(
+            sheet,
+            text_widths([[section], headers, *people]),
+            SECTION_SHEET_COLUMN_PADDING,
+        )
+
+        table_ref = (
+            f"{SECTION_SHEET_TABLE_START}:"
+            f"{SECTION_SHEET_TABLE_END_COLUMN}{len(people) + 3}"
+        )
+        add_declared_table(
+            sheet,
+            f"{section.replace(' ', '')}Table",
+            table_ref,
+            headers,
+            _section_table_style(),
+        )
+
+        title = WriteOnlyCell(sheet, value=section)
+        title.font = Font(size=SECTION_SHEET_TITLE_FONT_SIZE, bold=True)
+        title.alignment = Alignment(horizontal="center")
+        sheet.append([title])
+        sheet.append([])
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(sheet, value=header)
+            cell.font = bold
+            header_cells.append(cell)
+        sheet.append(header_cells)
+        for person in people:
+            sheet.append(person)
+
+
+def _section_headers():
+    return SECTION_SHEET_BASE_HEADERS + [
+        f"Facet {i}" for i in range(1, SECTION_SHEET_MAX_FACETS + 1)
+    ]
+
+
+def _section_table_style():
+    return TableStyleInfo(
+        name=SECTION_SHEET_STYLE,
+        showFirstColumn=False,
+        showLastColumn=False,
+        showRowStripes=True,
+        showColumnStripes=False,
+    )
+
+
 def _setup_sheet(sheet, title):
     # Add title
     sheet["A1"] = title
@@ -56,10 +133,7 @@ def _setup_sheet(sheet, title):
     sheet["A1"].alignment = Alignment(horizontal="center")
 
     # Add headers (row 3)
-    headers = SECTION_SHEET_BASE_HEADERS + [
-        f"Facet {i}" for i in range(1, SECTION_SHEET_MAX_FACETS + 1)
-    ]
-    for col, header in enumerate(headers, start=1):
+    for col, header in enumerate(_section_headers(), start=1):
         cell = sheet.cell(row=3, column=col, value=header)
         cell.font = Font(bold=True)
 
@@ -79,19 +153,9 @@ def _create_table(sheet, last_row):
         f"{SECTION_SHEET_TABLE_START}:{SECTION_SHEET_TABLE_END_COLUMN}{last_row}"
     )
     tab = Table(displayName=f"{sheet.title.replace(' ', '')}Table", ref=table_ref)
-    style = TableStyleInfo(
-        name=SECTION_SHEET_STYLE,
-        showFirstColumn=False,
-        showLastColumn=False,
-        showRowStripes=True,
-        showColumnStripes=False,
-    )
-    tab.tableStyleInfo = style
+    tab.tableStyleInfo = _section_table_style()
     sheet.add_table(tab)
 
     # Adjust column widths
-    for column_cells in sheet.columns:
-        length = max(len(str(cell.value)) for cell in column_cells if cell.value)
-        sheet.column_dimensions[column_cells[0].column_letter].width = (
-            length + SECTION_SHEET_COLUMN_PADDING
-        )
+    widths = text_widths(sheet.iter_rows(values_only=True))
+    apply_column_widths(sheet, widths, SECTION_SHEET_COLUMN_PADDING)
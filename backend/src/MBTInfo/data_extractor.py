@@ -2,9 +2,11 @@ import os
 
 import PyPDF2
 
+from .telemetry import timed
 from .utils import sanitize_filename
 
 
+@timed("extract")
 def extract_and_save_text(filepath: str, output_folder: str) -> str:
     """Extract text from PDF with multiple fallback methods"""
     try:
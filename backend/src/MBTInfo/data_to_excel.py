@@ -1,11 +1,14 @@
 import os
+import warnings
 
 import openpyxl as xl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Alignment, Font
 from openpyxl.utils import get_column_letter
-from openpyxl.worksheet.table import Table, TableStyleInfo
+from openpyxl.worksheet.table import Table, TableColumn, TableStyleInfo
 
 from .consts import (
+    COLUMN_WIDTH_SCALE,
     DATA_EXCEL_BASE_HEADERS,
     DATA_EXCEL_COLUMN_PADDING,
     DATA_EXCEL_DEFAULT_WIDTH,
@@ -18,6 +21,8 @@ from .consts import (
     SECTION_SHEET_MAX_FACETS,
     SECTION_SHEET_NAMES,
 )
+from .formatting import apply_column_widths, text_widths
+from .telemetry import span
 from .utils import (
     check_communication,
     check_managing_change,
@@ -29,21 +34,66 @@ from .utils import (
 )
 
 
-def process_pdf_to_xl(text_path, output_dir, result_sheet_name, output_filename):
-    info = get_all_info(text_path)
-    qualities = find_and_parse_mbti_scores(text_path)
-    mbti_dict = convert_scores_to_mbti_dict(qualities)
-    preferred_qualities, midzone_qualities, out_qualities = collect_qualities(text_path)
+def results_headers():
+    """MBTI Results header row, with each section's numbered columns expanded."""
+    headers = DATA_EXCEL_BASE_HEADERS + FACETS
+    for section in SECTION_SHEET_NAMES:
+        headers.append(section)
+        headers.extend(f"{section}-{i + 1}" for i in range(DATA_EXCEL_SECTION_COLUMNS))
+    return headers
+
+
+def parse_pdf_record(text_path):
+    """
+    Parse a report's extracted text into its MBTI Results row.
+
+    Args:
+        text_path: Text file written by extract_and_save_text
+
+    Returns:
+        list: One value per results_headers() column, None where empty
+    """
+    with span("parse"):
+        info = get_all_info(text_path)
+        qualities = find_and_parse_mbti_scores(text_path)
+        mbti_dict = convert_scores_to_mbti_dict(qualities)
+        preferred_qualities, midzone_qualities, out_qualities = collect_qualities(
+            text_path
+        )
+
+        # Get communication, change management, and conflict management facets
+        communication_facets = check_communication(text_path)
+        change_facets = check_managing_change(text_path)
+        conflict_facets = check_managing_conflict(text_path)
+
+        # Convert all qualities to lowercase for case-insensitive comparison
+        preferred_qualities = [q.lower() for q in preferred_qualities]
+        midzone_qualities = [q.lower() for q in midzone_qualities]
+        out_qualities = [q.lower() for q in out_qualities]
+
+    data = [info["name"], info["date"], info["type"]] + list(mbti_dict.values())
+
+    # Add values for facets
+    for facet in FACETS:
+        facet_lower = facet.lower()
+        if facet_lower in preferred_qualities:
+            data.append("IN-PREF")
+        elif facet_lower in midzone_qualities:
+            data.append("MIDZONE")
+        elif facet_lower in out_qualities:
+            data.append("OUT-OF-PREF")
+        else:
+            data.append("-")
 
-    # Get communication, change management, and conflict management facets
-    communication_facets = check_communication(text_path)
-    change_facets = check_managing_change(text_path)
-    conflict_facets = check_managing_conflict(text_path)
+    # Add values for communication, change management, and conflict management
+    for facets in (communication_facets, change_facets, conflict_facets):
+        data.extend(facets + [None] * (SECTION_SHEET_MAX_FACETS - len(facets)))
 
-    # Convert all qualities to lowercase for case-insensitive comparison
-    preferred_qualities = [q.lower() for q in preferred_qualities]
-    midzone_qualities = [q.lower() for q in midzone_qualities]
-    out_qualities = [q.lower() for q in out_qualities]
+    return [value if value else None for value in data]
+
+
+def process_pdf_to_xl(text_path, output_dir, result_sheet_name, output_filename):
+    data = parse_pdf_record(text_path)
 
     output_path = os.path.join(output_dir, output_filename)
 
@@ -53,11 +103,6 @@ def process_pdf_to_xl(text_path, output_dir, result_sheet_name, output_filename)
     sections = SECTION_SHEET_NAMES
     headers.extend(sections)  # Add section headers without empty cells
 
-    # Calculate the actual number of columns needed
-    actual_columns = len(headers)
-    # Add extra columns for the section data
-    actual_columns += DATA_EXCEL_SECTION_COLUMNS * len(sections)
-
     if os.path.exists(output_path):
         workbook = xl.load_workbook(filename=str(output_path))
         if result_sheet_name in workbook.sheetnames:
@@ -79,39 +124,6 @@ def process_pdf_to_xl(text_path, output_dir, result_sheet_name, output_filename)
         _setup_headers(sheet, headers, sections)
         last_row = 2  # Start data from row 2 (row 1 is headers)
 
-    data = [info["name"], info["date"], info["type"]] + list(mbti_dict.values())
-
-    # Add values for facets (exclude base headers and section headers)
-    # Slice to get only facet headers (after base headers, before section headers)
-    num_base_headers = len(DATA_EXCEL_BASE_HEADERS)
-    num_sections = len(sections)
-    facet_headers = (
-        headers[num_base_headers:-num_sections]
-        if num_sections > 0
-        else headers[num_base_headers:]
-    )
-
-    for header in facet_headers:
-        header_lower = header.lower()
-        if header_lower in preferred_qualities:
-            data.append("IN-PREF")
-        elif header_lower in midzone_qualities:
-            data.append("MIDZONE")
-        elif header_lower in out_qualities:
-            data.append("OUT-OF-PREF")
-        else:
-            data.append("-")
-
-    # Add values for communication, change management, and conflict management
-    data.extend(
-        communication_facets
-        + [""] * (SECTION_SHEET_MAX_FACETS - len(communication_facets))
-    )
-    data.extend(change_facets + [""] * (SECTION_SHEET_MAX_FACETS - len(change_facets)))
-    data.extend(
-        conflict_facets + [""] * (SECTION_SHEET_MAX_FACETS - len(conflict_facets))
-    )
-
     # Append data to the last empty row
     for col, value in enumerate(data, start=1):
         sheet.cell(row=last_row, column=col, value=value if value else "")
@@ -128,18 +140,88 @@ def process_pdf_to_xl(text_path, output_dir, result_sheet_name, output_filename)
 
     # Create a new table with the correct range and style
     tab = Table(displayName=DATA_EXCEL_TABLE_NAME, ref=table_range)
-    style = TableStyleInfo(
+    tab.tableStyleInfo = _results_table_style()
+    sheet.add_table(tab)
+
+    workbook.save(filename=str(output_path))
+    return output_path
+
+
+def write_results_sheet(workbook, rows, result_sheet_name):
+    """
+    Stream the MBTI Results sheet into a write-only workbook.
+
+    Each row goes straight to the file instead of being kept as Cell objects,
+    so memory stays flat however many people the report lists. The table is
+    declared up-front from the row count. Column widths are sized from the
+    headers and rows with COLUMN_WIDTH_SCALE, as format_xl would size them.
+
+    Args:
+        workbook: Workbook created with ``write_only=True``
+        rows: parse_pdf_record rows, one per person
+        result_sheet_name: Name of the MBTI Results sheet
+    """
+    headers = results_headers()
+    sheet = workbook.create_sheet(result_sheet_name)
+
+    # Final widths, sized as format_xl would size them, so formatting does not
+    # have to scan the sheet again
+    apply_column_widths(sheet, text_widths([headers, *rows]), scale=COLUMN_WIDTH_SCALE)
+    sheet.freeze_panes = DATA_EXCEL_FREEZE_PANES
+
+    last_col_letter = get_column_letter(len(headers))
+    add_declared_table(
+        sheet,
+        DATA_EXCEL_TABLE_NAME,
+        f"{DATA_EXCEL_TABLE_START}:{last_col_letter}{len(rows) + 1}",
+        headers,
+        _results_table_style(),
+    )
+
+    # Named headers are bold, section headers also centred; their numbered
+    # columns stay plain
+    named = set(DATA_EXCEL_BASE_HEADERS + FACETS + SECTION_SHEET_NAMES)
+    bold = Font(bold=True)
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(sheet, value=header)
+        if header in named:
+            cell.font = bold
+        if header in SECTION_SHEET_NAMES:
+            cell.alignment = Alignment(horizontal="center")
+        header_cells.append(cell)
+    sheet.append(header_cells)
+    for row in rows:
+        sheet.append(row)
+
+
+def add_declared_table(sheet, name, ref, headers, style):
+    """
+    Add a table over ``ref`` with its columns named up-front.
+
+    Write-only worksheets cannot read their header cells back when saving, so
+    the column names are set on the table itself (openpyxl still warns that
+    they must be, which is silenced here).
+    """
+    tab = Table(displayName=name, ref=ref)
+    tab.tableColumns = [
+        TableColumn(id=index, name=str(header))
+        for index, header in enumerate(headers, start=1)
+    ]
+    tab.tableStyleInfo = style
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", "In write-only mode")
+        sheet.add_table(tab)
+
+
+def _results_table_style():
+    return TableStyleInfo(
         name=DATA_EXCEL_TABLE_STYLE,
         showFirstColumn=False,
         showLastColumn=False,
         showRowStripes=True,
         showColumnStripes=True,
     )
-    tab.tableStyleInfo = style
-    sheet.add_table(tab)
-
-    workbook.save(filename=str(output_path))
-    return output_path
 
 
 def _unmerge_first_row(sheet):
@@ -163,19 +245,12 @@ def _setup_headers(sheet, headers, sections):
                 col += 1
                 sheet.cell(row=1, column=col).value = f"{header}-{i + 1}"
         col += 1
-    # Adjust column widths to fit content
-    for column_cells in sheet.columns:
-        lengths = [len(str(cell.value)) for cell in column_cells if cell.value]
-        if lengths:
-            max_length = max(lengths)
-            sheet.column_dimensions[column_cells[0].column_letter].width = (
-                max_length + DATA_EXCEL_COLUMN_PADDING
-            )
-        else:
-            # Set a default width for empty columns
-            sheet.column_dimensions[column_cells[0].column_letter].width = (
-                DATA_EXCEL_DEFAULT_WIDTH
-            )
+    # Adjust column widths to fit the headers, default width for empty columns
+    widths = text_widths(sheet.iter_rows(max_row=1, values_only=True))
+    apply_column_widths(sheet, widths, DATA_EXCEL_COLUMN_PADDING)
+    for letter, length in widths.items():
+        if not length:
+            sheet.column_dimensions[letter].width = DATA_EXCEL_DEFAULT_WIDTH
 
     # Freeze the first row
     sheet.freeze_panes = DATA_EXCEL_FREEZE_PANES
@@ -0,0 +1,148 @@
+"""
+Group dataset: the parsed records behind a group workbook.
+
+The group pipeline saves the MBTI Results rows next to the workbook as
+gzip-compressed columnar JSON ({column: [values, ...]}, in sheet order).
+Later steps, such as the group insight and the CSV/JSON/Parquet exports, read
+them without opening the .xlsx. For reports built before the records file
+existed, load_records reads the workbook's MBTI Results sheet instead.
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+from itertools import islice
+
+import openpyxl as xl
+import pandas as pd
+
+from .consts import EXPORT_CHUNK_ROWS, RECORDS_FILE_SUFFIX, SHEET_NAME_MBTI_RESULTS
+
+
+def sheet_records(sheet):
+    """
+    Columnar records of an MBTI Results sheet, one value per person.
+
+    Args:
+        sheet: MBTI Results worksheet (header row first); read-only
+            worksheets work too
+
+    Returns:
+        dict: {column: [values]}; empty rows are dropped
+    """
+    rows = sheet.iter_rows(values_only=True)
+    header = [column for column in next(rows, ()) if column is not None]
+    people = [row for row in rows if any(value is not None for value in row)]
+    return {
+        column: [row[index] if index < len(row) else None for row in people]
+        for index, column in enumerate(header)
+    }
+
+
+def rows_records(header, rows):
+    """Columnar records of rows that are not in a worksheet yet, e.g. parsed rows."""
+    return {column: [row[index] for row in rows] for index, column in enumerate(header)}
+
+
+def records_rows(records, header):
+    """
+    Rows of columnar records, one per person, with values in header order.
+
+    Columns missing from the records are left empty.
+    """
+    people = len(next(iter(records.values()), []))
+    columns = [records.get(column) or [None] * people for column in header]
+    return [list(row) for row in zip(*columns)]
+
+
+def records_frame(records):
+    """Columnar records as a DataFrame, one row per person."""
+    return pd.DataFrame(records)
+
+
+def records_path(excel_path):
+    return os.path.splitext(excel_path)[0] + RECORDS_FILE_SUFFIX
+
+
+def save_records(excel_path, records):
+    """Write a workbook's records to its compressed records file."""
+    path = records_path(excel_path)
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(records, f, default=str)
+    return path
+
+
+def load_records(excel_path):
+    """
+    Columnar records of a group workbook.
+
+    Reads the records file, or the workbook's MBTI Results sheet (read-only)
+    for reports built before records files were written.
+    """
+    path = records_path(excel_path)
+    if os.path.exists(path):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    print(f"⚠️ No records file for {excel_path}, reading MBTI Results")
+    workbook = xl.load_workbook(excel_path, read_only=True)
+    try:
+        return sheet_records(workbook[SHEET_NAME_MBTI_RESULTS])
+    finally:
+        workbook.close()
+
+
+def _row_chunks(records, chunk_rows):
+    rows = zip(*records.values())
+    while True:
+        chunk = list(islice(rows, chunk_rows))
+        if not chunk:
+            return
+        yield chunk
+
+
+def csv_chunks(records, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Records as CSV text, header row first, yielded a chunk of rows at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(records)
+    for chunk in _row_chunks(records, chunk_rows):
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def json_chunks(records, chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Records as a JSON array with one {column: value} object per person,
+    yielded a chunk of people at a time.
+    """
+    columns = list(records)
+    separator = "\n"
+    yield "["
+    for chunk in _row_chunks(records, chunk_rows):
+        yield separator + ",\n".join(
+            json.dumps(dict(zip(columns, row)), default=str, ensure_ascii=False)
+            for row in chunk
+        )
+        separator = ",\n"
+    yield "\n]\n"
+
+
+def parquet_bytes(records):
+    """
+    Records as a Parquet file.
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    buffer = io.BytesIO()
+    pq.write_table(pa.table(records), buffer)
+    return buffer.getvalue()
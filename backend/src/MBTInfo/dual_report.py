@@ -1,12 +1,12 @@
-import base64
 import os
 from pathlib import Path
 
-from weasyprint import HTML
-
 from .consts import MEDIA_PATH, OUTPUT_PATH, TEMP_DIR
 from .data_extractor import extract_and_save_text
 from .image_manipulation import create_all_graphs
+from .renderer import LOGO_ASSET_URL, render_pdf, task_url
+from .telemetry import no_progress, span
+from .templating import render_template
 from .utils import get_all_info, sanitize_path_component
 
 
@@ -23,15 +23,11 @@ def path_exists(p) -> bool:
         return False
 
 
-def _encode_or_placeholder(p):
+def _read_or_placeholder(p):
     try:
-        return (
-            encode_image_base64(p)
-            if path_exists(p)
-            else create_placeholder_image_base64()
-        )
+        return read_image_bytes(p) if path_exists(p) else create_placeholder_image()
     except Exception:
-        return create_placeholder_image_base64()
+        return create_placeholder_image()
 
 
 def find_graph_by_suffix(identifier: str, suffix: str) -> str | None:
@@ -76,16 +72,16 @@ def sanitize_filename(filename):
     return sanitized + ext
 
 
-def encode_image_base64(path):
+def read_image_bytes(path):
     if not os.path.exists(path):
         raise FileNotFoundError(f"Image file not found: {path}")
     with open(path, "rb") as img_file:
-        return base64.b64encode(img_file.read()).decode("utf-8")
+        return img_file.read()
 
 
-def create_placeholder_image_base64():
+def create_placeholder_image():
     """
-    Creates a simple placeholder image as base64 when actual graph is missing
+    Creates a simple placeholder PNG image when actual graph is missing
     """
     import io
 
@@ -114,14 +110,54 @@ def create_placeholder_image_base64():
 
     draw.text((x, y), text, fill="black", font=font)
 
-    # Convert to base64
     buffer = io.BytesIO()
     img.save(buffer, format="PNG")
-    buffer.seek(0)
-    return base64.b64encode(buffer.getvalue()).decode("utf-8")
+    return buffer.getvalue()
+
+
+def build_dual_report_html(info_pdf1, info_pdf2, graph_urls, logo_url=""):
+    """
+    Build the dual report HTML (styles: styles/dual_report.css).
 
+    Args:
+        info_pdf1: get_all_info() result for the first person
+        info_pdf2: get_all_info() result for the second person
+        graph_urls: Graph image URLs keyed by first/dominant/EI/SN/TF/JP
+        logo_url: Logo URL, or "" to render the report without it
 
-def generate_dual_report(pdf1_path, pdf2_path, output_pdf_path):
+    Returns:
+        str: The report HTML
+    """
+    logo_html = footer_logo_html = ""
+    if logo_url:
+        logo_html = f'<div class="logo"><img src="{logo_url}" alt="Company Logo"></div>'
+        footer_logo_html = f'<img src="{logo_url}" alt="TEMBTI Logo">'
+    return render_template(
+        "dual_report",
+        logo=logo_html,
+        footer_logo=footer_logo_html or "TEMBTI",
+        name1=info_pdf1["name"],
+        type1=info_pdf1["type"],
+        name2=info_pdf2["name"],
+        type2=info_pdf2["type"],
+        **{f"{name.lower()}_graph_url": url for name, url in graph_urls.items()},
+    )
+
+
+def generate_dual_report(pdf1_path, pdf2_path, output_pdf_path, progress=no_progress):
+    """
+    Generate the dual comparison report for two MBTI report PDFs.
+
+    Args:
+        pdf1_path: First person's report PDF
+        pdf2_path: Second person's report PDF
+        output_pdf_path: Directory to write the PDF to
+        progress: Called with the name of each stage as it starts
+
+    Returns:
+        tuple: (identifier, path of the generated PDF)
+    """
+    progress("extract")
     text_folder = str(OUTPUT_PATH / "textfiles")
     os.makedirs(text_folder, exist_ok=True)
 
@@ -151,8 +187,10 @@ def generate_dual_report(pdf1_path, pdf2_path, output_pdf_path):
         raise FileNotFoundError(f"Text file not found: {text2}")
 
     # Get info from text files
-    info_pdf1 = get_all_info(text1)
-    info_pdf2 = get_all_info(text2)
+    progress("parse")
+    with span("parse"):
+        info_pdf1 = get_all_info(text1)
+        info_pdf2 = get_all_info(text2)
 
     # Create sanitized identifier for folder/file creation
     first_name_part = sanitize_path_component(os.path.basename(pdf1_path)[:6])
@@ -161,8 +199,10 @@ def generate_dual_report(pdf1_path, pdf2_path, output_pdf_path):
 
     media_path = os.path.join(TEMP_DIR, "media", identifier)
 
+    progress("chart")
     try:
-        create_all_graphs(pdf1_path, pdf2_path, media_path)
+        with span("chart"):
+            create_all_graphs(pdf1_path, pdf2_path, media_path)
     except Exception as e:
         print(f"WARNING: Graph creation failed: {e}")
         print("Continuing with available graphs...")
@@ -188,305 +228,34 @@ def generate_dual_report(pdf1_path, pdf2_path, output_pdf_path):
         exists_flag = path_exists(p)
         print(f"  {i}: {p} (exists: {exists_flag})")
 
-    first_graph_base64 = _encode_or_placeholder(all_images_path[0])
-    ei_graph_base64 = _encode_or_placeholder(all_images_path[1])
-    tf_graph_base64 = _encode_or_placeholder(all_images_path[2])
-    jp_graph_base64 = _encode_or_placeholder(all_images_path[3])
-    sn_graph_base64 = _encode_or_placeholder(all_images_path[4])
-    dominant_graph_base64 = _encode_or_placeholder(all_images_path[5])
+    # Graph bytes go to the renderer and are referenced by task:// URLs instead
+    # of being base64-encoded into the HTML
+    graph_names = ["first", "EI", "TF", "JP", "SN", "dominant"]
+    graph_urls = {}
+    resources = {}
+    for name, image_path in zip(graph_names, all_images_path):
+        graph_urls[name] = task_url(identifier, f"{name}.png")
+        resources[graph_urls[name]] = _read_or_placeholder(image_path)
 
     # Ensure the output directory exists
     os.makedirs(output_dir, exist_ok=True)
-    logo_data_url = ""
-    if os.path.isfile(logo_path):
-        try:
-            with open(logo_path, "rb") as img_file:
-                import base64
-
-                img_data = base64.b64encode(img_file.read()).decode("utf-8")
-                logo_data_url = f"data:image/png;base64,{img_data}"
-        except Exception as e:
-            print(f"Error converting logo to data URL: {str(e)}")
-    else:
+    logo_url = LOGO_ASSET_URL if os.path.isfile(logo_path) else ""
+    if not logo_url:
         print(f"Warning: Logo file not found: {logo_path}")
 
-    # Encode graphs to base64 with fallback for missing images
-    try:
-        first_graph_base64 = (
-            encode_image_base64(all_images_path[0])
-            if os.path.exists(all_images_path[0])
-            else create_placeholder_image_base64()
-        )
-    except Exception as e:
-        print(f"Error encoding first graph: {e}")
-        first_graph_base64 = create_placeholder_image_base64()
-
-    try:
-        ei_graph_base64 = (
-            encode_image_base64(all_images_path[1])
-            if os.path.exists(all_images_path[1])
-            else create_placeholder_image_base64()
-        )
-    except Exception as e:
-        print(f"Error encoding EI graph: {e}")
-        ei_graph_base64 = create_placeholder_image_base64()
-
-    try:
-        sn_graph_base64 = (
-            encode_image_base64(all_images_path[4])
-            if os.path.exists(all_images_path[4])
-            else create_placeholder_image_base64()
-        )
-    except Exception as e:
-        print(f"Error encoding SN graph: {e}")
-        sn_graph_base64 = create_placeholder_image_base64()
-
-    try:
-        tf_graph_base64 = (
-            encode_image_base64(all_images_path[2])
-            if os.path.exists(all_images_path[2])
-            else create_placeholder_image_base64()
-        )
-    except Exception as e:
-        print(f"Error encoding TF graph: {e}")
-        tf_graph_base64 = create_placeholder_image_base64()
-
-    try:
-        jp_graph_base64 = (
-            encode_image_base64(all_images_path[3])
-            if os.path.exists(all_images_path[3])
-            else create_placeholder_image_base64()
-        )
-    except Exception as e:
-        print(f"Error encoding JP graph: {e}")
-        jp_graph_base64 = create_placeholder_image_base64()
-
-    try:
-        dominant_graph_base64 = (
-            encode_image_base64(all_images_path[5])
-            if os.path.exists(all_images_path[5])
-            else create_placeholder_image_base64()
-        )
-    except Exception as e:
-        print(f"Error encoding dominant graph: {e}")
-        dominant_graph_base64 = create_placeholder_image_base64()
-
-    try:
-        full_logo_base64 = (
-            encode_image_base64(logo_path) if os.path.exists(logo_path) else ""
-        )
-    except Exception as e:
-        print(f"Error encoding logo: {e}")
-        full_logo_base64 = ""
-
-    # HTML template
-    html_template = f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <title>Dual MBTI Report</title>
-        <style>
-            body {{
-                font-family: Arial, sans-serif;
-                margin: 10px;
-                color: #333;
-            }}
-            h1, h2 {{
-                text-align: center;
-                color: #2c3e50;
-            }}
-            .section {{
-                margin-top: 20px;
-            }}
-            .graph {{
-                text-align: center;
-                padding: 5px 5px 5px 5px;
-                padding-bottom: 10px;
-            }}
-            .names {{
-                font-size: 18px;
-                text-align: center;
-                margin-bottom: 30px;
-
-            }}
-            img {{
-                max-width: 100%;
-                height: auto;
-
-                border: 1px solid #ccc;
-            }}
-            .footer {{
-                position: fixed;
-                bottom: 20px;
-                left: 0;
-                right: 0;
-                text-align: center;
-                font-size: 9pt;
-                color: #666;
-                display: flex;
-                justify-content: center;
-                align-items: center;
-                gap: 10px;
-            }}
-            .footer img {{
-                height: 20px;
-                width: auto;
-                vertical-align: middle;
-                border: none;
-                padding: 0;
-                background: none;
-            }}
-            .name1 {{
-                font-weight: bold;
-                color: red;
-                text-decoration: underline;
-            }}
-            .name2 {{
-                font-weight: bold;
-                color: #0000ad;
-                text-decoration: underline;
-            }}
-            .hebrewText {{
-                direction: rtl;
-                margin-bottom: 10px;
-                }}
-            .header-table {{
-                width: 80%;
-                margin-left: auto;
-                margin-right: auto;
-                border-collapse: collapse;
-            }}
-            .header-table td {{
-                vertical-align: top;
-                padding-right: 10px;
-                pedding-left: 10px;
-            }}
-            .tableContent {{
-                text-decoration: none;
-                font-size: 16px;
-            }}
-            .page-break {{
-                page-break-before: always;
-            }}
-            .logo {{
-                position: fixed;
-                top: -40px;  /* Changed from -20px to make it visible */
-                left: 20px;  /* Changed from -20px to make it visible */
-                z-index: 1000;
-                margin: 0;
-                padding: 0;
-            }}
-            .logo img {{
-                width: 100px;  /* Set a fixed width instead of percentage */
-                height: auto;
-                padding: 0;  /* Override the general img padding */
-            }}
-        </style>
-    </head>
-    <body>
-        {('<div class="logo"><img src="data:image/png;base64,' + full_logo_base64 + '" alt="Company Logo"></div>') if full_logo_base64 else ''}
-        <h1>
-        ?מה האשיות הזוגית שלכם
-        </h1>
-        <div class="names"><b class="name1">{info_pdf1['name']}</b> | <b class="name2">  {info_pdf2['name']}</b></div>
-        <div class="hebrewText">
-        בשכלול הזוגי שלהלן מופיעים מרכיבי האישיות שלכם - במופע משותף.
-        </div>
-        <div class="hebrewText">
-        נסו לזהות היכן הם נוטים לאותו כיוון והיכן הם שונים.
-        </div>
-        <div class="hebrewText">
-        במקומות בהן הנטייה <strong>דומה</strong>, אמנם יש לכם צד חזק מאוד, באישיות המשותפת שלכם, אולם ייתכן גם שיש לכם, "אזורי עיוורון". נסו לתת על זה את דעתכם, ולחשוב, כיצד אתם יכולים להתפתח באזורים אילו.
-        </div>
-        <div class="hebrewText">
-במקומות בהם אתם <strong>שונים</strong> יכולות, מצד אחד, להתפתח דינאמיקות "משלימות" המייצרות 2<1+1. אילו נקודות חוזקה זוגיות אותן מומלץ להמשיך ולפתח. לעומת זאת,
-ייתכן וישנם מקומות של שוני המיצרים חילוקי דעות, חיכוחים וקונפליקטים. נסו להבין לעומק את מקומכם ואת מקומו של בן הזוג בהם.
-פיתוח מודעות שכזו עשויה להביא להבנה טובה יותר של אי ההבנות והחיכוחים ובהמשך קבלה והכלה שלהם. הצעד הבא הוא לחשוב על דרכים
-למנף את השוני ולנסות להפוך אותו לשלם הגדול מסך חלקיו, ע"י למשל, פיתוח הבנה שמה שיש לבן הזוג שלי יכול לעזור לי (להפך).
-        </div>
-
-        <div class="section">
-            <table class="header-table">
-                <tr>
-                    <td class="name1 tableContent">{info_pdf1['name']} | {info_pdf1['type']}</td>
-                    <td class="name2 tableContent" style="text-align: right;">{info_pdf2['name']} | {info_pdf2['type']}</td>
-                </tr>
-            </table>
-            <div class="graph">
-                <img src="data:image/png;base64,{first_graph_base64}" alt="first Graph">
-            </div>
-        </div>
-        <div class="section">
-            <div class="graph">
-                <img src="data:image/png;base64,{dominant_graph_base64}" alt="Dominant Graph">
-            </div>
-        </div>
-            <div class="page-break"></div>
-        <div class="section">
-            <h2>Extraversion vs. Introversion</h2>
-            <table class="header-table">
-                <tr>
-                    <td class="name1 tableContent">{info_pdf1['name']} | {info_pdf1['type']}</td>
-                    <td class="name2 tableContent" style="text-align: right;">{info_pdf2['name']} | {info_pdf2['type']}</td>
-                </tr>
-            </table>
-            <div class="graph">
-                <img src="data:image/png;base64,{ei_graph_base64}" alt="EI Graph">
-            </div>
-        </div>
-
-        <div class="section">
-            <h2>Sensing vs. Intuition</h2>
-            <table class="header-table">
-                <tr>
-                    <td class="name1 tableContent">{info_pdf1['name']} | {info_pdf1['type']}</td>
-                    <td class="name2 tableContent" style="text-align: right;">{info_pdf2['name']} | {info_pdf2['type']}</td>
-                </tr>
-            </table>
-            <div class="graph">
-                <img src="data:image/png;base64,{sn_graph_base64}" alt="SN Graph">
-            </div>
-        </div>
-
-        <div class="section page-break">
-            <h2>Thinking vs. Feeling</h2>
-            <table class="header-table">
-                <tr>
-                    <td class="name1 tableContent">{info_pdf1['name']} | {info_pdf1['type']}</td>
-                    <td class="name2 tableContent" style="text-align: right;">{info_pdf2['name']} | {info_pdf2['type']}</td>
-                </tr>
-            </table>
-            <div class="graph">
-                <img src="data:image/png;base64,{tf_graph_base64}" alt="TF Graph">
-            </div>
-        </div>
-
-        <div class="section">
-            <h2>Judging vs. Perceiving</h2>
-            <table class="header-table">
-                <tr>
-                    <td class="name1 tableContent">{info_pdf1['name']} | {info_pdf1['type']}</td>
-                    <td class="name2 tableContent" style="text-align: right;">{info_pdf2['name']} | {info_pdf2['type']}</td>
-                </tr>
-            </table>
-            <div class="graph">
-                <img src="data:image/png;base64,{jp_graph_base64}" alt="JP Graph">
-            </div>
-        </div>
-
-        <footer class="footer">
-            All rights reserved © {('<img src="' + logo_data_url + '" alt="TEMBTI Logo">') if logo_data_url else 'TEMBTI'}
-        </footer>
-
-    </body>
-    </html>
-    """
+    html_template = build_dual_report_html(info_pdf1, info_pdf2, graph_urls, logo_url)
 
     try:
         # Create the PDF
         final_path = os.path.join(output_dir, f"{identifier}_dual_report.pdf")
-        HTML(string=html_template, base_url=".").write_pdf(final_path)
+        progress("render")
+        render_pdf(
+            html_template,
+            final_path,
+            template="dual",
+            base_url=".",
+            resources=resources,
+        )
         print(f"✅ PDF report created at: {final_path}")
         return identifier, final_path
     except Exception as e:
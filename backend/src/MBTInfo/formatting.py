@@ -1,69 +1,143 @@
+from functools import cache
+
 import openpyxl as xl
-from openpyxl.formatting.rule import ColorScaleRule, FormulaRule, Rule
+from openpyxl.formatting.rule import ColorScaleRule, Rule
 from openpyxl.styles import PatternFill
 from openpyxl.styles.differential import DifferentialStyle
 from openpyxl.utils import get_column_letter
 
 # local import
-from .consts import FACETS, MBTI_COLORS, MIDZONE_FACETS
+from .consts import (
+    COLUMN_WIDTH_PADDING,
+    COLUMN_WIDTH_SCALE,
+    MBTI_COLORS,
+    MIDZONE_FACETS,
+)
+from .telemetry import timed
+
+
+def text_widths(rows):
+    """
+    Length of the longest value of each column, as text.
+
+    Args:
+        rows: Rows of values, e.g. parsed records or
+            ``sheet.iter_rows(values_only=True)``
+
+    Returns:
+        dict: {column letter: length}; columns with no values have length 0
+    """
+    widths = {}
+    for row in rows:
+        for col, value in enumerate(row, start=1):
+            letter = get_column_letter(col)
+            length = len(str(value)) if value else 0
+            if length >= widths.get(letter, 0):
+                widths[letter] = length
+    return widths
+
+
+def apply_column_widths(sheet, widths, padding=COLUMN_WIDTH_PADDING, scale=1):
+    """Set each column's width from its text_widths length."""
+    for letter, length in widths.items():
+        sheet.column_dimensions[letter].width = (length + padding) * scale
 
 
 def adjust_column_widths(sheet):
-    for col in range(1, sheet.max_column + 1):
-        max_length = 0
-        column_letter = get_column_letter(col)
-        for row in range(1, sheet.max_row + 1):
-            cell = sheet.cell(row=row, column=col)
-            if isinstance(cell, xl.cell.cell.MergedCell):
-                continue
-            try:
-                if cell.value:
-                    max_length = max(max_length, len(str(cell.value)))
-            except Exception:
-                pass
-        adjusted_width = (max_length + 2) * 1.2
-        sheet.column_dimensions[column_letter].width = adjusted_width
+    """Size every column of a sheet to its longest value, in one pass."""
+    apply_column_widths(
+        sheet, text_widths(sheet.iter_rows(values_only=True)), scale=COLUMN_WIDTH_SCALE
+    )
+
+
+@cache
+def solid_fill(color):
+    """Solid PatternFill of a colour, created once per colour."""
+    return PatternFill(start_color=color, end_color=color, fill_type="solid")
 
 
-def format_xl(file_path):
+@cache
+def fill_style(color):
+    """
+    Differential style that fills a cell with a colour.
+
+    Every conditional formatting rule of one colour shares this style, so each
+    colour is written once to the workbook's styles.
+    """
+    return DifferentialStyle(fill=solid_fill(color))
+
+
+def mbti_type_range(sheet):
+    """
+    Columns within A:Z that list MBTI types, as a conditional formatting range.
+
+    Returns:
+        str: e.g. "C1:C51", or "" if the sheet lists no MBTI types
+    """
+    ranges = []
+    for index, values in enumerate(
+        sheet.iter_cols(max_col=min(sheet.max_column, 26), values_only=True),
+        start=1,
+    ):
+        if any(isinstance(value, str) and value in MBTI_COLORS for value in values):
+            letter = get_column_letter(index)
+            ranges.append(f"{letter}1:{letter}{sheet.max_row}")
+    return " ".join(ranges)
+
+
+def mbti_type_rules():
+    """
+    New conditional formatting rules colouring each MBTI type.
+
+    Adding a rule to a sheet sets its priority on that sheet, so every sheet
+    needs its own rules; their styles are shared (see fill_style).
+    """
+    return [
+        Rule(
+            type="cellIs",
+            operator="equal",
+            formula=[f'"{mbti_type}"'],
+            stopIfTrue=False,
+            dxf=fill_style(color),
+        )
+        for mbti_type, color in MBTI_COLORS.items()
+    ]
+
+
+@timed("format")
+def format_xl(file_path, adjust_widths=True):
+    """
+    Format a group workbook in place.
+
+    Args:
+        file_path: Workbook to format
+        adjust_widths: Size the MBTI Results columns to their values; pass
+            False when the sheet was written with its widths already set
+    """
     workbook = xl.load_workbook(file_path)
     sheet = workbook.active
-    if sheet.title == "MBTI Results":
+    if adjust_widths and sheet.title == "MBTI Results":
         adjust_column_widths(sheet)
     format_headers(sheet)
 
-    # colors:
-    black_fill = PatternFill(
-        start_color="FF000000", end_color="FF000000", fill_type="solid"
-    )
-    gray_fill = PatternFill(start_color="BCBCBC", end_color="BCBCBC", fill_type="solid")
     light_green = "ffb7e5b7"
     light_yellow = "ffe5e589"
     light_red = "ffe5b7b7"
 
-    # handling MBTI type colors
+    # handling MBTI type colors: one rule per type, applied only to the
+    # columns that list MBTI types
     for sheet in workbook.worksheets:
-        print(f"Applying MBTI rules to sheet: {sheet.title}")
-        for mbti_type, color in MBTI_COLORS.items():
-            mbti_rule = Rule(
-                type="cellIs",
-                operator="equal",
-                formula=[f'"{mbti_type}"'],
-                stopIfTrue=False,
-                dxf=DifferentialStyle(
-                    fill=PatternFill(
-                        start_color=color, end_color=color, fill_type="solid"
-                    )
-                ),
+        type_range = mbti_type_range(sheet)
+        if not type_range:
+            continue
+        try:
+            for mbti_rule in mbti_type_rules():
+                sheet.conditional_formatting.add(type_range, mbti_rule)
+        except Exception as e:
+            print(
+                f"Warning: Could not apply MBTI formatting to sheet {sheet.title}: {str(e)}"
             )
-            # Apply the rule to the entire sheet using a valid range
-            try:
-                sheet.conditional_formatting.add("A1:Z1000", mbti_rule)
-            except Exception as e:
-                print(
-                    f"Warning: Could not apply MBTI formatting to sheet {sheet.title}: {str(e)}"
-                )
-        print(f"MBTI rules applied to sheet: {sheet.title}")
+        print(f"MBTI rules applied to {type_range} of sheet: {sheet.title}")
 
     # The rest of the formatting applies only to the active sheet
     sheet = workbook.active
@@ -74,7 +148,12 @@ def format_xl(file_path):
         max_row = sheet.max_row
         scores_range = f"D2:K{max_row}"
         formula = "OR(D2<1,D2>30)"
-        zero_rule = FormulaRule(formula=[formula], stopIfTrue=True, fill=black_fill)
+        zero_rule = Rule(
+            type="expression",
+            formula=[formula],
+            stopIfTrue=True,
+            dxf=fill_style("FF000000"),
+        )
         sheet.conditional_formatting.add(scores_range, zero_rule)
 
         color_scale_rule = ColorScaleRule(
@@ -92,42 +171,21 @@ def format_xl(file_path):
     except Exception as e:
         print(f"Warning: Could not apply score formatting: {str(e)}")
 
-    # handling in-preference formatting
-    inpref_fill = PatternFill(
-        start_color="FFC0CEE6", end_color="FFC0CEE6", fill_type="solid"
-    )
-    midzone_fill = PatternFill(
-        start_color="FFD6E1C5", end_color="FFD6E1C5", fill_type="solid"
-    )
-    outofpref_fill = PatternFill(
-        start_color="FFCC66", end_color="FFCC66", fill_type="solid"
-    )
-    dash_fill = PatternFill(start_color="D3D3D3", end_color="D3D3D3", fill_type="solid")
-
-    # Apply formatting to each column individually to avoid MultiCellRange issues
-    for col_idx in range(12, 51):  # Columns L to AY
-        col_letter = get_column_letter(col_idx)
-        facets_range = f"{col_letter}2:{col_letter}{max_row}"
-        try:
-            inpref_rule = FormulaRule(
-                formula=[f'{col_letter}2="IN-PREF"'], fill=inpref_fill
-            )
-            midzone_rule = FormulaRule(
-                formula=[f'{col_letter}2="MIDZONE"'], fill=midzone_fill
-            )
-            outofpref_rule = FormulaRule(
-                formula=[f'{col_letter}2="OUT-OF-PREF"'], fill=outofpref_fill
-            )
-            dash_rule = FormulaRule(formula=[f'{col_letter}2="-"'], fill=dash_fill)
-
-            sheet.conditional_formatting.add(facets_range, inpref_rule)
-            sheet.conditional_formatting.add(facets_range, midzone_rule)
-            sheet.conditional_formatting.add(facets_range, outofpref_rule)
-            sheet.conditional_formatting.add(facets_range, dash_rule)
-        except Exception as e:
-            print(
-                f"Warning: Could not apply formatting to column {col_letter}: {str(e)}"
+    # One rule per preference for the whole facet block (columns L to AX); the
+    # formula is relative to L2, so Excel applies it to each cell of the range
+    facets_range = f"L2:AX{max_row}"
+    try:
+        for value, color in FACET_PREFERENCE_COLORS.items():
+            sheet.conditional_formatting.add(
+                facets_range,
+                Rule(
+                    type="expression",
+                    formula=[f'L2="{value}"'],
+                    dxf=fill_style(color),
+                ),
             )
+    except Exception as e:
+        print(f"Warning: Could not apply facet preference formatting: {str(e)}")
 
     try:
         facet_format(sheet, workbook)
@@ -143,7 +201,7 @@ def format_xl(file_path):
         )  # Reset dimensions before applying the frame
         column_list = ["A", "B", "J", "R", "Z", "AH"]
         row_list = [2, 32, 39, 46, 53, 60, 67]
-        fill_color = gray_fill
+        fill_color = solid_fill("BCBCBC")
         create_dashboard_frame(dashboard_sheet, column_list, row_list, fill_color)
         print(f"Applying dashboard formatting to sheet: {dashboard_sheet.title}")
     else:
@@ -153,12 +211,44 @@ def format_xl(file_path):
     print(f"Formatting applied to {file_path} successfully.")
 
 
+# Facet preference colours: conditional fills of the main sheet's facet
+# preference cells, and static fills of the facet names listed for each person
+# ("-", no recorded preference, is only coloured on the main sheet)
+FACET_PREFERENCE_COLORS = {
+    "IN-PREF": "FFC0CEE6",
+    "MIDZONE": "FFD6E1C5",
+    "OUT-OF-PREF": "FFCC66",
+    "-": "D3D3D3",
+}
+# Where each person's facet names are listed:
+# (sheet, first data row, first column, last column); None = every worksheet
+FACET_NAME_RANGES = [
+    (None, 2, 52, 78),  # AZ:BZ
+    ("Facet Table", 2, 4, 20),  # D:T
+    ("Communicating", 4, 4, 20),
+    ("Managing Change", 4, 4, 20),
+    ("Managing Conflict", 4, 4, 20),
+]
+
+
+def _person_key(sheet, row):
+    return tuple(sheet.cell(row=row, column=col).value for col in (1, 2, 3))
+
+
 def facet_format(main_sheet, workbook):
+    """
+    Colour each person's listed facets by their preference for that facet.
+
+    The preferences come from the facet columns (L to AY) of the main sheet.
+    Rows are matched across sheets by name, date and type, and the fills are
+    set on the cells directly, so the workbook does not grow a conditional
+    formatting rule per person, facet and sheet.
+    """
     max_row = main_sheet.max_row
-    fill_colors = {
-        "IN-PREF": "FFC0CEE6",
-        "MIDZONE": "FFD6E1C5",
-        "OUT-OF-PREF": "FFCC66",
+    fills = {
+        pref: solid_fill(color)
+        for pref, color in FACET_PREFERENCE_COLORS.items()
+        if pref != "-"
     }
 
     # Create a dictionary to map individual facets to their midzone pairs
@@ -168,68 +258,54 @@ def facet_format(main_sheet, workbook):
         midzone_pairs[facet1.lower()] = pair
         midzone_pairs[facet2.lower()] = pair
 
-    rules = {
-        pref: {
-            facet.lower(): Rule(
-                type="cellIs",
-                operator="equal",
-                formula=[f'"{facet.lower()}"'],
-                stopIfTrue=False,
-                dxf=DifferentialStyle(
-                    fill=PatternFill(
-                        start_color=color, end_color=color, fill_type="solid"
-                    )
-                ),
-            )
-            for facet in FACETS
-        }
-        for pref, color in fill_colors.items()
+    facet_columns = {
+        col: str(main_sheet.cell(row=1, column=col).value).lower()
+        for col in range(12, 52)
+        if main_sheet.cell(row=1, column=col).value
     }
 
-    # Add rules for midzone pairs
-    for pair in MIDZONE_FACETS:
-        rules["MIDZONE"][pair.lower()] = Rule(
-            type="cellIs",
-            operator="equal",
-            formula=[f'"{pair.lower()}"'],
-            stopIfTrue=False,
-            dxf=DifferentialStyle(
-                fill=PatternFill(
-                    start_color=fill_colors["MIDZONE"],
-                    end_color=fill_colors["MIDZONE"],
-                    fill_type="solid",
-                )
-            ),
-        )
-
+    # person -> {facet name (or midzone pair), lowercased: preference}
+    preferences = {}
     for row in range(2, max_row + 1):
         facet_prefs = {}
-        for col in range(12, 52):
+        for col, facet_name in facet_columns.items():
             pref = main_sheet.cell(row=row, column=col).value
-            if pref in fill_colors:
-                facet_name = main_sheet.cell(row=1, column=col).value.lower()
+            if pref in fills:
                 if pref == "MIDZONE" and facet_name in midzone_pairs:
                     facet_prefs[midzone_pairs[facet_name].lower()] = pref
                 else:
                     facet_prefs[facet_name] = pref
-
-        fill_range = f"AZ{row}:BZ{row}"
-        for facet, pref in facet_prefs.items():
-            for sheet in workbook.worksheets:
-                sheet.conditional_formatting.add(fill_range, rules[pref][facet])
-        # Apply facet rules to the Facet Table sheet
-        facet_table_sheet = workbook["Facet Table"]
-        facet_table_range = f"D{row}:T{row}"
-        for facet, pref in facet_prefs.items():
-            facet_table_sheet.conditional_formatting.add(
-                facet_table_range, rules[pref][facet]
-            )
-        section_list = ["Communicating", "Managing Change", "Managing Conflict"]
-        for item in section_list:
-            table_sheet = workbook[f"{item}"]
-            table_range = f"D{row + 2}:T{row + 2}"
-            for facet, pref in facet_prefs.items():
-                table_sheet.conditional_formatting.add(table_range, rules[pref][facet])
+        preferences[_person_key(main_sheet, row)] = facet_prefs
+
+    for sheet_name, first_row, first_col, last_col in FACET_NAME_RANGES:
+        if sheet_name is None:
+            sheets = workbook.worksheets
+        elif sheet_name in workbook.sheetnames:
+            sheets = [workbook[sheet_name]]
+        else:
+            continue
+        for sheet in sheets:
+            # max_column scans every cell, so look it up once per sheet
+            max_col = min(last_col, sheet.max_column)
+            if max_col < first_col:
+                continue
+            for row in range(first_row, sheet.max_row + 1):
+                facet_prefs = preferences.get(_person_key(sheet, row))
+                if not facet_prefs:
+                    continue
+                for (cell,) in sheet.iter_cols(
+                    min_col=first_col,
+                    max_col=max_col,
+                    min_row=row,
+                    max_row=row,
+                ):
+                    pref = (
+                        facet_prefs.get(cell.value.lower())
+                        if isinstance(cell.value, str)
+                        else None
+                    )
+                    if pref:
+                        cell.fill = fills[pref]
 
 
 def format_headers(sheet):
@@ -3,23 +3,103 @@ import os
 
 import openpyxl as xl
 
+from .aggregates import (
+    compute_aggregates,
+    load_aggregates,
+    merge_aggregates,
+    save_aggregates,
+)
 from .chart_creator import create_distribution_charts
+from .consts import SHEET_NAME_MBTI_RESULTS
 from .create_facet_table import create_facet_table
-from .create_section_sheets import create_section_sheets
+from .create_section_sheets import write_section_sheets
 from .data_extractor import extract_and_save_text
-from .data_to_excel import process_pdf_to_xl
+from .data_to_excel import parse_pdf_record, results_headers, write_results_sheet
+from .dataset import (
+    load_records,
+    records_frame,
+    records_rows,
+    rows_records,
+    save_records,
+)
 from .formatting import format_xl
+from .telemetry import no_progress, span
 from .utils import reorder_sheets
 
 
-def process_group_report_fixed(input_directory, output_directory, output_filename):
-    """Fixed version of process_group_report with better error handling and file path management"""
+def process_group_report_fixed(
+    input_directory, output_directory, output_filename, progress=no_progress
+):
+    """
+    Fixed version of process_group_report with better error handling and file path management
+
+    Args:
+        input_directory: Folder with the individual report PDFs
+        output_directory: Folder for the workbook and extracted text files
+        output_filename: Workbook file name
+        progress: Called as ``progress(stage, done, total)`` before each PDF and
+            as ``progress(stage)`` before each workbook stage
+    """
 
     print("\n🚀 Starting group report processing...")
     print(f"📁 Input: {input_directory}")
     print(f"📁 Output: {output_directory}")
     print(f"📄 File: {output_filename}")
 
+    excel_file, textfiles_directory = _prepare_output(output_directory, output_filename)
+    rows = parse_group_pdfs(input_directory, textfiles_directory, progress)
+    return build_group_workbook(excel_file, rows, progress)
+
+
+def append_group_report(
+    source_excel,
+    input_directory,
+    output_directory,
+    output_filename,
+    progress=no_progress,
+):
+    """
+    Build a group workbook from an existing group workbook plus more people.
+
+    Only the PDFs in input_directory are parsed. The people already in the
+    group come from the source workbook's records file and their counts from
+    its aggregates file, which the new people's counts are added to. The
+    source workbook and its files are left unchanged.
+
+    Args:
+        source_excel: Group workbook to add people to
+        input_directory: Folder with the new people's report PDFs
+        output_directory: Folder for the workbook and extracted text files
+        output_filename: File name of the new workbook
+        progress: As for process_group_report_fixed
+
+    Returns:
+        Workbook of the combined group, or False if no new PDF could be parsed
+    """
+    print("\n🚀 Adding people to group report...")
+    print(f"📄 Source: {source_excel}")
+    print(f"📁 Input: {input_directory}")
+    print(f"📄 File: {output_filename}")
+
+    headers = results_headers()
+    rows = records_rows(load_records(source_excel), headers)
+    aggregates = load_aggregates(source_excel)
+    print(f"📊 Group has {len(rows)} people")
+
+    excel_file, textfiles_directory = _prepare_output(output_directory, output_filename)
+    new_rows = parse_group_pdfs(input_directory, textfiles_directory, progress)
+    if not new_rows:
+        print("❌ No new people could be added")
+        return False
+
+    aggregates = merge_aggregates(
+        aggregates, compute_aggregates(records_frame(rows_records(headers, new_rows)))
+    )
+    return build_group_workbook(excel_file, rows + new_rows, progress, aggregates)
+
+
+def _prepare_output(output_directory, output_filename):
+    """Create the output folders and remove an old workbook of the same name."""
     # Create directories
     textfiles_directory = os.path.join(output_directory, "textfiles")
     os.makedirs(output_directory, exist_ok=True)
@@ -29,9 +109,19 @@ def process_group_report_fixed(input_directory, output_directory, output_filenam
     if os.path.exists(excel_file):
         os.remove(excel_file)
         print(f"🗑️ Deleted existing {excel_file}")
+    return excel_file, textfiles_directory
+
 
-    # Track processing
+def parse_group_pdfs(input_directory, textfiles_directory, progress=no_progress):
+    """
+    Extract and parse every report PDF of a folder.
+
+    Returns:
+        list: parse_pdf_record rows of the PDFs that could be parsed
+    """
+    # Track processing; rows are kept in memory and written in one pass
     processed_files = 0
+    rows = []
     failed_files = []
 
     # Get list of PDF files
@@ -40,10 +130,11 @@ def process_group_report_fixed(input_directory, output_directory, output_filenam
 
     if not pdf_files:
         print("❌ No PDF files found!")
-        return False
+        return rows
 
     # Process each PDF file
-    for file in pdf_files:
+    for index, file in enumerate(pdf_files):
+        progress("extract", index, len(pdf_files))
         print(f"\n📄 Processing: {file}")
         pdf_path = os.path.join(input_directory, file)
 
@@ -83,13 +174,8 @@ def process_group_report_fixed(input_directory, output_directory, output_filenam
                 print(f"📝 Text file size: {txt_size} bytes")
 
                 if txt_size > 50:  # Require minimum content (more than just headers)
-                    # Process to Excel - use the actual path
-                    process_pdf_to_xl(
-                        actual_txt_path,
-                        output_directory,
-                        "MBTI Results",
-                        output_filename,
-                    )
+                    # Parse the results row - use the actual path
+                    rows.append(parse_pdf_record(actual_txt_path))
                     processed_files += 1
                     print(f"✅ Successfully processed {file}")
                 else:
@@ -121,12 +207,7 @@ def process_group_report_fixed(input_directory, output_directory, output_filenam
                     match_path = os.path.join(textfiles_directory, possible_matches[0])
                     if os.path.exists(match_path) and os.path.getsize(match_path) > 50:
                         print(f"✅ Using matched file: {possible_matches[0]}")
-                        process_pdf_to_xl(
-                            match_path,
-                            output_directory,
-                            "MBTI Results",
-                            output_filename,
-                        )
+                        rows.append(parse_pdf_record(match_path))
                         processed_files += 1
                         print(
                             f"✅ Successfully processed {file} (using matched text file)"
@@ -154,30 +235,66 @@ def process_group_report_fixed(input_directory, output_directory, output_filenam
         for failure in failed_files:
             print(f"  - {failure}")
 
+    return rows
+
+
+def build_group_workbook(excel_file, rows, progress=no_progress, aggregates=None):
+    """
+    Write, chart and format the group workbook of parsed rows.
+
+    Args:
+        excel_file: Workbook path
+        rows: parse_pdf_record rows, one per person
+        progress: As for process_group_report_fixed
+        aggregates: Counts of the rows when already known; counted otherwise
+
+    Returns:
+        The workbook, or False if there are no rows or it could not be built
+    """
     # Only proceed with workbook operations if we processed files
-    if processed_files > 0 and os.path.exists(excel_file):
+    if rows:
         try:
+            print("\n📊 Writing results and section sheets...")
+            progress("xlsx_write")
+            with span("xlsx_write"):
+                workbook = xl.Workbook(write_only=True)
+                write_results_sheet(workbook, rows, SHEET_NAME_MBTI_RESULTS)
+                write_section_sheets(workbook, rows)
+                workbook.save(excel_file)
+
+                # Charts and formatting style single cells, so they work on
+                # a normal workbook
+                workbook = xl.load_workbook(excel_file)
+
             print("\n📊 Creating charts and additional sheets...")
+            progress("chart")
 
-            workbook = xl.load_workbook(excel_file)
+            records = rows_records(results_headers(), rows)
+            if aggregates is None:
+                print("🔄 Counting group aggregates...")
+                aggregates = compute_aggregates(records_frame(records))
 
             print("🔄 Creating distribution charts...")
-            create_distribution_charts(workbook)
-
-            print("🔄 Creating section sheets...")
-            create_section_sheets(textfiles_directory, workbook)
+            create_distribution_charts(workbook, aggregates)
 
-            print("🔄 Creating facet table...")
-            create_facet_table(workbook)
+            progress("xlsx_build")
+            with span("xlsx_build"):
+                print("🔄 Creating facet table...")
+                create_facet_table(workbook)
 
-            print("💾 Saving workbook...")
-            workbook.save(excel_file)
+                print("💾 Saving workbook...")
+                workbook.save(excel_file)
+                save_records(excel_file, records)
+                save_aggregates(excel_file, aggregates)
 
             print("🎨 Formatting Excel file...")
-            format_xl(excel_file)
+            progress("format")
+            format_xl(excel_file, adjust_widths=False)
 
             print("📑 Reordering sheets...")
-            reorder_sheets(excel_file)
+            progress("xlsx_reorder")
+            with span("xlsx_reorder"):
+                reorder_sheets(excel_file)
 
             print(f"✅ Group report completed: {excel_file}")
             return workbook
@@ -0,0 +1,410 @@
+"""
+In-process job queue for the report pipelines.
+
+Every job has a kind ("group", "personal", ...). A kind runs at most its
+configured number of jobs at once and keeps a bounded number of jobs waiting;
+submitting beyond that raises QueueFull so the API can answer 429. Waiting
+jobs are started round-robin across clients and FIFO within a client, so one
+client uploading many archives does not hold back everyone else.
+
+Kinds can also be assigned to lanes that share a total number of workers.
+Each lane has its own limit and lanes are served in priority order, so
+keeping the batch lane below the total reserves workers for the interactive
+lane while long batch jobs run.
+
+SqliteJobQueue has the same interface for the API but only records jobs in
+the task database; separate ``python -m MBTInfo.worker`` processes claim and
+run them. Workers heartbeat their running jobs, so the jobs of a worker that
+died can be found with reclaim_stale.
+"""
+
+import asyncio
+import json
+import math
+import time
+from collections import OrderedDict, deque
+
+from .task_store import connect, create_tables, transaction
+
+# Retry-After for a full queue when no job of that kind has finished yet
+DEFAULT_RETRY_AFTER = 30
+
+
+class QueueFull(Exception):
+    """Raised when a job kind already has the maximum number of waiting jobs."""
+
+    def __init__(self, kind, retry_after):
+        super().__init__(f"Too many queued {kind} jobs")
+        self.kind = kind
+        self.retry_after = retry_after
+
+
+class Job:
+    def __init__(self, task_id, kind, client, func, args):
+        self.task_id = task_id
+        self.kind = kind
+        self.client = client
+        self.func = func
+        self.args = args
+
+
+class JobQueue:
+    """
+    Bounded per-kind job queue with round-robin fairness across clients.
+
+    Args:
+        capacity: ``{kind: max jobs running at once}``
+        max_queued: Max waiting jobs per kind
+        lanes: Optional ``{kind: lane}``
+        lane_capacity: ``{lane: max jobs running at once}``, highest priority
+            lane first
+        workers: Optional max jobs running at once across all kinds
+        on_update: Optional callback given the task IDs whose queue position
+            may have changed
+    """
+
+    def __init__(
+        self,
+        capacity,
+        max_queued,
+        lanes=None,
+        lane_capacity=None,
+        workers=None,
+        on_update=None,
+    ):
+        self.capacity = capacity
+        self.max_queued = max_queued
+        self.lanes = lanes or {}
+        self.lane_capacity = lane_capacity or {}
+        self.workers = workers
+        self.on_update = on_update
+        lane_order = list(self.lane_capacity)
+        # Kinds in the order they get free workers: by lane priority, then as given
+        self.priority = sorted(
+            capacity,
+            key=lambda kind: (
+                lane_order.index(self.lanes[kind])
+                if kind in self.lanes
+                else len(lane_order)
+            ),
+        )
+        self.running = {kind: 0 for kind in capacity}
+        # kind -> client -> waiting jobs; client order is the round-robin order
+        self.waiting = {kind: OrderedDict() for kind in capacity}
+        self._durations = {kind: (0, 0.0) for kind in capacity}
+        # task ID -> asyncio task of its running job
+        self._running = {}
+
+    def queued(self, kind):
+        return sum(len(jobs) for jobs in self.waiting[kind].values())
+
+    def retry_after(self, kind):
+        """Seconds until a waiting slot is likely to free up."""
+        count, total = self._durations[kind]
+        if not count:
+            return DEFAULT_RETRY_AFTER
+        return max(1, math.ceil(total / count / self.capacity[kind]))
+
+    def lane_running(self, lane):
+        return sum(
+            running
+            for kind, running in self.running.items()
+            if self.lanes.get(kind) == lane
+        )
+
+    def can_start(self, kind):
+        """Whether a job of this kind would start right away."""
+        if self.running[kind] >= self.capacity[kind]:
+            return False
+        if self.workers is not None and sum(self.running.values()) >= self.workers:
+            return False
+        lane = self.lanes.get(kind)
+        return lane is None or self.lane_running(lane) < self.lane_capacity[lane]
+
+    def check(self, kind):
+        """Raise QueueFull if a job of this kind would be rejected."""
+        if not self.can_start(kind) and self.queued(kind) >= self.max_queued:
+            raise QueueFull(kind, self.retry_after(kind))
+
+    def submit(self, task_id, kind, client, func, *args):
+        """
+        Queue an async job and start it as soon as capacity allows.
+
+        Must be called from the event loop.
+
+        Returns:
+            int: Queue position (1 = next to start), or 0 if started already
+        """
+        self.check(kind)
+        job = Job(task_id, kind, client, func, args)
+        self.waiting[kind].setdefault(client, deque()).append(job)
+        self._dispatch()
+        return self.position(task_id) or 0
+
+    def position(self, task_id):
+        """1-based position of a waiting job, or None if it is not waiting."""
+        for clients in self.waiting.values():
+            queues = list(clients.values())
+            position = 0
+            for round_index in range(max((len(jobs) for jobs in queues), default=0)):
+                for jobs in queues:
+                    if round_index < len(jobs):
+                        position += 1
+                        if jobs[round_index].task_id == task_id:
+                            return position
+        return None
+
+    def running_task_ids(self):
+        return list(self._running)
+
+    def cancel(self, task_id):
+        """
+        Drop a waiting job or cancel a running one.
+
+        A running job is cancelled at its next await; pipeline code already
+        running in a thread stops at its next progress report (see
+        tasks.stop_task).
+
+        Returns:
+            bool: Whether a job for the task was found
+        """
+        for kind, clients in self.waiting.items():
+            for client, jobs in clients.items():
+                job = next((job for job in jobs if job.task_id == task_id), None)
+                if job is None:
+                    continue
+                jobs.remove(job)
+                if not jobs:
+                    del clients[client]
+                if self.on_update:
+                    self.on_update(self.waiting_task_ids(kind))
+                return True
+
+        running = self._running.get(task_id)
+        if running is None:
+            return False
+        running.cancel()
+        return True
+
+    def waiting_task_ids(self, kind):
+        return [job.task_id for jobs in self.waiting[kind].values() for job in jobs]
+
+    def _next_job(self, kind):
+        clients = self.waiting[kind]
+        client, jobs = next(iter(clients.items()))
+        job = jobs.popleft()
+        if jobs:
+            clients.move_to_end(client)
+        else:
+            del clients[client]
+        return job
+
+    def _dispatch(self):
+        started = []
+        for kind in self.priority:
+            while self.waiting[kind] and self.can_start(kind):
+                job = self._next_job(kind)
+                self.running[kind] += 1
+                self._running[job.task_id] = asyncio.get_running_loop().create_task(
+                    self._run(job)
+                )
+                started.append(kind)
+        if started and self.on_update:
+            self.on_update(
+                [
+                    task_id
+                    for kind in set(started)
+                    for task_id in self.waiting_task_ids(kind)
+                ]
+            )
+
+    async def _run(self, job):
+        start = time.perf_counter()
+        try:
+            await job.func(*job.args)
+        except Exception as e:
+            print(f"❌ {job.kind} job {job.task_id} failed: {e}")
+        finally:
+            count, total = self._durations[job.kind]
+            self._durations[job.kind] = (
+                count + 1,
+                total + time.perf_counter() - start,
+            )
+            self.running[job.kind] -= 1
+            self._running.pop(job.task_id, None)
+            self._dispatch()
+
+
+class SqliteJobQueue:
+    """
+    Job queue in the shared task database, consumed by report workers.
+
+    Jobs are stored with the name of their async function; workers look it up
+    in background.JOB_FUNCTIONS. Arguments must be JSON serialisable.
+
+    Args:
+        path: Task database file
+        kinds: Job kinds, highest priority first
+        max_queued: Max waiting jobs per kind
+    """
+
+    def __init__(self, path, kinds, max_queued):
+        self.path = path
+        self.kinds = list(kinds)
+        self.max_queued = max_queued
+        create_tables(
+            path,
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, task_id TEXT NOT NULL, "
+            "kind TEXT NOT NULL, client TEXT NOT NULL, func TEXT NOT NULL, "
+            "args TEXT NOT NULL, state TEXT NOT NULL DEFAULT 'queued', "
+            "worker TEXT, created_at REAL NOT NULL, started_at REAL, "
+            "heartbeat_at REAL)",
+            "CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, kind)",
+        )
+        with connect(path) as db:
+            columns = [row[1] for row in db.execute("PRAGMA table_info(jobs)")]
+            if "heartbeat_at" not in columns:
+                # Databases created before workers sent heartbeats
+                db.execute("ALTER TABLE jobs ADD COLUMN heartbeat_at REAL")
+
+    @property
+    def running(self):
+        with connect(self.path) as db:
+            counts = dict(
+                db.execute(
+                    "SELECT kind, COUNT(*) FROM jobs WHERE state = 'running' "
+                    "GROUP BY kind"
+                ).fetchall()
+            )
+        return {kind: counts.get(kind, 0) for kind in self.kinds}
+
+    def queued(self, kind):
+        with connect(self.path) as db:
+            return db.execute(
+                "SELECT COUNT(*) FROM jobs WHERE state = 'queued' AND kind = ?",
+                (kind,),
+            ).fetchone()[0]
+
+    def check(self, kind):
+        if self.queued(kind) >= self.max_queued:
+            raise QueueFull(kind, DEFAULT_RETRY_AFTER)
+
+    def submit(self, task_id, kind, client, func, *args):
+        self.check(kind)
+        with connect(self.path) as db:
+            db.execute(
+                "INSERT INTO jobs (task_id, kind, client, func, args, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (task_id, kind, client, func.__name__, json.dumps(args), time.time()),
+            )
+        return self.position(task_id) or 0
+
+    @staticmethod
+    def _waiting(db, kind):
+        # Round-robin across clients, FIFO within a client
+        return db.execute(
+            "SELECT id, task_id, func, args FROM ("
+            "SELECT *, ROW_NUMBER() OVER (PARTITION BY client ORDER BY id) AS turn "
+            "FROM jobs WHERE state = 'queued' AND kind = ?"
+            ") ORDER BY turn, id",
+            (kind,),
+        )
+
+    def position(self, task_id):
+        with connect(self.path) as db:
+            row = db.execute(
+                "SELECT kind FROM jobs WHERE task_id = ? AND state = 'queued'",
+                (task_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            for position, job in enumerate(self._waiting(db, row[0]), start=1):
+                if job[1] == task_id:
+                    return position
+        return None
+
+    def claim(self, kinds, worker):
+        """
+        Take the next waiting job of the given kinds (in priority order).
+
+        Returns:
+            (job id, task id, function name, args list), or None if none is waiting
+        """
+        with connect(self.path) as db:
+            with transaction(db):
+                for kind in kinds:
+                    job = self._waiting(db, kind).fetchone()
+                    if job is not None:
+                        now = time.time()
+                        db.execute(
+                            "UPDATE jobs SET state = 'running', worker = ?, "
+                            "started_at = ?, heartbeat_at = ? WHERE id = ?",
+                            (worker, now, now, job[0]),
+                        )
+                        return job[0], job[1], job[2], json.loads(job[3])
+                return None
+
+    def running_task_ids(self):
+        with connect(self.path) as db:
+            return [
+                row[0]
+                for row in db.execute(
+                    "SELECT task_id FROM jobs WHERE state = 'running'"
+                )
+            ]
+
+    def cancel(self, task_id):
+        """
+        Drop a waiting job of the task.
+
+        Running jobs are killed by their worker once it sees the task stopped.
+
+        Returns:
+            bool: Whether a waiting job was dropped
+        """
+        with connect(self.path) as db:
+            cancelled = db.execute(
+                "UPDATE jobs SET state = 'cancelled' "
+                "WHERE task_id = ? AND state = 'queued'",
+                (task_id,),
+            )
+        return bool(cancelled.rowcount)
+
+    def heartbeat(self, job_id):
+        """Record that the worker running a job is still alive."""
+        with connect(self.path) as db:
+            db.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE id = ?", (time.time(), job_id)
+            )
+
+    def reclaim_stale(self, max_age):
+        """
+        Fail running jobs whose worker has not sent a heartbeat for a while.
+
+        A worker that was killed cannot finish its job, so the job would stay
+        "running" forever. The jobs are not retried: one that crashed its
+        worker would do so again.
+
+        Args:
+            max_age: Seconds without a heartbeat after which a job is stale
+
+        Returns:
+            list: Task IDs of the failed jobs
+        """
+        with connect(self.path) as db:
+            with transaction(db):
+                stale = db.execute(
+                    "SELECT id, task_id FROM jobs WHERE state = 'running' "
+                    "AND coalesce(heartbeat_at, started_at) < ?",
+                    (time.time() - max_age,),
+                ).fetchall()
+                db.executemany(
+                    "UPDATE jobs SET state = 'failed' WHERE id = ?",
+                    [(job_id,) for job_id, _ in stale],
+                )
+        return [task_id for _, task_id in stale]
+
+    def finish(self, job_id):
+        with connect(self.path) as db:
+            db.execute("UPDATE jobs SET state = 'done' WHERE id = ?", (job_id,))
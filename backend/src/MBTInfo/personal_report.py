@@ -1,13 +1,18 @@
 import os
-import webbrowser
+from functools import lru_cache
+from pathlib import Path
 
 from .consts import (
     FACET_CHART_LIST,
+    MBTI_TYPES,
     MEDIA_PATH,
     PERSONAL_REPORT_MEDIA,
     PROJECT_BASE_DIR,
 )
 from .data_extractor import extract_and_save_text
+from .renderer import LOGO_ASSET_URL, asset_url, render_pdf, save_render_artifact
+from .telemetry import no_progress, span
+from .templating import render_template
 from .utils import (
     collect_qualities,
     convert_scores_to_mbti_dict,
@@ -18,8 +23,61 @@ from .utils import (
     get_three_repeating_explanations,
 )
 
+TYPE_IMAGE_FOLDERS = {
+    "general": ("General_Pics", "General"),
+    "dominant": ("Dominant_Pics", "Dominant"),
+    "external": ("External_Pics", "External"),
+    "internal": ("Internal_Pics", "Internal"),
+}
 
-def generate_personal_report(input_pdf_path, output_dir, output_filename):
+
+def _build_functions_page(external_url, internal_url):
+    return render_template(
+        "personal_functions_page", external_url=external_url, internal_url=internal_url
+    )
+
+
+@lru_cache(maxsize=len(MBTI_TYPES))
+def _build_type_fragments(mbti_type):
+    images = {}
+    for key, (folder, suffix) in TYPE_IMAGE_FOLDERS.items():
+        image_path = PERSONAL_REPORT_MEDIA / folder / f"{mbti_type}_{suffix}.png"
+        if os.path.isfile(image_path):
+            images[key] = asset_url(image_path.relative_to(MEDIA_PATH))
+        else:
+            print(
+                f"Warning: {key.capitalize()} image not found for type {mbti_type}: {image_path}"
+            )
+            images[key] = ""
+
+    return {
+        "images": images,
+        "functions_page": _build_functions_page(images["external"], images["internal"]),
+    }
+
+
+def get_type_fragments(mbti_type):
+    """
+    Return the report parts that depend only on the MBTI type.
+
+    The four type images are looked up and the external/internal letters page is
+    rendered once per type (16 entries at most) and reused for every report.
+
+    Args:
+        mbti_type (str): Four-letter MBTI type
+
+    Returns:
+        dict: ``images`` (asset:// URLs keyed by general/dominant/external/internal)
+        and ``functions_page`` (HTML for the external/internal letters page)
+    """
+    if mbti_type in MBTI_TYPES:
+        return _build_type_fragments(mbti_type)
+    return {"images": {}, "functions_page": _build_functions_page("", "")}
+
+
+def generate_personal_report(
+    input_pdf_path, output_dir, output_filename, progress=no_progress
+):
     """
     Generate a personal MBTI report from a PDF file using HTML and convert to PDF.
 
@@ -27,6 +85,7 @@ def generate_personal_report(input_pdf_path, output_dir, output_filename):
         input_pdf_path (str): Path to the input PDF file
         output_dir (str): Directory to save the output PDF file
         output_filename (str): Name of the output PDF file
+        progress (callable): Called with the name of each stage as it starts
 
     Returns:
         str: Path to the generated PDF file
@@ -63,55 +122,57 @@ def generate_personal_report(input_pdf_path, output_dir, output_filename):
             print(f"Warning: Failed to copy text to textfiles directory: {str(e)}")
             # Continue execution even if copy fails
 
-    # Extract MBTI information
-    info = get_all_info(text_file_path)
-    print(f"MBTI Information: {info}")
-    if not info:
-        info = {"name": "Unknown", "date": "Unknown", "type": "Unknown"}
-
-    # Get the dominant function based on the MBTI type
-    mbti_type = info.get("type")
-    if mbti_type:
-        dominant_function = get_dominant(text_file_path)
-        if dominant_function:
-            info["dominant"] = dominant_function
-            print(f"Dominant function: {dominant_function}")
-        else:
-            print(
-                f"Warning: Could not determine dominant function for type {mbti_type}"
-            )
+    progress("parse")
+    with span("parse"):
+        # Extract MBTI information
+        info = get_all_info(text_file_path)
+        print(f"MBTI Information: {info}")
+        if not info:
+            info = {"name": "Unknown", "date": "Unknown", "type": "Unknown"}
+
+        # Get the dominant function based on the MBTI type
+        mbti_type = info.get("type")
+        if mbti_type:
+            dominant_function = get_dominant(text_file_path)
+            if dominant_function:
+                info["dominant"] = dominant_function
+                print(f"Dominant function: {dominant_function}")
+            else:
+                print(
+                    f"Warning: Could not determine dominant function for type {mbti_type}"
+                )
 
-    qualities = find_and_parse_mbti_scores(text_file_path)
-    if not qualities:
-        qualities = {}
+        qualities = find_and_parse_mbti_scores(text_file_path)
+        if not qualities:
+            qualities = {}
 
-    mbti_dict = convert_scores_to_mbti_dict(qualities)
-    if not mbti_dict:
-        # Create a default dictionary with zeros
-        mbti_dict = {"E": 0, "I": 0, "S": 0, "N": 0, "T": 0, "F": 0, "J": 0, "P": 0}
+        mbti_dict = convert_scores_to_mbti_dict(qualities)
+        if not mbti_dict:
+            # Create a default dictionary with zeros
+            mbti_dict = {"E": 0, "I": 0, "S": 0, "N": 0, "T": 0, "F": 0, "J": 0, "P": 0}
 
-    # Handle potential None values from collect_qualities
-    try:
-        result = collect_qualities(text_file_path)
-        if result is None or len(result) != 3:
+        # Handle potential None values from collect_qualities
+        try:
+            result = collect_qualities(text_file_path)
+            if result is None or len(result) != 3:
+                preferred_qualities, midzone_qualities, out_qualities = [], [], []
+            else:
+                preferred_qualities, midzone_qualities, out_qualities = result
+        except Exception as e:
+            print(f"Error collecting qualities: {str(e)}")
             preferred_qualities, midzone_qualities, out_qualities = [], [], []
-        else:
-            preferred_qualities, midzone_qualities, out_qualities = result
-    except Exception as e:
-        print(f"Error collecting qualities: {str(e)}")
-        preferred_qualities, midzone_qualities, out_qualities = [], [], []
 
-    # Get facets that appear exactly 3 times
-    repeating_explanations = get_three_repeating_explanations(text_file_path)
-    three_repeating_facets = list(repeating_explanations.keys())
-    print(f"Three repeating facets: {three_repeating_facets}")
+        # Get facets that appear exactly 3 times
+        repeating_explanations = get_three_repeating_explanations(text_file_path)
+        three_repeating_facets = list(repeating_explanations.keys())
+        print(f"Three repeating facets: {three_repeating_facets}")
 
-    # Get facet descriptors for each repeating facet
-    facet_descriptors = {}
-    for facet in three_repeating_facets:
-        descriptor = get_facet_descriptor(text_file_path, facet)
-        facet_descriptors[facet] = descriptor
-        print(f"Descriptor for {facet}: {descriptor}")
+        # Get facet descriptors for each repeating facet
+        facet_descriptors = {}
+        for facet in three_repeating_facets:
+            descriptor = get_facet_descriptor(text_file_path, facet)
+            facet_descriptors[facet] = descriptor
+            print(f"Descriptor for {facet}: {descriptor}")
 
     # Generate HTML report
     html_content = generate_html_report(
@@ -125,51 +186,17 @@ def generate_personal_report(input_pdf_path, output_dir, output_filename):
         input_pdf_path,
     )
 
-    # Save HTML to a temporary file
-    temp_html_path = os.path.join(
-        output_dir, f"{os.path.splitext(output_filename)[0]}.html"
+    # Keep the HTML beside the PDF only when debugging
+    save_render_artifact(
+        html_content,
+        os.path.join(output_dir, f"{os.path.splitext(output_filename)[0]}.html"),
     )
-    with open(temp_html_path, "w", encoding="utf-8") as f:
-        f.write(html_content)
 
-    # Convert HTML to PDF using pdfkit or weasyprint
+    # Convert HTML to PDF; images are served to WeasyPrint through asset:// URLs
     output_path = os.path.join(output_dir, output_filename.replace(".xlsx", ".pdf"))
-
-    try:
-        # Try using WeasyPrint first (more reliable for complex layouts)
-        import logging
-
-        from weasyprint import HTML
-
-        # Suppress verbose logs from weasyprint and fontTools
-        logging.getLogger("weasyprint").setLevel(logging.WARNING)
-        logging.getLogger("fontTools").setLevel(logging.WARNING)
-        logging.getLogger("fontTools.subset").setLevel(logging.WARNING)
-        logging.getLogger("fontTools.ttLib").setLevel(logging.WARNING)
-        logging.getLogger("fontTools.subset.timer").setLevel(logging.WARNING)
-
-        HTML(string=html_content).write_pdf(output_path)
-        print(f"PDF generated successfully using WeasyPrint: {output_path}")
-    except ImportError:
-        try:
-            # Fall back to pdfkit if WeasyPrint is not available
-            import pdfkit
-
-            options = {
-                "page-size": "Letter",
-                "encoding": "UTF-8",
-                "enable-local-file-access": None,
-                "quiet": None,
-            }
-            pdfkit.from_string(html_content, output_path, options=options)
-            print(f"PDF generated successfully using pdfkit: {output_path}")
-        except ImportError:
-            # If neither library is available, fall back to browser method
-            print("PDF generation libraries not found. Falling back to browser method.")
-            print(
-                f"Opening HTML report in browser. Please save as PDF to: {output_path}"
-            )
-            webbrowser.open(f"file://{os.path.abspath(temp_html_path)}")
+    progress("render")
+    render_pdf(html_content, output_path, template="personal")
+    print(f"PDF generated successfully using WeasyPrint: {output_path}")
 
     return output_path
 
@@ -206,17 +233,8 @@ def generate_html_report(
 
                 # Check if the file exists
                 if os.path.isfile(image_path):
-                    # Convert to data URL for embedding in HTML
-                    try:
-                        with open(image_path, "rb") as img_file:
-                            import base64
-
-                            img_data = base64.b64encode(img_file.read()).decode("utf-8")
-                            img_ext = os.path.splitext(image_path)[1].lstrip(".")
-                            return f"data:image/{img_ext};base64,{img_data}"
-                    except Exception as e:
-                        print(f"Error converting facet image to data URL: {str(e)}")
-                        return ""
+                    # WeasyPrint reads the screenshot straight from disk
+                    return Path(image_path).absolute().as_uri()
                 else:
                     print(f"Warning: Facet image file not found: {image_path}")
 
@@ -226,120 +244,24 @@ def generate_html_report(
     mbti_type = info.get("type", "")
     dominant_function = info.get("dominant", "")
 
-    # Initialize image paths dictionary
-    image_paths = {}
-
-    # Only proceed if we have a valid MBTI type
-    if mbti_type and mbti_type in [
-        "ESTJ",
-        "ENTJ",
-        "ESFJ",
-        "ENFJ",
-        "ISTJ",
-        "ISFJ",
-        "INTJ",
-        "INFJ",
-        "ESTP",
-        "ESFP",
-        "ENTP",
-        "ENFP",
-        "ISTP",
-        "ISFP",
-        "INTP",
-        "INFP",
-    ]:
-        # General image based on MBTI type
-        general_path = PERSONAL_REPORT_MEDIA / f"General_Pics/{mbti_type}_General.png"
-        if os.path.isfile(general_path):
-            image_paths["general"] = general_path
-        else:
-            print(
-                f"Warning: General image not found for type {mbti_type}: {general_path}"
-            )
-
-        # Dominant function image based on MBTI type
-        if dominant_function:
-            filename = f"{mbti_type}_Dominant.png"
-            dominant_path = PERSONAL_REPORT_MEDIA / "Dominant_Pics" / filename
-            if os.path.isfile(dominant_path):
-                image_paths["dominant"] = dominant_path
-            else:
-                print(
-                    f"Warning: Dominant function image not found for type {mbti_type}: {dominant_path}"
-                )
-
-        # External function image based on MBTI type
-        external_path = (
-            PERSONAL_REPORT_MEDIA / f"External_Pics/{mbti_type}_External.png"
-        )
-        if os.path.isfile(external_path):
-            image_paths["external"] = external_path
-        else:
-            print(
-                f"Warning: External function image not found for type {mbti_type}: {external_path}"
-            )
-
-        # Internal function image based on MBTI type
-        internal_path = (
-            PERSONAL_REPORT_MEDIA / f"Internal_Pics/{mbti_type}_Internal.png"
-        )
-        if os.path.isfile(internal_path):
-            image_paths["internal"] = internal_path
-        else:
-            print(
-                f"Warning: Internal function image not found for type {mbti_type}: {internal_path}"
-            )
-
-    # Convert images to base64
-    image_data_urls = {}
-    for key, path in image_paths.items():
-        if os.path.isfile(path):
-            try:
-                with open(path, "rb") as img_file:
-                    import base64
-
-                    img_data = base64.b64encode(img_file.read()).decode("utf-8")
-                    img_ext = os.path.splitext(path)[1].lstrip(".")
-                    image_data_urls[key] = f"data:image/{img_ext};base64,{img_data}"
-            except Exception as e:
-                print(f"Error converting image to data URL: {str(e)}")
-                image_data_urls[key] = ""
-        else:
-            print(f"Warning: Image file not found: {path}")
-            image_data_urls[key] = ""
+    # Type images and the functions page only depend on the MBTI type, so they
+    # come from the per-type cache instead of being looked up again here
+    fragments = get_type_fragments(mbti_type)
+    image_urls = dict(fragments.get("images", {}))
+    if not dominant_function:
+        image_urls.pop("dominant", None)
+    functions_page_html = fragments.get("functions_page", "")
 
-    # Load the logo image
     logo_path = MEDIA_PATH / "full_logo.png"
-    logo_data_url = ""
-    if os.path.isfile(logo_path):
-        try:
-            with open(logo_path, "rb") as img_file:
-                import base64
-
-                img_data = base64.b64encode(img_file.read()).decode("utf-8")
-                logo_data_url = f"data:image/png;base64,{img_data}"
-        except Exception as e:
-            print(f"Error converting logo to data URL: {str(e)}")
-    else:
-        print(f"Warning: Logo file not found: {logo_path}")
+    logo_url = LOGO_ASSET_URL if os.path.isfile(logo_path) else ""
 
     three_repeating_facets = list(three_repeating_explanations.keys())
 
     # Generate facet sections
-    facet_sections_html = ""
     if not three_repeating_facets:
-        facet_sections_html = """
-        <div class="page-break"></div>
-        <div class="content-wrapper page-content">
-            <h2>Personal Focus Areas</h2>
-            <div class="section">
-                <p>No facets were identified as appearing consistently across all three contexts
-                (communication, managing change, and managing conflict).</p>
-                <p>This suggests that you may use different approaches depending on the context.</p>
-            </div>
-        </div>
-        """
+        facet_sections = [render_template("personal_no_facets")]
     else:
+        facet_sections = []
         for facet in three_repeating_facets:
             descriptor = facet_descriptors.get(
                 facet, f"No descriptor available for {facet}."
@@ -356,263 +278,29 @@ def generate_html_report(
                 else ""
             )
 
-            facet_sections_html += f"""
-            <div class="page-break"></div>
-            <div class="content-wrapper page-content" style="margin-bottom: 5px;">
-                <h2>Personal Focus: {display_facet}</h2>
-                <p style="text-align: center;">
-                היבטים המופיעים במספר מימדים לאורך הדו"ח שלך
-                </p>
-
-                {facet_image_tag}
-
-                <div class="section">
-                    <h3>General Description</h3>
-                    <p>{descriptor}</p>
-                </div>
-
-                <div class="section">
-                    <h3>{display_facet} in <u>Communication</u></h3>
-                    <p>{explanations[0]}</p>
-                </div>
-
-                <div class="section">
-                    <h3>{display_facet} in <u>Managing Change</u></h3>
-                    <p>{explanations[1]}</p>
-                </div>
-
-                <div class="section">
-                    <h3>{display_facet} in <u>Managing Conflict</u></h3>
-                    <p>{explanations[2]}</p>
-                </div>
-            </div>
-            """
-
-    # Final HTML Template
-    html = f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>{info['name']} - MBTI Personal Report</title>
-        <style>
-            @media print {{
-                @page {{
-                    size: letter portrait;
-                    margin-bottom: 40px; /* Ensure space for footer */
-                }}
-                body {{
-                    -webkit-print-color-adjust: exact !important;
-                    print-color-adjust: exact !important;
-                }}
-                .page-break {{
-                    page-break-before: always;
-                }}
-                .no-break {{
-                    page-break-inside: avoid;
-                }}
-                .footer {{
-                    position: fixed;
-                    bottom: 0px;
-                    left: 0;
-                    right: 0;
-                }}
-                .logo {{
-                    position: fixed;
-                    top: -50px;  /* Moved closer to the top */
-                    left: 50%;
-                    transform: translateX(-50%);
-                    width: 100px; /* Adjust size as needed */
-                    height: auto;
-                    z-index: 1000;
-                }}
-                .logo img {{
-                    border: none;
-                    padding: 0;
-                    background: none;
-                }}
-            }}
-            body {{
-                font-family: Arial, sans-serif;
-                line-height: 1.6;
-                color: #333;
-                max-width: 8.5in;
-                margin: 0 auto;
-                padding: 0;
-                text-align: center;
-            }}
-            .logo {{
-                position: fixed;
-                top: -50px;
-                left: 50%;
-                transform: translateX(-50%);
-                width: 100px;
-                height: auto;
-                z-index: 1000;
-            }}
-            .logo img {{
-                width: 100%;
-                height: auto;
-                border: none;
-                padding: 0;
-                background: none;
-            }}
-            /* Add padding to the top of each page to make room for the logo */
-            .page-content {{
-                padding-top: 10px; /* Adjust based on logo size */
-            }}
-            h1, h2, h3 {{
-                color: #2c3e50;
-                text-align: center;
-            }}
-            h1 {{ font-size: 20pt; margin-bottom: 5px; }}
-            h2 {{
-                text-decoration: underline;
-                font-size: 16pt;
-                padding-bottom: 5px;
-                margin-top: 5px;
-                margin-bottom: 0px; /* Reduce bottom margin */
-                display: inline-block;
-                padding: 0 5px 5px;
-                }}
-            h3 {{ font-size: 12pt; margin-top: 5px; margin-bottom: 5px; }}
-            p {{ text-align: justify; margin: 5px auto 10px; max-width: 100%; }}
-            .info-box p {{ text-align: center;}}
-            .type-header {{ font-size: 20pt; font-weight: bold; text-align: center; margin: 5px 0; }}
-            .image-container {{text-align: center; margin: 5px auto; max-width: 65%; max-height: 40% }}
-            .image-container img {{
-                max-width: 100%;
-                height: auto;
-                display: block;
-                margin: 0 auto;
-                box-shadow: 2px 2px 5px rgba(0, 0, 0, 0.3); /* Right-bottom drop shadow */
-            }}
-            .dominant-image img {{ max-width: 90%; max-height: 50%; }}
-            .facet-image-container {{ text-align: center; margin: 5px auto; width: 100%; }}
-            .facet-image-container img {{
-                width: 75%;
-                height: auto;
-                display: block;
-                margin: 0 auto;
-                margin-bottom: 10px;
-                box-shadow: 2px 2px 5px rgba(0, 0, 0, 0.3); /* Right-bottom drop shadow */
-            }}
-            table {{ width: 80%; border-collapse: collapse; margin: 5px auto; }}
-
-            table, th, td {{ border: 1px solid #ddd; }}
-            th, td {{ padding: 5px; text-align: center; }}
-            th {{ background-color: #f2f2f2; }}
-            .chart-container {{ margin: 5px auto; height: 300px; width: 80%; }}
-            .section {{
-                margin: 5px auto;
-                max-width: 90%;
-            }}
-            .section p {{
-                text-align: left !important;
-                margin: 5px auto 10px;
-                max-width: 100%;
-            }}
-            .content-wrapper {{
-                text-align: center;
-            }}
-            .first-page {{
-                min-height: 90vh;
-                text-align: center;
-            }}
-            .first-page .image-container {{
-                max-width: 33%;
-                max-height: 33%;
-                padding-bottom: 30px;
-            }}
-            /* Add a frame to all images */
-            img {{
-                border: 1px solid #2c3e50;
-                padding: 3px;
-                background-color: white;
-            }}
-            .general-image {{
-                padding:0;
-                margin:0;
-            }}
-            .IntExtimg img {{
-                max-width: 80%;
-                max-height: 50%;
-                display: block;
-                margin: 10px auto 20px auto;
-                box-shadow: 2px 2px 5px rgba(0, 0, 0, 0.3); /* Right-bottom drop shadow */
-            }}
-            .functionality-description {{
-                text-align: center;
-                margin: 5px auto 10px;
-                max-width: 80%;
-            }}
-            .footer {{
-                position: fixed;
-                bottom: 20px;
-                left: 0;
-                right: 0;
-                text-align: center;
-                font-size: 9pt;
-                color: #666;
-                display: flex;
-                justify-content: center;
-                align-items: center;
-                gap: 10px;
-            }}
-            .footer img {{
-                height: 20px;
-                width: auto;
-                vertical-align: middle;
-                border: none;
-                padding: 0;
-                background: none;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="logo">
-            <img src="{logo_data_url}" alt="Company Logo">
-        </div>
-
-        <div class="first-page no-break page-content">
-            <h1>{info['name']} - MBTI Personal Report</h1>
-            <div class="info-box">
-                <p>Your MBTI Type:<strong> {info['type']}</strong></p>
-            </div>
-            <div class="image-container">
-                <img class="general-image" src="{image_data_urls.get('general', '')}" alt="MBTI Type General Image">
-            </div>
-            <h2>הפונקציה המנטלית</h2>
-            <div class="type-header">{info.get('dominant', 'Not specified')}</div>
-            <div class="dominant-image">
-                <img src="{image_data_urls.get('dominant', '')}" alt="MBTI Dominant Function Image">
-            </div>
-        </div>
-
-        <div class="page-break"></div>
-        <div class="content-wrapper page-content">
-            <h2>אותיות חיצוניות</h2>
-            <p class="functionality-description">מדברות על נראות חיצונית, וייב, גישה לחיים והתנהלות ביום-יום</p>
-            <div class="IntExtimg" style="margin-bottom: 5px">
-                <img src="{image_data_urls.get('external', '')}" alt="MBTI External Function Image" style="width: 185px; height: 300px; object-fit: contain;">
-            </div>
-
-            <h2>אותיות פנימיות</h2>
-            <p class="functionality-description">מדברות על תחומי עניין, סוג הקשר עם אחרים, תשוקה פנימית, מה "עושלי את זה", וכן על גבי איזה "פנימיות" רוכבת או מתבססת ההתנהלות שמתוארת ע"י האותיות החיצוניות</p>
-            <div class="IntExtimg">
-                <img src="{image_data_urls.get('internal', '')}" alt="MBTI Internal Function Image" style="width: 209px; height: 300px; object-fit: contain;">
-            </div>
-        </div>
-
-        {facet_sections_html}
-
-        <div class="footer">
-            All rights reserved © <img src="{logo_data_url}" alt="TEMBTI Logo">
-        </div>
-    </body>
-    </html>
-    """
+            facet_sections.append(
+                render_template(
+                    "personal_facet_section",
+                    facet=display_facet,
+                    facet_image=facet_image_tag,
+                    descriptor=descriptor,
+                    communication=explanations[0],
+                    managing_change=explanations[1],
+                    managing_conflict=explanations[2],
+                )
+            )
+
+    html = render_template(
+        "personal_report",
+        name=info["name"],
+        mbti_type=info["type"],
+        dominant=info.get("dominant", "Not specified"),
+        logo_url=logo_url,
+        general_image_url=image_urls.get("general", ""),
+        dominant_image_url=image_urls.get("dominant", ""),
+        functions_page=functions_page_html,
+        facet_sections="\n".join(facet_sections),
+    )
     return html
 
 
@@ -0,0 +1,220 @@
+"""
+Shared WeasyPrint rendering for every PDF report.
+
+Font discovery and stylesheet parsing are paid once per process instead of once
+per report: a single FontConfiguration is reused and each report's stylesheet is
+parsed into a CSS object the first time it is needed. When the server is
+running, renders go to a pool of worker processes that warm both up at start.
+
+Images are referenced by URL instead of being base64-encoded into the HTML:
+``asset://<path>`` resolves files under MEDIA_PATH (read once per process) and
+``task://<id>/<name>`` resolves bytes handed to render_pdf for that render.
+"""
+
+import logging
+import mimetypes
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache, partial
+from pathlib import PurePosixPath
+from urllib.parse import unquote
+
+from weasyprint import CSS, HTML, default_url_fetcher
+from weasyprint.text.fonts import FontConfiguration
+
+from .consts import (
+    KEEP_RENDER_ARTIFACTS,
+    MEDIA_PATH,
+    RENDER_WORKERS,
+    REPORT_STYLESHEETS,
+    STYLES_DIR,
+)
+from .telemetry import span
+
+# Suppress verbose logs from weasyprint and fontTools
+logging.getLogger("weasyprint").setLevel(logging.WARNING)
+logging.getLogger("fontTools").setLevel(logging.WARNING)
+
+ASSET_SCHEME = "asset://"
+TASK_SCHEME = "task://"
+LOGO_ASSET_URL = ASSET_SCHEME + "full_logo.png"
+
+_font_config = None
+_stylesheets = {}
+_render_pool = None
+# FontConfiguration wraps a Pango font map that must not be shared between
+# threads, so in-process renders are serialised
+_render_lock = threading.Lock()
+
+
+def get_font_config():
+    """Return the process-wide FontConfiguration."""
+    global _font_config
+    if _font_config is None:
+        _font_config = FontConfiguration()
+    return _font_config
+
+
+def get_stylesheet(template):
+    """
+    Return the parsed stylesheet for a report template.
+
+    Args:
+        template: Key of REPORT_STYLESHEETS (e.g. "personal", "dual")
+
+    Returns:
+        weasyprint.CSS parsed once per process
+    """
+    if template not in _stylesheets:
+        _stylesheets[template] = CSS(
+            filename=str(STYLES_DIR / REPORT_STYLESHEETS[template]),
+            font_config=get_font_config(),
+        )
+    return _stylesheets[template]
+
+
+def read_stylesheet(template):
+    """Return the raw CSS text of a report template (for HTML served to browsers)."""
+    return (STYLES_DIR / REPORT_STYLESHEETS[template]).read_text(encoding="utf-8")
+
+
+def asset_url(relative_path):
+    """Return the asset:// URL of a file under MEDIA_PATH."""
+    return ASSET_SCHEME + PurePosixPath(relative_path).as_posix()
+
+
+def task_url(task_id, name):
+    """Return the task:// URL under which a render resource is registered."""
+    return f"{TASK_SCHEME}{task_id}/{name}"
+
+
+@cache
+def read_asset(relative_path):
+    """
+    Return the bytes of a media asset, read once per process.
+
+    Args:
+        relative_path: Path relative to MEDIA_PATH
+
+    Returns:
+        bytes of the file
+    """
+    media_root = MEDIA_PATH.resolve()
+    path = (media_root / relative_path).resolve()
+    if media_root not in path.parents:
+        raise ValueError(f"Asset outside media directory: {relative_path}")
+    return path.read_bytes()
+
+
+def _guess_mime_type(url):
+    return mimetypes.guess_type(url)[0] or "image/png"
+
+
+def fetch_url(url, resources=None):
+    """
+    WeasyPrint url_fetcher for the asset:// and task:// schemes.
+
+    Args:
+        url: URL requested by WeasyPrint
+        resources: Mapping of task:// URL to bytes for the current render
+
+    Returns:
+        dict in the format expected by WeasyPrint
+    """
+    if url.startswith(ASSET_SCHEME):
+        return {
+            "string": read_asset(unquote(url[len(ASSET_SCHEME) :])),
+            "mime_type": _guess_mime_type(url),
+        }
+    if url.startswith(TASK_SCHEME):
+        # WeasyPrint percent-encodes non-ASCII URLs before fetching them
+        data = (resources or {}).get(url) or (resources or {}).get(unquote(url))
+        if data is None:
+            raise ValueError(f"Unknown task resource: {url}")
+        return {"string": data, "mime_type": _guess_mime_type(url)}
+    return default_url_fetcher(url)
+
+
+def warm_up():
+    """Load fonts and parse every report stylesheet up front."""
+    get_font_config()
+    for template in REPORT_STYLESHEETS:
+        get_stylesheet(template)
+
+
+def _render(html, output_path, template, base_url, resources):
+    stylesheets = [get_stylesheet(template)] if template else None
+    document = HTML(
+        string=html,
+        base_url=base_url,
+        url_fetcher=partial(fetch_url, resources=resources),
+    )
+    with _render_lock:
+        document.write_pdf(
+            output_path, stylesheets=stylesheets, font_config=get_font_config()
+        )
+    return output_path
+
+
+def render_pdf(html, output_path, template=None, base_url=None, resources=None):
+    """
+    Render an HTML string to a PDF file.
+
+    Uses the warm worker pool when it has been started, otherwise renders in
+    the calling process.
+
+    Args:
+        html: Full HTML document
+        output_path: Where to write the PDF
+        template: Optional REPORT_STYLESHEETS key whose stylesheet is applied
+        base_url: Base URL for resolving relative links in the document
+        resources: Optional mapping of task:// URL to bytes (see task_url)
+
+    Returns:
+        output_path
+    """
+    with span("render"):
+        if _render_pool is not None:
+            return _render_pool.submit(
+                _render, html, output_path, template, base_url, resources
+            ).result()
+        return _render(html, output_path, template, base_url, resources)
+
+
+def save_render_artifact(html, html_path):
+    """
+    Write a report's intermediate HTML when KEEP_RENDER_ARTIFACTS is set.
+
+    Reports are rendered straight from the HTML string, so the file is only
+    useful for debugging a layout.
+
+    Returns:
+        html_path if the file was written, otherwise None
+    """
+    if not KEEP_RENDER_ARTIFACTS:
+        return None
+    with open(html_path, "w", encoding="utf-8") as f:
+        f.write(html)
+    return html_path
+
+
+def start_render_pool(workers=RENDER_WORKERS):
+    """Start the warm render worker pool (no-op when workers is 0)."""
+    global _render_pool
+    if _render_pool is not None or workers <= 0:
+        return
+    _render_pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=warm_up,
+    )
+    print(f"🖨️ Started {workers} PDF render workers")
+
+
+def shutdown_render_pool():
+    """Stop the render worker pool, if it is running."""
+    global _render_pool
+    if _render_pool is not None:
+        _render_pool.shutdown(wait=False, cancel_futures=True)
+        _render_pool = None
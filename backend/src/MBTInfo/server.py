@@ -1,6 +1,8 @@
 import asyncio
 import atexit
 import glob
+import hashlib
+import json
 import logging
 import os
 import re
@@ -8,6 +10,7 @@ import shutil
 import signal
 import sys
 import tempfile
+import time
 import traceback
 import uuid
 from datetime import datetime
@@ -15,32 +18,63 @@ from pathlib import Path
 from typing import Optional
 from zipfile import ZipFile
 
-import pandas as pd
 import uvicorn
-from fastapi import BackgroundTasks, FastAPI, File, Form, HTTPException, UploadFile
+from fastapi import (
+    FastAPI,
+    File,
+    Form,
+    HTTPException,
+    Request,
+    UploadFile,
+)
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi.responses import (
+    FileResponse,
+    HTMLResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
-from weasyprint import HTML as WeasyHTML
-
-from MBTInterpret.main import create_translated_pdf
 
+from .background import (
+    append_group_report_background,
+    create_dual_report_background,
+    create_group_report_background,
+    create_personal_report_background,
+    create_personal_reports_batch_background,
+    group_insight_background,
+    insight_background,
+    translate_pdf_background,
+)
 from .consts import (
+    INTERACTIVE_RESERVED_WORKERS,
+    JOB_BACKEND,
+    JOB_CAPACITY,
+    JOB_LANES,
+    JOB_WORKERS,
+    MAX_QUEUED_JOBS,
     MEDIA_DIRECTORIES_TO_CHECK,
     MEDIA_DIRECTORY_KEEP_ITEMS,
     PROJECT_BASE_DIR,
+    TASK_DB_PATH,
 )
-from .dual_report import generate_dual_report
-from .extract_image import extract_multiple_graphs_from_pdf
-from .group_report import process_group_report_fixed
-from .MBTInsight import (
-    extract_data_from_excel_fixed,
-    group_user_prompt,
-    process_pdf_with_gpt,
+from .dataset import csv_chunks, json_chunks, load_records, parquet_bytes
+from .jobs import JobQueue, QueueFull, SqliteJobQueue
+from .renderer import shutdown_render_pool, start_render_pool
+from .tasks import (
+    TaskItem,
+    TaskStatus,
+    find_task,
+    overdue,
+    remove_workspace,
+    stop_task,
+    task_listeners,
+    task_storage,
 )
-from .personal_report import generate_personal_report
-from .utils import sanitize_filename, sanitize_path_component
+from .telemetry import render_metrics
+from .utils import sanitize_filename
 
 TEMP_DIR = "/tmp/tmp_pdf"
 os.makedirs(TEMP_DIR, exist_ok=True)
@@ -137,20 +171,14 @@ async def startup_event():
     logger.info(f"Output directory: {OUTPUT_DIR}")
 
     asyncio.create_task(cleanup_old_temp_files())
+    app.state.loop = asyncio.get_running_loop()
+    # With the sqlite backend reports are rendered, and timed out, by the workers
+    if JOB_BACKEND != "sqlite":
+        start_render_pool()
+        asyncio.create_task(stop_overdue_jobs())
 
 
 # Pydantic models
-class TaskStatus(BaseModel):
-    task_id: str
-    status: str  # "pending", "processing", "completed", "failed"
-    message: str
-    file_type: Optional[str] = None  # "html", "pdf", "xlsx", etc.
-    created_at: datetime
-    excel_path: Optional[str] = None  # Add this as a proper field
-    insight_pdf_url: Optional[str] = None
-    file_path: Optional[str] = None
-
-
 class TaskResponse(BaseModel):
     task_id: str
     status: str
@@ -166,10 +194,26 @@ class TaskStatusResponse(BaseModel):
     excel_path: Optional[str] = None
     insight_pdf_url: Optional[str] = None
     file_path: Optional[str] = None
-
-
-# In-memory task storage
-task_storage: dict[str, TaskStatus] = {}
+    stage: Optional[str] = None
+    items_done: Optional[int] = None
+    items_total: Optional[int] = None
+    elapsed_seconds: Optional[float] = None
+    eta_seconds: Optional[float] = None
+    progress: Optional[float] = None  # percent, 0-100
+    queue_position: Optional[int] = None  # 1 = next to start; None once running
+    items: Optional[list[TaskItem]] = None
+
+
+# Open /events/{task_id} streams, each woken through its own queue
+task_subscribers: dict[str, set[asyncio.Queue]] = {}
+TERMINAL_STATUSES = {"completed", "failed", "cancelled"}
+EVENTS_KEEPALIVE_SECONDS = 15
+# Workers of the sqlite backend cannot wake the streams, so they re-read the
+# task store this often
+EVENTS_POLL_SECONDS = 1 if JOB_BACKEND == "sqlite" else EVENTS_KEEPALIVE_SECONDS
+TIMEOUT_CHECK_SECONDS = 5
+# How often a batch ZIP download checks for newly finished reports
+BATCH_ZIP_POLL_SECONDS = 1
 
 
 def cleanup_output_directory():
@@ -239,6 +283,7 @@ def cleanup_media_directory():
 def cleanup_on_exit():
     """Cleanup function called when service exits"""
     print("\n🛑 MBTI Processing Service shutting down...")
+    shutdown_render_pool()
     cleanup_media_directory()
     cleanup_output_directory()
     delete_uuid_folders_from(INPUT_DIR)
@@ -277,14 +322,211 @@ def create_task_id() -> str:
     return str(uuid.uuid4())
 
 
-def update_task_status(
-    task_id: str, status: str, message: str, file_path: Optional[str] = None
-):
-    if task_id in task_storage:
-        task_storage[task_id].status = status
-        task_storage[task_id].message = message
-        if file_path:
-            task_storage[task_id].file_path = file_path
+def publish_task(task_id: str):
+    """
+    Wake the /events streams of a task so they send its current status.
+
+    Safe to call from worker threads; delivery happens on the event loop.
+    """
+    subscribers = task_subscribers.get(task_id)
+    loop = getattr(app.state, "loop", None)
+    if not subscribers or loop is None:
+        return
+
+    for queue in list(subscribers):
+        loop.call_soon_threadsafe(queue.put_nowait, task_id)
+
+
+def publish_tasks(task_ids):
+    for task_id in task_ids:
+        publish_task(task_id)
+
+
+task_listeners.append(publish_task)
+
+if JOB_BACKEND == "sqlite":
+    job_queue = SqliteJobQueue(
+        TASK_DB_PATH,
+        sorted(JOB_CAPACITY, key=lambda kind: JOB_LANES[kind] != "interactive"),
+        MAX_QUEUED_JOBS,
+    )
+else:
+    job_queue = JobQueue(
+        JOB_CAPACITY,
+        MAX_QUEUED_JOBS,
+        lanes=JOB_LANES,
+        lane_capacity={
+            "interactive": JOB_WORKERS,
+            "batch": max(JOB_WORKERS - INTERACTIVE_RESERVED_WORKERS, 1),
+        },
+        workers=JOB_WORKERS,
+        on_update=publish_tasks,
+    )
+
+
+def client_id(request: Request) -> str:
+    """Identify the client for queue fairness (nginx passes X-Real-IP)."""
+    return request.headers.get("x-real-ip") or (
+        request.client.host if request.client else "unknown"
+    )
+
+
+def _queue_full(e: QueueFull) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=f"Too many {e.kind} jobs queued, please retry later",
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
+def check_job_capacity(kind: str):
+    """Reject a request with 429 before its uploads are saved if the queue is full."""
+    try:
+        job_queue.check(kind)
+    except QueueFull as e:
+        raise _queue_full(e) from e
+
+
+def enqueue_job(request: Request, task_id: str, kind: str, func, *args):
+    """
+    Queue a background job for a task created by the calling endpoint.
+
+    Raises:
+        HTTPException: 429 with Retry-After if the queue for this kind is full
+    """
+    try:
+        position = job_queue.submit(task_id, kind, client_id(request), func, *args)
+    except QueueFull as e:
+        task_storage.pop(task_id, None)
+        raise _queue_full(e) from e
+
+    if position:
+        task = task_storage[task_id]
+        task.message += f" (position {position} in queue)"
+        task_storage[task_id] = task
+
+
+def stop_job(task_id: str, status: str, message: str) -> bool:
+    """
+    Cancel or fail a task, drop or cancel its job and delete its uploads.
+
+    Returns:
+        bool: False if the task does not exist or has already finished
+    """
+    if not stop_task(task_id, status, message):
+        return False
+    job_queue.cancel(task_id)
+    remove_workspace(task_id)
+    print(f"🛑 Task {task_id} {status}: {message}")
+    return True
+
+
+async def stop_overdue_jobs():
+    """Fail local jobs that run past their stage timeout (see tasks.overdue)"""
+    while True:
+        await asyncio.sleep(TIMEOUT_CHECK_SECONDS)
+        for task_id in job_queue.running_task_ids():
+            task = task_storage.get(task_id)
+            message = overdue(task) if task else None
+            if message:
+                stop_job(task_id, "failed", message)
+
+
+def _digest(*parts) -> str:
+    return hashlib.sha256(
+        json.dumps(parts, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def upload_digest(*files: UploadFile) -> str:
+    """
+    Digest of the uploaded files' sanitized names and contents, in order.
+
+    Names are included because they name the reports built from the files.
+    """
+    digests = []
+    for file in files:
+        digest = hashlib.sha256()
+        for chunk in iter(lambda file=file: file.file.read(1024 * 1024), b""):
+            digest.update(chunk)
+        file.file.seek(0)
+        digests.append((sanitize_filename(file.filename or ""), digest.hexdigest()))
+    return _digest(*digests)
+
+
+def folder_digest(folder_path: str) -> str:
+    """Digest of a folder's PDF names, sizes and modification times."""
+    entries = []
+    for name in sorted(os.listdir(folder_path)):
+        if name.lower().endswith(".pdf"):
+            stat = os.stat(os.path.join(folder_path, name))
+            entries.append((name, stat.st_size, stat.st_mtime_ns))
+    return _digest(os.path.abspath(folder_path), entries)
+
+
+def request_keys(request: Request, endpoint: str, *inputs) -> dict:
+    """
+    Keys identifying repeats of a request, stored on the task it creates.
+
+    Both keys are scoped to the client, so a client is never handed a task
+    (which it could then cancel) that another client created.
+
+    Args:
+        endpoint: Endpoint name
+        *inputs: Input digests and parameters that determine the result
+
+    Returns:
+        dict: ``input_key`` for the endpoint and inputs, and ``idempotency_key``
+        when the client sent an Idempotency-Key header
+    """
+    keys = {"input_key": _digest(endpoint, client_id(request), *inputs)}
+    idempotency_key = request.headers.get("idempotency-key")
+    if idempotency_key:
+        keys["idempotency_key"] = _digest(endpoint, client_id(request), idempotency_key)
+    return keys
+
+
+def find_duplicate_task(keys: dict) -> Optional[TaskResponse]:
+    """
+    Point a repeated request at the task already running or done for it.
+
+    Returns:
+        TaskResponse for the existing task, or None if the request is new
+    """
+    for field in ("idempotency_key", "input_key"):
+        task = find_task(field, keys[field]) if field in keys else None
+        if task is not None:
+            print(f"♻️ Repeated request, reusing task {task.task_id} ({task.status})")
+            return TaskResponse(
+                task_id=task.task_id, status=task.status, message=task.message
+            )
+    return None
+
+
+def _progress_fields(task: TaskStatus):
+    """Elapsed time, ETA and percent complete for a status response."""
+    if task.status == "completed":
+        return {"progress": 100.0}
+    if task.started_at is None:
+        return {}
+
+    now = datetime.now()
+    elapsed = (now - task.started_at).total_seconds()
+    eta = max((task.eta_at - now).total_seconds(), 0.0) if task.eta_at else None
+
+    if eta is not None:
+        percent = 100 * elapsed / (elapsed + eta) if elapsed + eta else 0.0
+    elif task.items_total:
+        percent = 100 * (task.items_done or 0) / task.items_total
+    else:
+        percent = None
+
+    return {
+        "elapsed_seconds": round(elapsed, 1),
+        "eta_seconds": round(eta, 1) if eta is not None else None,
+        # Stay below 100 until the task is actually marked completed
+        "progress": round(min(percent, 99.0), 1) if percent is not None else None,
+    }
 
 
 @app.get("/output/{filename}")
@@ -561,470 +803,164 @@ async def download_report_excel(task_id: str):
     )
 
 
-def wrap_html_with_header(
-    content_html,
-    report_title="MBTI Insight Report",
-    subject_name="",
-    logo_url="/media/full_logo.png",
-):
-    """Wraps the provided HTML content with full HTML structure, CSS, and header."""
-    # Build the logo image HTML if logo_url is provided
-    logo_html = f'<img src="{logo_url}" alt="Logo" />' if logo_url else ""
-
-    # Build the title HTML
-    title_html = f"<h1>{report_title}</h1>" if report_title else ""
-    subtitle_html = f"<h2>{subject_name}</h2>" if subject_name else ""
-
-    # Build the header section
-    header_html = ""
-    if logo_html or title_html or subtitle_html:
-        header_html = f"""
-    <div class="inner-header">
-        {logo_html}
-        {title_html}
-        {subtitle_html}
-    </div>
-"""
-
-    full_html = f"""<!DOCTYPE html>
-<html lang="he">
-<head>
-    <meta charset="UTF-8">
-    <title>{report_title} - {subject_name}</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', 'Arial', sans-serif;
-            background: #fff;
-            color: #222;
-            margin: 0;
-            padding: 0;
-        }}
-        .inner-header {{
-            text-align: center;
-            padding: 32px 0 12px 0;
-            border-bottom: 2px solid #eee;
-            margin-bottom: 24px;
-            background: #f6f9ff;
-        }}
-        .inner-header img {{
-            height: 48px;
-            vertical-align: middle;
-            margin-bottom: 10px;
-        }}
-        .inner-header h1 {{
-            margin: 10px 0 0 0;
-            font-size: 2.2rem;
-            color: #254C7D;
-            letter-spacing: 2px;
-        }}
-        .inner-header h2 {{
-            margin: 0;
-            font-size: 1.3rem;
-            color: #555;
-            font-weight: normal;
-        }}
-        .report-content {{
-            max-width: 800px;
-            margin: 0 auto;
-            padding: 36px 24px 24px 24px;
-            background: #fff;
-            border-radius: 12px;
-            box-shadow: 0 8px 32px rgba(90,100,130,0.08);
-        }}
-        h2, h3, h4 {{
-            color: #254C7D;
-        }}
-    </style>
-</head>
-<body>
-    {header_html}
-    <div class="report-content">
-        {content_html}
-    </div>
-</body>
-</html>
-"""
-    return full_html
-
-
-async def group_insight_background(task_id: str, excel_path: str, req_data: dict):
-    """Background task for generating group insight"""
-    try:
-        update_task_status(task_id, "processing", "Extracting data from Excel...")
-
-        table_pdf_path = extract_data_from_excel_fixed(excel_path)
-        print(f"Data table PDF generated at: {table_pdf_path}")
-
-        update_task_status(task_id, "processing", "Building analysis prompt...")
-
-        user_prompt = group_user_prompt(
-            req_data.get("group_name", ""),
-            req_data.get("industry", ""),
-            req_data.get("team_type", ""),
-            req_data.get("analysis_goal", ""),
-            req_data.get("roles", ""),
-            req_data.get("existing_challenges", ""),
-        )
-        print("GROUP USER PROMPT:", user_prompt)
-
-        update_task_status(task_id, "processing", "Analyzing team data with AI...")
-
-        df = pd.read_excel(excel_path, sheet_name="Data")
-        html_table = df.to_html(index=False)
-        content_blocks = [
-            {"type": "text", "text": user_prompt},
-            {"type": "text", "text": html_table},
-        ]
-
-        ai_result = process_pdf_with_gpt(table_pdf_path, content_blocks)
-        print("AI RESULT:", ai_result)
-
-        if ai_result.get("status") != "ok" or "insight" not in ai_result:
-            update_task_status(
-                task_id,
-                "failed",
-                f"AI analysis failed: {ai_result.get('reason', 'Unknown error')}",
-            )
-            return
-
-        update_task_status(task_id, "processing", "Generating insight report...")
-
-        output_dir = os.path.join(OUTPUT_DIR, "insights")
-        os.makedirs(output_dir, exist_ok=True)
-
-        insight_filename = f"group_insight_{task_id[:8]}.html"
-        insight_path = os.path.join(output_dir, insight_filename)
-
-        wrapped_html = wrap_html_with_header(
-            ai_result["insight"],
-            report_title="Group MBTI Analysis",
-            subject_name=req_data.get("group_name", ""),
-            logo_url="/media/full_logo.png",
-        )
-
-        with open(insight_path, "w", encoding="utf-8") as f:
-            f.write(wrapped_html)
-
-        # Generate PDF version
-        insight_pdf_filename = f"group_insight_{task_id[:8]}.pdf"
-        insight_pdf_path = os.path.join(output_dir, insight_pdf_filename)
-
-        try:
-            WeasyHTML(insight_path).write_pdf(insight_pdf_path)
-            insight_pdf_url = f"/output/insights/{insight_pdf_filename}"
-        except Exception as e:
-            print(f"PDF generation failed: {e}")
-            insight_pdf_url = None
-
-        # Update task status
-        task_storage[task_id].status = "completed"
-        task_storage[task_id].message = "Group insight generated successfully"
-        task_storage[task_id].file_path = insight_path
-        task_storage[task_id].file_type = "html"
-        if insight_pdf_url:
-            task_storage[task_id].insight_pdf_url = insight_pdf_url
-
-    except Exception as e:
-        update_task_status(
-            task_id, "failed", f"Group insight generation failed: {str(e)}"
-        )
-        print(f"Error in group insight background: {str(e)}")
-        traceback.print_exc()
-
-
-async def insight_background(
-    task_id: str,
-    pdf_path: str,
-    relationship_type: str = None,
-    relationship_goals: str = None,
-):
-    """Background task for generating MBTI insights for personal/dual reports"""
-    try:
-        update_task_status(
-            task_id, "processing", "Generating MBTI Insight with GPT-4o..."
-        )
-
-        # Build user prompt for dual reports with relationship context
-        user_prompt = ""
-        if relationship_type:
-            user_prompt += "Supplementary information for MBTI couple report:\n"
-            user_prompt += f"Relationship type: {relationship_type}\n"
-        if relationship_goals:
-            user_prompt += f"Relationship goals: {relationship_goals}\n"
-
-        # Build content blocks for GPT
-        content_blocks = []
-        if user_prompt:
-            content_blocks.append({"type": "text", "text": user_prompt})
-
-        # Process the PDF with GPT
-        result = process_pdf_with_gpt(
-            pdf_path, content_blocks if content_blocks else None
-        )
-
-        # Generate file names based on PDF
-        pdf_stub = os.path.splitext(os.path.basename(pdf_path))[0][:6]
-        insight_html_filename = f"insight_{pdf_stub}.html"
-        insight_html_path = os.path.join(
-            os.path.dirname(pdf_path), insight_html_filename
-        )
-
-        if result.get("status") == "ok" and "insight" in result:
-            # Extract subject name for header (from filename)
-            subject_name = ""
-            try:
-                base_name = os.path.basename(pdf_path)
-                if "_" in base_name:
-                    subject_name = (
-                        base_name.replace(".pdf", "").replace("_", " ").strip()
-                    )
-            except Exception:
-                subject_name = ""
-
-            # Wrap with header and structure
-            html_with_header = wrap_html_with_header(
-                result["insight"],
-                report_title="MBTI Insight Report",
-                subject_name=subject_name,
-                logo_url="/media/full_logo.png",
-            )
-
-            # Save HTML for preview/download
-            with open(insight_html_path, "w", encoding="utf-8") as f:
-                f.write(html_with_header)
-
-            # Generate PDF from HTML
-            insight_pdf_filename = f"insight_{pdf_stub}.pdf"
-            insight_pdf_path = os.path.join(
-                os.path.dirname(pdf_path), insight_pdf_filename
-            )
-
-            try:
-                WeasyHTML(insight_html_path).write_pdf(insight_pdf_path)
-                print(f"PDF generated successfully: {insight_pdf_path}")
-            except Exception as e:
-                print(f"PDF generation from insight HTML failed: {e}")
-                insight_pdf_path = None
-
-            insight_pdf_url = None
-            if insight_pdf_path and os.path.exists(insight_pdf_path):
-                rel_dir = os.path.relpath(os.path.dirname(pdf_path), OUTPUT_DIR)
-                insight_pdf_url = f"/output/{rel_dir}/{insight_pdf_filename}".replace(
-                    "\\", "/"
-                )
-
-            # Update task status with completion
-            task_storage[task_id].status = "completed"
-            task_storage[task_id].message = "Insight generated successfully."
-            task_storage[task_id].file_path = insight_html_path
-            task_storage[task_id].file_type = "html"
-            if insight_pdf_url:
-                task_storage[task_id].insight_pdf_url = insight_pdf_url
-
-            print(
-                f"Insight generated successfully. HTML: {insight_html_path}, PDF: {insight_pdf_url}"
-            )
-
-        else:
-            update_task_status(
-                task_id,
-                "failed",
-                f"Insight generation failed: {result.get('reason', 'Unknown error')}",
-            )
-    except Exception as e:
-        print(f"Error in insight_background: {str(e)}")
-        traceback.print_exc()
-        update_task_status(task_id, "failed", f"Insight error: {str(e)}")
-
-
-async def translate_pdf_background(task_id: str, pdf_path: str):
-    """Background task for translating a PDF"""
-    try:
-        update_task_status(task_id, "processing", "Translating PDF...")
-
-        # Create task-specific directory in TEMP_DIR
-        task_dir = os.path.join(TEMP_DIR, task_id)
-        os.makedirs(task_dir, exist_ok=True)
-
-        # Await the create_translated_pdf function
-        output_pdf_path = await create_translated_pdf(pdf_path, task_dir)
-
-        # Store file_path in task storage (existing /report/{task_id}/pdf endpoint will handle serving)
-        # Set file_type to enable Get Insight button
-        if task_id in task_storage:
-            task_storage[task_id].file_type = "pdf_view"
-        update_task_status(
-            task_id,
-            "completed",
-            "Translation completed successfully",
-            output_pdf_path,
-        )
-
-    except Exception as e:
-        update_task_status(task_id, "failed", f"Translation failed: {str(e)}")
-        print(f"Error translating PDF: {str(e)}")
-        traceback.print_exc()
-
-
-# Background task functions
-
-
-async def create_group_report_background(task_id: str, folder_path: str):
-    """Simple fixed version of group report background task"""
-    try:
-        update_task_status(
-            task_id, "processing", "Creating group report (with fixes)..."
-        )
-
-        # Use task_id for unique filename since folder_path is now "all_pdfs"
-        output_filename = f"group_report_{task_id}.xlsx"
-        output_path = os.path.join(OUTPUT_DIR, output_filename)
+def group_report_path(task_id: str) -> str:
+    """
+    Workbook of a completed group report task.
 
-        # Remove existing file if present
-        if os.path.exists(output_path):
-            try:
-                os.remove(output_path)
-                print(f"Removed existing: {output_path}")
-            except PermissionError:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                output_filename = f"group_report_{task_id}_{timestamp}.xlsx"
-                output_path = os.path.join(OUTPUT_DIR, output_filename)
-
-        # Debug: List PDF files before processing
-        pdf_files = [f for f in os.listdir(folder_path) if f.lower().endswith(".pdf")]
-        print(f"📄 About to process {len(pdf_files)} PDF files:")
-        for i, pdf in enumerate(pdf_files[:5]):  # Show first 5
-            print(f"  {i + 1}. {pdf}")
-        if len(pdf_files) > 5:
-            print(f"  ... and {len(pdf_files) - 5} more")
-
-        # Use the fixed processing function
-        workbook = process_group_report_fixed(folder_path, OUTPUT_DIR, output_filename)
-
-        if workbook and hasattr(workbook, "close"):
-            workbook.close()
-
-        # Verify the output file exists
-        if os.path.exists(output_path):
-            print(f"✅ Excel file created successfully: {output_path}")
-
-            # Update task status with excel_path stored properly
-            if task_id in task_storage:
-                task_storage[task_id] = TaskStatus(
-                    task_id=task_id,
-                    status="completed",
-                    message="Group report created successfully",
-                    excel_path=output_path,  # Store the full path
-                    created_at=task_storage[task_id].created_at,
-                    file_type="xlsx",
-                )
-        else:
-            # File wasn't created - this is a failure
-            error_msg = f"Excel file was not created at {output_path}. Check PDF processing logs."
-            print(f"❌ {error_msg}")
-            update_task_status(task_id, "failed", error_msg)
+    Raises:
+        HTTPException: 404 if the task or its workbook does not exist, 400 if
+        it is not a completed group report
+    """
+    task = task_storage.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail=f"Task not found: {task_id}")
+    if task.status != "completed":
+        raise HTTPException(status_code=400, detail="Group report is not completed yet")
+    excel_path = task.excel_path
+    if not excel_path or not os.path.basename(excel_path).startswith("group_report_"):
+        raise HTTPException(status_code=400, detail="Task is not a group report")
+    if not os.path.exists(excel_path):
+        raise HTTPException(status_code=404, detail=f"File not found: {excel_path}")
+    return excel_path
+
+
+def export_headers(excel_path: str, extension: str) -> dict:
+    filename = os.path.splitext(os.path.basename(excel_path))[0] + extension
+    return {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+
+@app.get("/report/{task_id}/csv")
+async def download_report_csv(task_id: str):
+    """Download the parsed records of a group report as CSV, one row per person"""
+    excel_path = group_report_path(task_id)
+    records = await asyncio.to_thread(load_records, excel_path)
+    return StreamingResponse(
+        csv_chunks(records),
+        media_type="text/csv",
+        headers=export_headers(excel_path, ".csv"),
+    )
 
-    except Exception as e:
-        error_msg = f"Group report creation failed: {str(e)}"
-        print(f"❌ {error_msg}")
-        import traceback
 
-        traceback.print_exc()
-        update_task_status(task_id, "failed", error_msg)
+@app.get("/report/{task_id}/json")
+async def download_report_json(task_id: str):
+    """Download the parsed records of a group report as a JSON array of people"""
+    excel_path = group_report_path(task_id)
+    records = await asyncio.to_thread(load_records, excel_path)
+    return StreamingResponse(
+        json_chunks(records),
+        media_type="application/json",
+        headers=export_headers(excel_path, ".json"),
+    )
 
 
-async def create_personal_report_background(task_id: str, pdf_path: str):
-    """Background task for creating personal report"""
+@app.get("/report/{task_id}/parquet")
+async def download_report_parquet(task_id: str):
+    """Download the parsed records of a group report as a Parquet file"""
+    excel_path = group_report_path(task_id)
+    records = await asyncio.to_thread(load_records, excel_path)
     try:
-        update_task_status(task_id, "processing", "Extracting images from PDF...")
-        page_rectangles = {
-            4: {"EIGraph": (0.1, 0.12, 0.9, 0.44)},
-            5: {"SNgraph": (0.1, 0.12, 0.9, 0.44)},
-            6: {"TFgraph": (0.1, 0.12, 0.9, 0.44)},
-            7: {"JPgraph": (0.1, 0.12, 0.9, 0.44)},
-        }
-
-        for page_num in [4, 5, 6, 7]:
-            rect_coords_dict = page_rectangles.get(page_num)
-            extract_multiple_graphs_from_pdf(
-                pdf_path, MEDIA_DIR, page_num, rect_coords_dict, zoom=2
-            )
-
-        update_task_status(task_id, "processing", "Generating personal report...")
-        name_without_ext = Path(pdf_path).stem
-        person_name = sanitize_filename(name_without_ext)
-
-        task_dir = os.path.join(TEMP_DIR, task_id)
-        os.makedirs(task_dir, exist_ok=True)
+        content = await asyncio.to_thread(parquet_bytes, records)
+    except ImportError as e:
+        raise HTTPException(
+            status_code=501,
+            detail="Parquet export needs pyarrow, which is not installed",
+        ) from e
+    return Response(
+        content=content,
+        media_type="application/vnd.apache.parquet",
+        headers=export_headers(excel_path, ".parquet"),
+    )
 
-        output_filename = f"{person_name}_personal_report_{task_id}.pdf"
-        full_output_path = os.path.join(task_dir, output_filename)
 
-        generate_personal_report(pdf_path, task_dir, output_filename)
+# API Endpoints
+class _ZipStream:
+    """Write-only file for ZipFile whose output is handed on as it is written."""
 
-        if not os.path.exists(full_output_path):
-            raise FileNotFoundError(f"Failed to generate PDF at {full_output_path}")
+    def __init__(self):
+        self._chunks = []
 
-        file_path = full_output_path
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
 
-        if task_id in task_storage:
-            task_storage[task_id].status = "completed"
-            task_storage[task_id].message = "Personal report created successfully"
-            task_storage[task_id].file_type = "pdf_view"
-            task_storage[task_id].file_path = file_path
-        else:
-            update_task_status(
-                task_id,
-                "completed",
-                "Personal report created successfully",
-                file_path,
-            )
+    def flush(self):
+        pass
 
-    except Exception as e:
-        update_task_status(
-            task_id, "failed", f"Personal report creation failed: {str(e)}"
-        )
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _zip_entry_name(file_path, names):
+    """Archive name of a report: its file name, numbered if already taken."""
+    stem, ext = os.path.splitext(os.path.basename(file_path))
+    name, suffix = f"{stem}{ext}", 1
+    while name.lower() in names:
+        suffix += 1
+        name = f"{stem}-{suffix}{ext}"
+    names.add(name.lower())
+    return name
+
+
+def _write_zip_entry(archive, stream, file_path, name):
+    """Add a file to a streamed archive and return the bytes written."""
+    archive.write(file_path, name)
+    return stream.drain()
+
+
+async def stream_batch_zip(task_id: str):
+    """Yield a ZIP of a batch task's reports, adding each one as it finishes."""
+    stream = _ZipStream()
+    added = set()  # indexes of the items already in the archive
+    names = set()
+    # PDFs are already compressed, so they are stored as they are
+    with ZipFile(stream, "w") as archive:
+        while True:
+            task = task_storage.get(task_id)
+            if task is None:
+                break
+            for index, item in enumerate(task.items or []):
+                if (
+                    item.status == "completed"
+                    and index not in added
+                    and os.path.exists(item.file_path)
+                ):
+                    # Reading the PDF blocks, so it is added in a thread
+                    yield await asyncio.to_thread(
+                        _write_zip_entry,
+                        archive,
+                        stream,
+                        item.file_path,
+                        _zip_entry_name(item.file_path, names),
+                    )
+                    added.add(index)
+            if task.status in TERMINAL_STATUSES:
+                break
+            await asyncio.sleep(BATCH_ZIP_POLL_SECONDS)
+    yield stream.drain()
 
 
-async def create_dual_report_background(
-    task_id: str, pdf1_path: str, pdf2_path: str, output_path: str
-):
-    """Background task for creating dual report (to be implemented)"""
-    try:
-        update_task_status(task_id, "processing", "Creating dual report...")
-        print(output_path)
-        first_name = sanitize_path_component(pdf1_path)
-        second_name = sanitize_path_component(pdf2_path)
-        identifier = f"{first_name}_{second_name}"
-        output_dir = os.path.join(output_path, identifier)
-        os.makedirs(output_dir, exist_ok=True)
-        _, final_path = generate_dual_report(pdf1_path, pdf2_path, output_dir)
-
-        if not os.path.exists(final_path):
-            raise FileNotFoundError(f"Generated dual report not found at {final_path}")
-
-        if task_id in task_storage:
-            task_storage[task_id].status = "completed"
-            task_storage[task_id].message = (
-                "Dual comparison report created successfully"
-            )
-            task_storage[task_id].file_type = "pdf_view"
-            task_storage[task_id].file_path = final_path
-        else:
-            update_task_status(
-                task_id,
-                "completed",
-                "Dual comparison report created successfully",
-                final_path,
-            )
+@app.get("/report/{task_id}/zip")
+async def download_report_zip(task_id: str):
+    """Download the reports of a batch task as one ZIP, streamed as they finish"""
+    if task_id not in task_storage:
+        raise HTTPException(status_code=404, detail="Task not found")
 
-    except Exception as e:
-        update_task_status(task_id, "failed", f"Dual report creation failed: {str(e)}")
-        print(f"Error processing dual report: {str(e)}")
-        traceback.print_exc()
+    task = task_storage[task_id]
+    if task.items is None:
+        raise HTTPException(status_code=400, detail="Task is not a batch report")
+    if task.status in ("failed", "cancelled"):
+        raise HTTPException(status_code=400, detail=f"Task {task.status}")
+
+    filename = f"personal_reports_{task.created_at:%Y%m%d_%H%M%S}.zip"
+    return StreamingResponse(
+        stream_batch_zip(task_id),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
-# API Endpoints
 @app.get("/", response_class=HTMLResponse)
 async def root():
     """Serve the web interface"""
@@ -1077,19 +1013,16 @@ async def root():
     )
 
 
-@app.post("/upload-zip-group-report", response_model=TaskResponse)
-async def upload_zip_group_report(
-    background_tasks: BackgroundTasks,
-    file: UploadFile = File(..., description="ZIP archive containing MBTI PDFs"),
-):
-    ext = os.path.splitext(file.filename)[-1].lower()
-    if ext not in [".zip"]:
-        raise HTTPException(status_code=400, detail="Only ZIP files are supported")
+def extract_zip_pdfs(file: UploadFile, task_dir: str) -> list:
+    """
+    Save an uploaded ZIP archive into a task folder and extract it.
 
-    task_id = create_task_id()
-    # Use task_id as folder name in TEMP_DIR for proper cleanup
-    task_dir = os.path.join(TEMP_DIR, task_id)
+    Returns:
+        list: Paths of the PDFs found anywhere in the archive
 
+    Raises:
+        HTTPException: If the archive cannot be extracted or has no PDFs
+    """
     # Create clean folder (optional: clear if already exists)
     if os.path.exists(task_dir):
         shutil.rmtree(task_dir)
@@ -1114,14 +1047,48 @@ async def upload_zip_group_report(
     pdf_files = glob.glob(os.path.join(task_dir, "**", "*.pdf"), recursive=True)
     if not pdf_files:
         raise HTTPException(status_code=400, detail="No PDF files found in archive")
+    return pdf_files
+
 
-    # Flatten PDFs into one directory
+def flatten_pdfs(pdf_files: list, task_dir: str) -> str:
+    """
+    Copy extracted PDFs into one folder of a task, prefixing each name so
+    files from different archive folders cannot collide.
+
+    Returns:
+        str: The folder of PDFs
+    """
     flat_pdf_dir = os.path.join(task_dir, "all_pdfs")
     os.makedirs(flat_pdf_dir, exist_ok=True)
     for pdf in pdf_files:
         base = os.path.basename(pdf)
         new_name = f"{uuid.uuid4().hex[:8]}_{base}"
         shutil.copy2(pdf, os.path.join(flat_pdf_dir, new_name))
+    return flat_pdf_dir
+
+
+@app.post("/upload-zip-group-report", response_model=TaskResponse)
+async def upload_zip_group_report(
+    request: Request,
+    file: UploadFile = File(..., description="ZIP archive containing MBTI PDFs"),
+):
+    ext = os.path.splitext(file.filename)[-1].lower()
+    if ext not in [".zip"]:
+        raise HTTPException(status_code=400, detail="Only ZIP files are supported")
+    keys = request_keys(
+        request, "upload-zip-group-report", await asyncio.to_thread(upload_digest, file)
+    )
+    duplicate = find_duplicate_task(keys)
+    if duplicate:
+        return duplicate
+    check_job_capacity("group")
+
+    task_id = create_task_id()
+    # Use task_id as folder name in TEMP_DIR for proper cleanup
+    task_dir = os.path.join(TEMP_DIR, task_id)
+    pdf_files = extract_zip_pdfs(file, task_dir)
+
+    flat_pdf_dir = flatten_pdfs(pdf_files, task_dir)
 
     # Queue background task
     task_storage[task_id] = TaskStatus(
@@ -1129,8 +1096,11 @@ async def upload_zip_group_report(
         status="pending",
         message="Group report queued from archive",
         created_at=datetime.now(),
+        **keys,
+    )
+    enqueue_job(
+        request, task_id, "group", create_group_report_background, task_id, flat_pdf_dir
     )
-    background_tasks.add_task(create_group_report_background, task_id, flat_pdf_dir)
 
     return TaskResponse(
         task_id=task_id,
@@ -1139,9 +1109,133 @@ async def upload_zip_group_report(
     )
 
 
+@app.post("/group-report/{task_id}/append", response_model=TaskResponse)
+async def append_to_group_report(
+    request: Request,
+    task_id: str,
+    file: UploadFile = File(
+        ..., description="ZIP archive with the new people's MBTI PDFs"
+    ),
+):
+    """
+    Add people to a completed group report.
+
+    Only the uploaded PDFs are parsed; the people already in the report come
+    from its stored records. The result is a new task with its own workbook,
+    so the source report stays downloadable as it was.
+    """
+    ext = os.path.splitext(file.filename)[-1].lower()
+    if ext not in [".zip"]:
+        raise HTTPException(status_code=400, detail="Only ZIP files are supported")
+
+    source_excel = group_report_path(task_id)
+
+    keys = request_keys(
+        request,
+        "group-report-append",
+        task_id,
+        await asyncio.to_thread(upload_digest, file),
+    )
+    duplicate = find_duplicate_task(keys)
+    if duplicate:
+        return duplicate
+    check_job_capacity("group")
+
+    append_task_id = create_task_id()
+    task_dir = os.path.join(TEMP_DIR, append_task_id)
+    flat_pdf_dir = flatten_pdfs(extract_zip_pdfs(file, task_dir), task_dir)
+
+    task_storage[append_task_id] = TaskStatus(
+        task_id=append_task_id,
+        status="pending",
+        message=f"Adding people to group report {task_id} queued",
+        created_at=datetime.now(),
+        **keys,
+    )
+    enqueue_job(
+        request,
+        append_task_id,
+        "group",
+        append_group_report_background,
+        append_task_id,
+        source_excel,
+        flat_pdf_dir,
+    )
+
+    return TaskResponse(
+        task_id=append_task_id,
+        status="pending",
+        message=f"Adding people from {file.filename} to group report {task_id}",
+    )
+
+
+@app.post("/create-personal-reports-batch", response_model=TaskResponse)
+async def create_personal_reports_batch(
+    request: Request,
+    file: UploadFile = File(..., description="ZIP archive containing MBTI PDFs"),
+):
+    """Create a personal report for every PDF in a ZIP archive, as one task"""
+    ext = os.path.splitext(file.filename)[-1].lower()
+    if ext not in [".zip"]:
+        raise HTTPException(status_code=400, detail="Only ZIP files are supported")
+    keys = request_keys(
+        request,
+        "create-personal-reports-batch",
+        await asyncio.to_thread(upload_digest, file),
+    )
+    duplicate = find_duplicate_task(keys)
+    if duplicate:
+        return duplicate
+    check_job_capacity("personal_batch")
+
+    task_id = create_task_id()
+    task_dir = os.path.join(TEMP_DIR, task_id)
+    pdf_files = extract_zip_pdfs(file, task_dir)
+
+    # Flatten PDFs into one directory. Names must stay unique after
+    # sanitizing, since the extracted graphs and reports are stored by name.
+    flat_pdf_dir = os.path.join(task_dir, "all_pdfs")
+    os.makedirs(flat_pdf_dir, exist_ok=True)
+    pdf_paths = []
+    names = set()
+    for pdf in sorted(pdf_files):
+        base = sanitize_filename(Path(pdf).stem) or "report"
+        name, suffix = base, 1
+        while name.lower() in names:
+            suffix += 1
+            name = f"{base}-{suffix}"
+        names.add(name.lower())
+        pdf_paths.append(os.path.join(flat_pdf_dir, f"{name}.pdf"))
+        shutil.copy2(pdf, pdf_paths[-1])
+
+    task_storage[task_id] = TaskStatus(
+        task_id=task_id,
+        status="pending",
+        message=f"Personal reports queued for {len(pdf_paths)} PDF files",
+        created_at=datetime.now(),
+        items=[TaskItem(name=Path(path).stem, status="pending") for path in pdf_paths],
+        items_total=len(pdf_paths),
+        **keys,
+    )
+    enqueue_job(
+        request,
+        task_id,
+        "personal_batch",
+        create_personal_reports_batch_background,
+        task_id,
+        pdf_paths,
+    )
+
+    return TaskResponse(
+        task_id=task_id,
+        status="pending",
+        message=f"Personal reports processing started for {len(pdf_paths)} files",
+    )
+
+
 @app.post("/insight/{task_id}", response_model=TaskResponse)
 async def get_mbti_insight_by_task_id(
-    background_tasks: BackgroundTasks,
+    request: Request,
     task_id: str,
     relationship_type: Optional[str] = None,
     relationship_goals: Optional[str] = None,
@@ -1177,6 +1271,13 @@ async def get_mbti_insight_by_task_id(
         if not os.path.exists(file_path):
             raise HTTPException(status_code=404, detail=f"File not found: {file_path}")
 
+        keys = request_keys(
+            request, "insight", source_task_id, relationship_type, relationship_goals
+        )
+        duplicate = find_duplicate_task(keys)
+        if duplicate:
+            return duplicate
+
         # Create new task for insight generation
         task_id = create_task_id()
         task_storage[task_id] = TaskStatus(
@@ -1184,10 +1285,14 @@ async def get_mbti_insight_by_task_id(
             status="pending",
             message="MBTI Insight queued",
             created_at=datetime.now(),
+            **keys,
         )
 
         # Start background task with the correct function name
-        background_tasks.add_task(
+        enqueue_job(
+            request,
+            task_id,
+            "insight",
             insight_background,  # This is the function we just defined
             task_id,
             file_path,
@@ -1215,7 +1320,7 @@ async def get_mbti_insight_by_task_id(
 
 @app.post("/create-group-report", response_model=TaskResponse)
 async def create_group_report(
-    background_tasks: BackgroundTasks,
+    request: Request,
     folder_path: str = Form(..., description="Path to folder containing PDF files"),
 ):
     """Create a group Excel report from a folder of PDF files"""
@@ -1231,6 +1336,11 @@ async def create_group_report(
         raise HTTPException(
             status_code=400, detail="No PDF files found in the specified folder"
         )
+    keys = request_keys(request, "create-group-report", folder_digest(folder_path))
+    duplicate = find_duplicate_task(keys)
+    if duplicate:
+        return duplicate
+    check_job_capacity("group")
 
     task_id = create_task_id()
 
@@ -1240,10 +1350,13 @@ async def create_group_report(
         status="pending",
         message=f"Group report queued for {len(pdf_files)} PDF files",
         created_at=datetime.now(),
+        **keys,
     )
 
     # Start background processing
-    background_tasks.add_task(create_group_report_background, task_id, folder_path)
+    enqueue_job(
+        request, task_id, "group", create_group_report_background, task_id, folder_path
+    )
 
     return TaskResponse(
         task_id=task_id,
@@ -1254,12 +1367,19 @@ async def create_group_report(
 
 @app.post("/create-personal-report", response_model=TaskResponse)
 async def create_personal_report(
-    background_tasks: BackgroundTasks,
+    request: Request,
     file: UploadFile = File(..., description="Single PDF file for personal report"),
 ):
     """Create a personal PDF report from a single PDF file"""
     if not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
+    keys = request_keys(
+        request, "create-personal-report", await asyncio.to_thread(upload_digest, file)
+    )
+    duplicate = find_duplicate_task(keys)
+    if duplicate:
+        return duplicate
+    check_job_capacity("personal")
 
     task_id = create_task_id()
     task_dir = os.path.join(TEMP_DIR, task_id)
@@ -1276,10 +1396,18 @@ async def create_personal_report(
         status="pending",
         message="Personal report queued",
         created_at=datetime.now(),
+        **keys,
     )
 
     # Start background processing
-    background_tasks.add_task(create_personal_report_background, task_id, file_path)
+    enqueue_job(
+        request,
+        task_id,
+        "personal",
+        create_personal_report_background,
+        task_id,
+        file_path,
+    )
     return TaskResponse(
         task_id=task_id,
         status="pending",
@@ -1289,7 +1417,7 @@ async def create_personal_report(
 
 @app.post("/create-dual-report", response_model=TaskResponse)
 async def create_dual_report(
-    background_tasks: BackgroundTasks,
+    request: Request,
     file1: UploadFile = File(..., description="First PDF file"),
     file2: UploadFile = File(..., description="Second PDF file"),
 ):
@@ -1298,6 +1426,15 @@ async def create_dual_report(
         ".pdf"
     ) or not file2.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
+    keys = request_keys(
+        request,
+        "create-dual-report",
+        await asyncio.to_thread(upload_digest, file1, file2),
+    )
+    duplicate = find_duplicate_task(keys)
+    if duplicate:
+        return duplicate
+    check_job_capacity("dual")
 
     task_id = create_task_id()
     task_dir = os.path.join(TEMP_DIR, task_id)
@@ -1319,11 +1456,19 @@ async def create_dual_report(
         status="pending",
         message="Dual report queued",
         created_at=datetime.now(),
+        **keys,
     )
 
     # Start background processing
-    background_tasks.add_task(
-        create_dual_report_background, task_id, file1_path, file2_path, task_dir
+    enqueue_job(
+        request,
+        task_id,
+        "dual",
+        create_dual_report_background,
+        task_id,
+        file1_path,
+        file2_path,
+        task_dir,
     )
 
     return TaskResponse(
@@ -1344,7 +1489,7 @@ class GroupInsightRequest(BaseModel):
 
 
 @app.post("/group-insight", response_model=TaskResponse)
-async def group_insight(background_tasks: BackgroundTasks, req: GroupInsightRequest):
+async def group_insight(request: Request, req: GroupInsightRequest):
     try:
         print(f"Received group insight request: {req}")
 
@@ -1396,6 +1541,11 @@ async def group_insight(background_tasks: BackgroundTasks, req: GroupInsightRequ
 
         print(f"Using Excel file: {excel_path}")
 
+        keys = request_keys(request, "group-insight", req.model_dump())
+        duplicate = find_duplicate_task(keys)
+        if duplicate:
+            return duplicate
+
         # 3. Create new task for insight generation
         task_id = create_task_id()
         task_storage[task_id] = TaskStatus(
@@ -1403,6 +1553,7 @@ async def group_insight(background_tasks: BackgroundTasks, req: GroupInsightRequ
             status="pending",
             message="Group insight queued",
             created_at=datetime.now(),
+            **keys,
         )
 
         # 4. Convert request to dict for background task
@@ -1416,8 +1567,14 @@ async def group_insight(background_tasks: BackgroundTasks, req: GroupInsightRequ
         }
 
         # 5. Start background processing
-        background_tasks.add_task(
-            group_insight_background, task_id, excel_path, req_data
+        enqueue_job(
+            request,
+            task_id,
+            "group_insight",
+            group_insight_background,
+            task_id,
+            excel_path,
+            req_data,
         )
 
         return TaskResponse(
@@ -1475,12 +1632,19 @@ async def debug_task(task_id: str):
 
 @app.post("/translate", response_model=TaskResponse)
 async def translate_pdf(
-    background_tasks: BackgroundTasks,
+    request: Request,
     file: UploadFile = File(..., description="PDF file to translate"),
 ):
     """Translate a PDF file"""
     if not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
+    keys = request_keys(
+        request, "translate", await asyncio.to_thread(upload_digest, file)
+    )
+    duplicate = find_duplicate_task(keys)
+    if duplicate:
+        return duplicate
+    check_job_capacity("translate")
 
     task_id = create_task_id()
     task_dir = os.path.join(TEMP_DIR, task_id)
@@ -1497,10 +1661,13 @@ async def translate_pdf(
         status="pending",
         message="Translation queued",
         created_at=datetime.now(),
+        **keys,
     )
 
     # Start background processing
-    background_tasks.add_task(translate_pdf_background, task_id, file_path)
+    enqueue_job(
+        request, task_id, "translate", translate_pdf_background, task_id, file_path
+    )
 
     return TaskResponse(
         task_id=task_id,
@@ -1509,13 +1676,7 @@ async def translate_pdf(
     )
 
 
-@app.get("/status/{task_id}", response_model=TaskStatusResponse)
-async def get_task_status(task_id: str):
-    """Get the status of a processing task."""
-    if task_id not in task_storage:
-        raise HTTPException(status_code=404, detail="Task not found")
-    task = task_storage[task_id]
-
+def build_task_status_response(task: TaskStatus) -> TaskStatusResponse:
     return TaskStatusResponse(
         task_id=task.task_id,
         status=task.status,
@@ -1525,6 +1686,110 @@ async def get_task_status(task_id: str):
         excel_path=getattr(task, "excel_path", None),
         insight_pdf_url=getattr(task, "insight_pdf_url", None),
         file_path=getattr(task, "file_path", None),
+        stage=task.stage,
+        items_done=task.items_done,
+        items_total=task.items_total,
+        items=task.items,
+        queue_position=job_queue.position(task.task_id),
+        **_progress_fields(task),
+    )
+
+
+@app.get("/status/{task_id}", response_model=TaskStatusResponse)
+async def get_task_status(task_id: str):
+    """Get the status of a processing task."""
+    if task_id not in task_storage:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return build_task_status_response(task_storage[task_id])
+
+
+@app.delete("/tasks/{task_id}", response_model=TaskStatusResponse)
+async def cancel_task(task_id: str):
+    """Cancel a pending or running task and delete its uploaded files"""
+    task = task_storage.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    if not stop_job(task_id, "cancelled", "Task cancelled"):
+        raise HTTPException(status_code=409, detail=f"Task already {task.status}")
+
+    return build_task_status_response(task_storage[task_id])
+
+
+@app.get("/events/{task_id}")
+async def task_events(task_id: str, request: Request):
+    """
+    Stream status changes of a task as Server-Sent Events.
+
+    Sends the current status immediately, then one ``status`` event per
+    change until the task completes or fails. Replaces polling /status.
+    """
+    if task_id not in task_storage:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    queue: asyncio.Queue = asyncio.Queue()
+    task_subscribers.setdefault(task_id, set()).add(queue)
+
+    async def stream():
+        sent = None
+        last_sent = 0.0
+        try:
+            while True:
+                task = task_storage.get(task_id)
+                if task is None:
+                    return
+                response = build_task_status_response(task)
+                # Elapsed time and ETA change constantly; send real changes only
+                state = response.model_dump(
+                    exclude={"elapsed_seconds", "eta_seconds", "progress"}
+                )
+                if state != sent:
+                    sent = state
+                    yield f"event: status\ndata: {response.model_dump_json()}\n\n"
+                    last_sent = time.monotonic()
+                elif time.monotonic() - last_sent >= EVENTS_KEEPALIVE_SECONDS:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+                    last_sent = time.monotonic()
+                if task.status in TERMINAL_STATUSES:
+                    return
+
+                try:
+                    await asyncio.wait_for(queue.get(), EVENTS_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+        finally:
+            subscribers = task_subscribers.get(task_id, set())
+            subscribers.discard(queue)
+            if not subscribers:
+                task_subscribers.pop(task_id, None)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Stage timings and job counts in the Prometheus text format."""
+    by_status = {}
+    for task in task_storage.values():
+        by_status[task.status] = by_status.get(task.status, 0) + 1
+
+    gauges = {
+        "mbti_active_jobs": ("Jobs currently running.", job_queue.running, "kind"),
+        "mbti_queue_depth": (
+            "Jobs waiting in the queue.",
+            {kind: job_queue.queued(kind) for kind in JOB_CAPACITY},
+            "kind",
+        ),
+        "mbti_tasks": ("Tasks in the task store by status.", by_status, "status"),
+    }
+    return PlainTextResponse(
+        render_metrics(gauges), media_type="text/plain; version=0.0.4"
     )
 
 
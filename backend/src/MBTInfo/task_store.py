@@ -0,0 +1,194 @@
+"""
+SQLite-backed task storage shared by the API and report workers.
+
+With JOB_BACKEND=sqlite the API and every ``python -m MBTInfo.worker`` process
+open the same TASK_DB_PATH: task status lives in the ``tasks`` table and
+queued report jobs in the ``jobs`` table (see jobs.SqliteJobQueue). Stage
+timings recorded by the worker processes go to ``stage_histograms``, so the
+API serves them on /metrics and every process estimates ETAs from them.
+"""
+
+import json
+import sqlite3
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+
+from .telemetry import Histogram
+
+# Task fields looked up by value (see SqliteTaskStore.find)
+INDEXED_FIELDS = ("idempotency_key", "input_key")
+
+
+@contextmanager
+def connect(path):
+    """Open the task database in autocommit mode and close it afterwards."""
+    db = sqlite3.connect(path, timeout=30, isolation_level=None)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@contextmanager
+def transaction(db):
+    """
+    Run the enclosed statements as one write transaction.
+
+    The transaction takes the write lock up-front, so a read followed by a
+    write cannot race another process. It is rolled back if a statement fails.
+    """
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        db.execute("ROLLBACK")
+        raise
+    db.execute("COMMIT")
+
+
+def create_tables(path, *statements):
+    """Run CREATE TABLE statements; WAL lets readers work while a worker writes."""
+    with connect(path) as db:
+        db.execute("PRAGMA journal_mode=WAL")
+        for statement in statements:
+            db.execute(statement)
+
+
+class SqliteTaskStore(MutableMapping):
+    """
+    ``task_id -> model`` mapping persisted in SQLite.
+
+    Items are returned as fresh model instances, so changes must be written
+    back with ``store[task_id] = task``. Writes to a task whose ``stopped``
+    field is set are dropped, so a job process holding an older copy cannot
+    undo a cancellation.
+
+    Args:
+        path: Database file
+        model: Pydantic model class of the stored tasks
+    """
+
+    def __init__(self, path, model):
+        self.path = path
+        self.model = model
+        create_tables(
+            path,
+            "CREATE TABLE IF NOT EXISTS tasks "
+            "(task_id TEXT PRIMARY KEY, data TEXT NOT NULL)",
+            *(
+                f"CREATE INDEX IF NOT EXISTS tasks_{field} "
+                f"ON tasks (json_extract(data, '$.{field}'))"
+                for field in INDEXED_FIELDS
+            ),
+        )
+
+    def __getitem__(self, task_id):
+        with connect(self.path) as db:
+            row = db.execute(
+                "SELECT data FROM tasks WHERE task_id = ?", (task_id,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(task_id)
+        return self.model.model_validate_json(row[0])
+
+    def __setitem__(self, task_id, task):
+        with connect(self.path) as db:
+            db.execute(
+                "INSERT INTO tasks (task_id, data) VALUES (?, ?) "
+                "ON CONFLICT (task_id) DO UPDATE SET data = excluded.data "
+                "WHERE NOT coalesce(json_extract(tasks.data, '$.stopped'), 0)",
+                (task_id, task.model_dump_json()),
+            )
+
+    def __delitem__(self, task_id):
+        with connect(self.path) as db:
+            deleted = db.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+        if not deleted.rowcount:
+            raise KeyError(task_id)
+
+    def __contains__(self, task_id):
+        with connect(self.path) as db:
+            return (
+                db.execute(
+                    "SELECT 1 FROM tasks WHERE task_id = ?", (task_id,)
+                ).fetchone()
+                is not None
+            )
+
+    def __iter__(self):
+        with connect(self.path) as db:
+            task_ids = [row[0] for row in db.execute("SELECT task_id FROM tasks")]
+        return iter(task_ids)
+
+    def __len__(self):
+        with connect(self.path) as db:
+            return db.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def values(self):
+        with connect(self.path) as db:
+            rows = db.execute("SELECT data FROM tasks").fetchall()
+        return [self.model.model_validate_json(row[0]) for row in rows]
+
+    def find(self, field, value):
+        """Tasks whose ``field`` equals ``value``."""
+        if field not in INDEXED_FIELDS:
+            raise ValueError(f"Task field is not indexed: {field}")
+        with connect(self.path) as db:
+            rows = db.execute(
+                f"SELECT data FROM tasks WHERE json_extract(data, '$.{field}') = ?",
+                (value,),
+            ).fetchall()
+        return [self.model.model_validate_json(row[0]) for row in rows]
+
+
+class SqliteStageStore:
+    """
+    Stage duration histograms persisted in SQLite (see telemetry.use_store).
+
+    Args:
+        path: Database file
+    """
+
+    def __init__(self, path):
+        self.path = path
+        create_tables(
+            path,
+            "CREATE TABLE IF NOT EXISTS stage_histograms (stage TEXT PRIMARY KEY, "
+            "bucket_counts TEXT NOT NULL, count INTEGER NOT NULL, sum REAL NOT NULL)",
+        )
+
+    @staticmethod
+    def _histogram(bucket_counts, count, total):
+        histogram = Histogram()
+        histogram.bucket_counts = json.loads(bucket_counts)
+        histogram.count = count
+        histogram.sum = total
+        return histogram
+
+    def observe(self, stage, seconds):
+        with connect(self.path) as db:
+            with transaction(db):
+                row = db.execute(
+                    "SELECT bucket_counts, count, sum FROM stage_histograms "
+                    "WHERE stage = ?",
+                    (stage,),
+                ).fetchone()
+                histogram = self._histogram(*row) if row else Histogram()
+                histogram.observe(seconds)
+                db.execute(
+                    "INSERT OR REPLACE INTO stage_histograms "
+                    "(stage, bucket_counts, count, sum) VALUES (?, ?, ?, ?)",
+                    (
+                        stage,
+                        json.dumps(histogram.bucket_counts),
+                        histogram.count,
+                        histogram.sum,
+                    ),
+                )
+
+    def histograms(self):
+        with connect(self.path) as db:
+            rows = db.execute(
+                "SELECT stage, bucket_counts, count, sum FROM stage_histograms"
+            ).fetchall()
+        return {stage: self._histogram(*values) for stage, *values in rows}
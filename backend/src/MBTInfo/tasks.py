@@ -0,0 +1,269 @@
+"""
+Task status shared by the API and the report pipelines.
+
+task_storage is an in-memory dict, or an SqliteTaskStore when JOB_BACKEND is
+"sqlite" so that report workers in other processes can update it; their stage
+timings then go to the same database. Always change tasks through
+update_task_status or a progress callback: they write the task back to the
+store and notify task_listeners.
+
+Cancelled and timed-out tasks are marked with stop_task. Later updates from
+their job are ignored, and the job's next progress report raises TaskCancelled
+so a pipeline running in a thread stops at the next stage.
+"""
+
+import os
+import shutil
+from datetime import datetime, timedelta
+from typing import Optional
+
+from pydantic import BaseModel
+
+from .consts import (
+    JOB_BACKEND,
+    STAGE_TIMEOUT,
+    STAGE_TIMEOUTS,
+    TASK_DB_PATH,
+    TEMP_DIR,
+)
+from .task_store import SqliteStageStore, SqliteTaskStore
+from .telemetry import estimate_remaining, use_store
+
+
+class TaskItem(BaseModel):
+    """One file of a batch task."""
+
+    name: str
+    status: str  # "pending", "processing", "completed", "failed"
+    message: str = ""
+    file_path: Optional[str] = None
+
+
+class TaskStatus(BaseModel):
+    task_id: str
+    status: str  # "pending", "processing", "completed", "failed", "cancelled"
+    message: str
+    file_type: Optional[str] = None  # "html", "pdf", "xlsx", etc.
+    created_at: datetime
+    excel_path: Optional[str] = None  # Add this as a proper field
+    insight_pdf_url: Optional[str] = None
+    file_path: Optional[str] = None
+    stage: Optional[str] = None  # current pipeline stage, e.g. "extract"
+    items_done: Optional[int] = None  # PDFs processed so far (group and batch reports)
+    items_total: Optional[int] = None
+    started_at: Optional[datetime] = None
+    eta_at: Optional[datetime] = None  # expected finish, from past stage timings
+    # Identify repeated submissions of the same request (see find_task)
+    idempotency_key: Optional[str] = None
+    input_key: Optional[str] = None
+    items: Optional[list[TaskItem]] = None  # per-file results of batch tasks
+    deadline_at: Optional[datetime] = None  # stage timeout (see overdue)
+    stopped: bool = False  # cancelled or timed out; the job's updates are ignored
+
+
+class TaskCancelled(Exception):
+    """Raised inside a job whose task was cancelled or timed out."""
+
+
+if JOB_BACKEND == "sqlite":
+    task_storage = SqliteTaskStore(TASK_DB_PATH, TaskStatus)
+    use_store(SqliteStageStore(TASK_DB_PATH))
+else:
+    task_storage: dict[str, TaskStatus] = {}
+
+# Called with the task ID after every change (the API pushes it to /events)
+task_listeners = []
+
+
+def notify_task(task_id: str):
+    for listener in task_listeners:
+        listener(task_id)
+
+
+def update_task_status(
+    task_id: str,
+    status: str,
+    message: str,
+    file_path: Optional[str] = None,
+    **fields,
+):
+    """
+    Update a task and notify its listeners.
+
+    Does nothing once the task has been stopped. The first "processing"
+    update starts the task's overall STAGE_TIMEOUT.
+
+    Args:
+        file_path: Result file, left unchanged when None
+        **fields: Other TaskStatus fields to set (e.g. file_type); None
+            values are left unchanged
+    """
+    task = task_storage.get(task_id)
+    if task is None or task.stopped:
+        return
+
+    if status == "processing" and task.deadline_at is None:
+        task.deadline_at = stage_deadline()
+    task.status = status
+    task.message = message
+    if file_path:
+        task.file_path = file_path
+    for name, value in fields.items():
+        if value is not None:
+            setattr(task, name, value)
+    task_storage[task_id] = task
+    notify_task(task_id)
+
+
+def stage_deadline(stage: Optional[str] = None) -> datetime:
+    return datetime.now() + timedelta(seconds=STAGE_TIMEOUTS.get(stage, STAGE_TIMEOUT))
+
+
+def overdue(task: TaskStatus) -> Optional[str]:
+    """Failure message if a running task has passed its stage timeout, else None."""
+    if task.status != "processing" or task.deadline_at is None:
+        return None
+    if datetime.now() < task.deadline_at:
+        return None
+    if task.stage:
+        return f"Timed out in stage '{task.stage}'"
+    return "Timed out"
+
+
+def stop_task(task_id: str, status: str, message: str) -> bool:
+    """
+    Cancel or fail a pending or running task for good.
+
+    Args:
+        status: "cancelled" or "failed"
+
+    Returns:
+        bool: False if the task does not exist or has already finished
+    """
+    task = task_storage.get(task_id)
+    if task is None or task.stopped or task.status not in ("pending", "processing"):
+        return False
+
+    task.status = status
+    task.message = message
+    task.stopped = True
+    task_storage[task_id] = task
+    notify_task(task_id)
+    return True
+
+
+def cancellation_check(task_id: str):
+    """Progress callback that only raises TaskCancelled once the task is stopped."""
+
+    def check(stage: Optional[str] = None, done=None, total=None):
+        task = task_storage.get(task_id)
+        if task is not None and task.stopped:
+            raise TaskCancelled(task.message)
+
+    return check
+
+
+def remove_workspace(task_id: str):
+    """Delete a task's upload folder under TEMP_DIR, if it has one."""
+    shutil.rmtree(os.path.join(TEMP_DIR, task_id), ignore_errors=True)
+
+
+def _result_exists(task: TaskStatus) -> bool:
+    paths = [path for path in (task.file_path, task.excel_path) if path]
+    return all(os.path.exists(path) for path in paths)
+
+
+def find_task(field: str, value: str) -> Optional[TaskStatus]:
+    """
+    Latest task that can stand in for a repeated request.
+
+    Pending, processing and completed tasks qualify; failed ones and
+    completed ones whose result file has been cleaned up do not.
+
+    Args:
+        field: "idempotency_key" or "input_key"
+        value: Key of the new request
+    """
+    if isinstance(task_storage, SqliteTaskStore):
+        tasks = task_storage.find(field, value)
+    else:
+        tasks = [
+            task for task in task_storage.values() if getattr(task, field) == value
+        ]
+
+    reusable = [
+        task
+        for task in tasks
+        if task.status in ("pending", "processing")
+        or (task.status == "completed" and _result_exists(task))
+    ]
+    return max(reusable, key=lambda task: task.created_at, default=None)
+
+
+# Stages each pipeline runs, in order. Group reports run GROUP_ITEM_STAGES for
+# every PDF and then GROUP_FINAL_STAGES once; each stage is recorded once per
+# PDF or per report, so mean durations add up to the remaining time.
+GROUP_ITEM_STAGES = ("extract", "parse")
+GROUP_FINAL_STAGES = ("xlsx_write", "chart", "xlsx_build", "format", "xlsx_reorder")
+PIPELINE_STAGES = {
+    "personal": ("extract", "parse", "render"),
+    "dual": ("extract", "parse", "chart", "render"),
+    "translated": ("extract", "translation", "render"),
+}
+
+
+def _remaining_stages(stages, stage):
+    return stages[stages.index(stage) :] if stage in stages else stages
+
+
+def task_progress_callback(task_id: str, pipeline: str):
+    """
+    Build a progress callback that records stage progress on a task.
+
+    The callback takes ``(stage, done=None, total=None)`` and can be called
+    from a worker thread. It raises TaskCancelled once the task has been
+    stopped, and each call gives the task the STAGE_TIMEOUTS deadline of its
+    stage. The ETA is estimated from the recorded durations
+    of the stages still to run.
+
+    Args:
+        task_id: Task to update
+        pipeline: "group" or a key of PIPELINE_STAGES
+    """
+    started_at = datetime.now()
+
+    def progress(stage: str, done: Optional[int] = None, total: Optional[int] = None):
+        task = task_storage.get(task_id)
+        if task is None:
+            return
+        if task.stopped:
+            raise TaskCancelled(task.message)
+
+        if pipeline == "group" and stage not in GROUP_FINAL_STAGES:
+            remaining = estimate_remaining(
+                GROUP_ITEM_STAGES, (total or 0) - (done or 0), GROUP_FINAL_STAGES
+            )
+        elif pipeline == "group":
+            remaining = estimate_remaining(_remaining_stages(GROUP_FINAL_STAGES, stage))
+        else:
+            remaining = estimate_remaining(
+                _remaining_stages(PIPELINE_STAGES[pipeline], stage)
+            )
+
+        # Every report restarts the clock, so a group report's per-PDF
+        # stages are timed per PDF
+        task.deadline_at = stage_deadline(stage)
+        task.stage = stage
+        task.started_at = task.started_at or started_at
+        if total is not None:
+            task.items_done = done
+            task.items_total = total
+        task.eta_at = (
+            datetime.now() + timedelta(seconds=remaining)
+            if remaining is not None
+            else None
+        )
+        task_storage[task_id] = task
+        notify_task(task_id)
+
+    return progress
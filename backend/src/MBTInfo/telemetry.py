@@ -0,0 +1,205 @@
+"""
+Lightweight stage timing for the report pipelines.
+
+Wrap a pipeline stage in ``with span("extract"):`` (or decorate a function with
+``@timed("extract")``) and its duration is recorded in a per-stage histogram.
+The /metrics endpoint renders the histograms in the Prometheus text format.
+
+Histograms are kept in process memory, or in a shared store set with
+use_store (the task database with JOB_BACKEND=sqlite), so that stages timed in
+worker processes reach /metrics and the ETAs of every process.
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+# Histogram bucket upper bounds, in seconds
+STAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+STAGE_METRIC = "mbti_stage_duration_seconds"
+
+
+class Histogram:
+    """Cumulative histogram of observed durations."""
+
+    def __init__(self, buckets=STAGE_BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for index, upper_bound in enumerate(self.buckets):
+            if value <= upper_bound:
+                self.bucket_counts[index] += 1
+
+    def copy(self):
+        histogram = Histogram(self.buckets)
+        histogram.bucket_counts = list(self.bucket_counts)
+        histogram.count = self.count
+        histogram.sum = self.sum
+        return histogram
+
+
+_histograms: dict[str, Histogram] = {}
+_lock = threading.Lock()
+_store = None
+
+
+def use_store(store):
+    """
+    Keep the histograms in a shared store instead of this process's memory.
+
+    Args:
+        store: Object with ``observe(stage, seconds)`` and ``histograms()``
+            (``{stage: Histogram}``), e.g. task_store.SqliteStageStore
+    """
+    global _store
+    _store = store
+
+
+def observe(stage, seconds):
+    """Record one duration for a stage."""
+    if _store is not None:
+        _store.observe(stage, seconds)
+        return
+    with _lock:
+        if stage not in _histograms:
+            _histograms[stage] = Histogram()
+        _histograms[stage].observe(seconds)
+
+
+def histograms():
+    """Snapshot of every recorded stage's histogram, ``{stage: Histogram}``."""
+    if _store is not None:
+        return _store.histograms()
+    with _lock:
+        return {stage: histogram.copy() for stage, histogram in _histograms.items()}
+
+
+@contextmanager
+def span(stage):
+    """Time the enclosed block and record it under ``stage``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - start)
+
+
+def timed(stage):
+    """Decorator recording each call of a (sync or async) function as ``stage``."""
+
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(stage):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def no_progress(stage, done=None, total=None):
+    """Default progress callback for pipelines run outside the server."""
+
+
+def stage_stats():
+    """Return ``{stage: {"count": n, "sum": seconds}}`` for every recorded stage."""
+    return {
+        stage: {"count": histogram.count, "sum": histogram.sum}
+        for stage, histogram in histograms().items()
+    }
+
+
+def _mean(histogram):
+    if histogram is None or not histogram.count:
+        return None
+    return histogram.sum / histogram.count
+
+
+def mean_duration(stage):
+    """Mean recorded duration of a stage in seconds, or None without history."""
+    return _mean(histograms().get(stage))
+
+
+def estimate_remaining(stages, items=1, final_stages=()):
+    """
+    Estimate the time left from historical stage durations.
+
+    Args:
+        stages: Stages run once per remaining item
+        items: Number of items still to process
+        final_stages: Stages run once after the last item
+
+    Returns:
+        float seconds, or None when a stage has no recorded history
+    """
+    recorded = histograms()
+    per_item = [_mean(recorded.get(stage)) for stage in stages]
+    final = [_mean(recorded.get(stage)) for stage in final_stages]
+    if None in per_item or None in final:
+        return None
+    return sum(per_item) * items + sum(final)
+
+
+def _format_bound(bound):
+    return str(float(bound))
+
+
+def render_metrics(gauges=None):
+    """
+    Render stage histograms and extra gauges in the Prometheus text format.
+
+    Args:
+        gauges: Optional ``{name: (help text, value)}`` or
+            ``{name: (help text, {label value: value}, label name)}``
+
+    Returns:
+        str: Exposition text
+    """
+    lines = [
+        f"# HELP {STAGE_METRIC} Duration of report pipeline stages.",
+        f"# TYPE {STAGE_METRIC} histogram",
+    ]
+    for stage, histogram in sorted(histograms().items()):
+        for upper_bound, bucket_count in zip(
+            histogram.buckets, histogram.bucket_counts
+        ):
+            lines.append(
+                f'{STAGE_METRIC}_bucket{{stage="{stage}",'
+                f'le="{_format_bound(upper_bound)}"}} {bucket_count}'
+            )
+        lines.append(
+            f'{STAGE_METRIC}_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}'
+        )
+        lines.append(f'{STAGE_METRIC}_sum{{stage="{stage}"}} {histogram.sum}')
+        lines.append(f'{STAGE_METRIC}_count{{stage="{stage}"}} {histogram.count}')
+
+    for name, gauge in (gauges or {}).items():
+        help_text, value = gauge[0], gauge[1]
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        if isinstance(value, dict):
+            label = gauge[2]
+            lines += [
+                f'{name}{{{label}="{label_value}"}} {item}'
+                for label_value, item in sorted(value.items())
+            ]
+        else:
+            lines.append(f"{name} {value}")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,46 @@
+"""
+HTML templates for the generated reports.
+
+Templates are plain HTML files with string.Template ``$name`` placeholders. They
+are read and compiled once at import; report builders fill them in and join
+repeated fragments (pages, facet sections) with str.join.
+"""
+
+from pathlib import Path
+from string import Template
+
+TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
+
+
+def load_templates(directory):
+    """
+    Load every ``*.html`` template in a directory.
+
+    Args:
+        directory: Directory containing the template files
+
+    Returns:
+        dict mapping the file stem (e.g. "personal_report") to a Template
+    """
+    return {
+        path.stem: Template(path.read_text(encoding="utf-8"))
+        for path in sorted(Path(directory).glob("*.html"))
+    }
+
+
+TEMPLATES = load_templates(TEMPLATES_DIR)
+
+
+def render_template(name, templates=None, /, **values):
+    """
+    Fill in a template.
+
+    Args:
+        name: Template name (file stem)
+        templates: Template mapping to look in (defaults to this package's)
+        **values: Placeholder values (any name, including ``name``)
+
+    Returns:
+        str: The rendered HTML
+    """
+    return (templates or TEMPLATES)[name].substitute(values)
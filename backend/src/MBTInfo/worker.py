@@ -0,0 +1,142 @@
+"""
+Report worker: runs queued report jobs outside the API process.
+
+Start the API with JOB_BACKEND=sqlite and run any number of workers against
+the same TASK_DB_PATH (and the same OUTPUT_DIR and /tmp/tmp_pdf, since jobs
+read the uploads and write reports there):
+
+    JOB_BACKEND=sqlite python -m MBTInfo.worker [--lane interactive] [--poll 1]
+
+Each worker runs one job at a time. Interactive jobs are taken before batch
+jobs; a worker started with ``--lane interactive`` only takes interactive
+jobs, which reserves it for personal, dual, insight and translation reports.
+
+Every job runs in a forked child process so that a cancelled job, or one stuck
+past its stage timeout (e.g. in a WeasyPrint render), can be killed without
+losing the warmed-up worker. The worker sends a heartbeat for the job while it
+runs; jobs left running by a worker that was killed get no heartbeat, and any
+worker fails them after JOB_STALE_SECONDS.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import time
+
+from .background import JOB_FUNCTIONS
+from .consts import (
+    JOB_BACKEND,
+    JOB_CAPACITY,
+    JOB_LANES,
+    JOB_STALE_SECONDS,
+    MAX_QUEUED_JOBS,
+    TASK_DB_PATH,
+)
+from .jobs import SqliteJobQueue
+from .renderer import warm_up
+from .tasks import (
+    overdue,
+    remove_workspace,
+    stop_task,
+    task_storage,
+    update_task_status,
+)
+
+# Failure message of tasks whose job was cut off by its worker stopping
+WORKER_STOPPED = "Worker stopped while running the job"
+
+
+def lane_kinds(lane=None):
+    """Job kinds a worker takes, interactive kinds first."""
+    kinds = [kind for kind in JOB_CAPACITY if lane is None or JOB_LANES[kind] == lane]
+    return sorted(kinds, key=lambda kind: JOB_LANES[kind] != "interactive")
+
+
+def _run_job(func_name, args):
+    asyncio.run(JOB_FUNCTIONS[func_name](*args))
+
+
+def _should_kill(task_id):
+    """Stop the task if it has timed out; True if its job must be killed."""
+    task = task_storage.get(task_id)
+    if task is None or task.stopped:
+        return True
+    message = overdue(task)
+    return message is not None and stop_task(task_id, "failed", message)
+
+
+def fail_stale_jobs(queue):
+    """Fail the tasks of jobs left running by a worker that is gone."""
+    for task_id in queue.reclaim_stale(JOB_STALE_SECONDS):
+        if stop_task(task_id, "failed", WORKER_STOPPED):
+            remove_workspace(task_id)
+            print(f"🧹 Failed task {task_id} of a stopped worker")
+
+
+def run_worker(queue, kinds, name, poll_seconds):
+    print(f"👷 Worker {name} taking {', '.join(kinds)} jobs from {queue.path}")
+    context = multiprocessing.get_context("fork")
+    fail_stale_jobs(queue)
+    while True:
+        job = queue.claim(kinds, name)
+        if job is None:
+            fail_stale_jobs(queue)
+            time.sleep(poll_seconds)
+            continue
+
+        job_id, task_id, func_name, args = job
+        print(f"▶️ Running {func_name} for task {task_id}")
+        process = context.Process(target=_run_job, args=(func_name, args))
+        process.start()
+        try:
+            while process.is_alive():
+                process.join(poll_seconds)
+                queue.heartbeat(job_id)
+                if process.is_alive() and _should_kill(task_id):
+                    process.kill()
+                    process.join()
+                    remove_workspace(task_id)
+                    print(f"🛑 Killed {func_name} for task {task_id}")
+            if process.exitcode:
+                # Jobs report their own failures; this only catches crashes,
+                # so the task does not stay "processing" forever (ignored for
+                # killed jobs, whose task is already stopped)
+                update_task_status(
+                    task_id,
+                    "failed",
+                    f"Worker error: job exited with code {process.exitcode}",
+                )
+        except KeyboardInterrupt:
+            process.kill()
+            process.join()
+            if stop_task(task_id, "failed", WORKER_STOPPED):
+                remove_workspace(task_id)
+            raise
+        finally:
+            queue.finish(job_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run queued MBTI report jobs")
+    parser.add_argument("--lane", choices=sorted(set(JOB_LANES.values())))
+    parser.add_argument(
+        "--poll", type=float, default=1.0, help="Seconds between queue checks"
+    )
+    args = parser.parse_args()
+
+    if JOB_BACKEND != "sqlite":
+        parser.error("set JOB_BACKEND=sqlite (and the same TASK_DB_PATH as the API)")
+
+    warm_up()
+    queue = SqliteJobQueue(TASK_DB_PATH, lane_kinds(), MAX_QUEUED_JOBS)
+    name = f"{socket.gethostname()}:{os.getpid()}"
+    try:
+        run_worker(queue, lane_kinds(args.lane), name, args.poll)
+    except KeyboardInterrupt:
+        print(f"👋 Worker {name} stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,4 @@
 import asyncio
-import base64
 import os
 import sys
 
@@ -27,7 +26,20 @@ parent_dir = os.path.abspath(
 sys.path.append(parent_dir)
 
 
-async def create_translated_pdf(input_file, task_dir):
+async def create_translated_pdf(input_file, task_dir, *, render_pdf, span, progress):
+    """
+    Translate an MBTI report PDF to Hebrew and render the translated report.
+
+    The API imports MBTInfo under another package name than MBTInterpret
+    would, so its renderer and telemetry are passed in: importing them here
+    would load second copies, rendering outside the warm render pool and
+    recording timings that /metrics and the ETAs never see.
+
+    Args:
+        render_pdf: The caller's renderer.render_pdf
+        span: The caller's telemetry.span
+        progress: Called as ``progress(stage)`` before each stage
+    """
     # Extract text from the PDF file
     # Create subdirectories within task_dir for organization
     output_dir = os.path.join(task_dir, "text")
@@ -36,22 +48,25 @@ async def create_translated_pdf(input_file, task_dir):
     media_dir = os.path.join(task_dir, "images")
     os.makedirs(output_dir, exist_ok=True)
     os.makedirs(media_dir, exist_ok=True)
-    all_images_path = extract_all_graphs(input_file, media_dir)
-    encoded_image_list = [
-        encode_image_base64(all_images_path[0]),  # first graph
-        encode_image_base64(all_images_path[1]),  # EI graph
-        encode_image_base64(all_images_path[2]),  # TF graph
-        encode_image_base64(all_images_path[3]),  # JP graph
-        encode_image_base64(all_images_path[4]),  # SN graph
-        encode_image_base64(all_images_path[5]),  # dominant graph
-        encode_image_base64(all_images_path[6]),  # last graph
-    ]
-    extracted_text_path = process_pdf_file(input_file, lines_to_remove, output_dir)
+    progress("extract")
+    with span("extract"):
+        all_images_path = await asyncio.to_thread(
+            extract_all_graphs, input_file, media_dir
+        )
+    for image_path in all_images_path[:7]:
+        if not os.path.exists(image_path):
+            raise FileNotFoundError(f"Image file not found: {image_path}")
+    with span("extract"):
+        extracted_text_path = await asyncio.to_thread(
+            process_pdf_file, input_file, lines_to_remove, output_dir
+        )
     try:
         # read the translated text from the Hebrew file
         with open(extracted_text_path, encoding="utf-8") as f:
             cleaned_text = f.read()
-            translated_text = await translate_to_hebrew(cleaned_text)
+            progress("translation")
+            with span("translation"):
+                translated_text = await translate_to_hebrew(cleaned_text)
             os.makedirs(output_dir, exist_ok=True)
             translated_file_path = os.path.join(
                 output_dir, f"{base_name}_translated_raw.txt"
@@ -81,27 +96,36 @@ async def create_translated_pdf(input_file, task_dir):
     first_page_title = 'דו"ח MBTI בתרגום לעברית עבור: '
     if not os.path.exists(logo_path):
         raise FileNotFoundError(f"Logo file not found at {logo_path}")
-    generate_mbti_report(
+    progress("render")
+    await asyncio.to_thread(
+        generate_mbti_report,
         fixes_translated_text_path,
         html_path,
         output_pdf,
         logo_path,
         first_page_title,
-        encoded_image_list,
+        all_images_path[:7],  # first, EI, TF, JP, SN, dominant and last graphs
+        render_pdf,
     )
     if not os.path.exists(output_pdf):
         raise FileNotFoundError(f"Final PDF was not generated at {output_pdf}")
     return output_pdf
 
 
-def encode_image_base64(path):
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"Image file not found: {path}")
-    with open(path, "rb") as img_file:
-        return base64.b64encode(img_file.read()).decode("utf-8")
-
-
 if __name__ == "__main__":
     input_file = r"F:\projects\MBTInfo\input\Nevo-Bashevkin-267149-c3a1ca5c-ddae-ef11-8474-000d3a5b2c4e.pdf"
     output_file = r"F:\projects\MBTInfo\input\Nevo-Bashevkin-267149-c3a1ca5c-ddae-ef11-8474-000d3a5b2c4e_translated.pdf"
-    print(asyncio.run(create_translated_pdf(input_file, output_file)))
+    from MBTInfo.renderer import render_pdf
+    from MBTInfo.telemetry import no_progress, span
+
+    print(
+        asyncio.run(
+            create_translated_pdf(
+                input_file,
+                output_file,
+                render_pdf=render_pdf,
+                span=span,
+                progress=no_progress,
+            )
+        )
+    )
@@ -1,10 +1,10 @@
-import base64
 import logging
 import os
 import pathlib
 import re
 
-from weasyprint import HTML
+from MBTInfo.renderer import save_render_artifact, task_url
+from MBTInfo.templating import load_templates, render_template
 
 # Suppress verbose logs from weasyprint and fontTools
 logging.getLogger("weasyprint").setLevel(logging.WARNING)
@@ -13,12 +13,33 @@ logging.getLogger("fontTools.subset").setLevel(logging.WARNING)
 logging.getLogger("fontTools.ttLib").setLevel(logging.WARNING)
 logging.getLogger("fontTools.subset.timer").setLevel(logging.WARNING)
 
+TEMPLATES = load_templates(pathlib.Path(__file__).resolve().parent / "templates")
+
+# Report page index -> index in the graph list, for pages that show a graph
+# after / before their text
+GRAPH_AFTER_TEXT_PAGES = {2: 0}
+GRAPH_BEFORE_TEXT_PAGES = {4: 1, 5: 4, 6: 2, 7: 3, 12: 5, 15: 6}
+
 
 def generate_mbti_report(
-    input_file, output_html, output_pdf, logo_path, first_title, image_list
+    input_file, output_html, output_pdf, logo_path, first_title, image_list, render_pdf
 ):
-    # File paths
-    header_image_url = pathlib.Path(logo_path).absolute().as_uri()
+    """
+    Render the translated report of a translated text file.
+
+    Args:
+        render_pdf: The caller's renderer.render_pdf (see create_translated_pdf)
+    """
+    # Logo and graphs are handed to the renderer as bytes and referenced by
+    # task:// URLs instead of being base64-encoded into the HTML
+    report_id = pathlib.Path(output_pdf).stem
+    header_image_url = task_url(report_id, "logo.png")
+    resources = {header_image_url: pathlib.Path(logo_path).read_bytes()}
+    image_urls = []
+    for index, image_path in enumerate(image_list):
+        image_url = task_url(report_id, f"graph_{index}.png")
+        resources[image_url] = pathlib.Path(image_path).read_bytes()
+        image_urls.append(image_url)
     # Read and split text
     with open(input_file, encoding="utf-8") as f:
         text = f.read()
@@ -33,15 +54,20 @@ def generate_mbti_report(
     footer_static_text = "All rights reserved. TEMBTI©."
     # Build HTML
     html_content = generate_html_content(
-        header_image_url, pages, image_list, footer_static_text, first_title
+        header_image_url, pages, image_urls, footer_static_text, first_title
     )
 
-    # Save HTML
-    with open(output_html, "w", encoding="utf-8") as f:
-        f.write(html_content)
+    # Keep the HTML only when debugging; the PDF is rendered from the string
+    save_render_artifact(html_content, output_html)
 
     # Generate PDF
-    HTML(output_html).write_pdf(output_pdf)
+    render_pdf(
+        html_content,
+        output_pdf,
+        template="translated",
+        base_url=os.path.dirname(os.path.abspath(output_html)),
+        resources=resources,
+    )
 
     # Open HTML and PDF
     # webbrowser.open(f'file://{os.path.abspath(output_html)}')
@@ -66,111 +92,10 @@ def apply_formatting(text):
     return text
 
 
-def encode_image_base64(path):
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"Image file not found: {path}")
-    with open(path, "rb") as img_file:
-        return base64.b64encode(img_file.read()).decode("utf-8")
-
-
 def generate_html_content(
     header_image_url, pages, image_path_list, footer_static_text, first_page_title
 ):
-    html_head = f"""
-    <!DOCTYPE html>
-    <html lang="he" dir="rtl">
-    <head>
-        <meta charset="UTF-8">
-        <link href="https://fonts.googleapis.com/css2?family=Assistant:wght@200&display=swap" rel="stylesheet">
-        <style>
-            @font-face {{
-                font-family: 'Assistant';
-                src: url('fonts/Assistant-Regular.woff2') format('woff2'),
-                     url('fonts/Assistant-Regular.woff') format('woff');
-                font-weight: 400;
-                font-style: normal;
-            }}
-            @font-face {{
-                font-family: 'Assistant';
-                src: url('fonts/Assistant-Bold.woff2') format('woff2'),
-                     url('fonts/Assistant-Bold.woff') format('woff');
-                font-weight: 700;
-                font-style: normal;
-            }}
-            @page {{
-                size: A4;
-                margin: 120px 60px 80px 60px;
-                @bottom-center {{
-                    content: "{footer_static_text}";
-                    font-size: 12px;
-                }}
-                @bottom-left {{
-                    content: counter(page);
-                    font-size: 18px;
-                    font-weight: bold;
-                }}
-            }}
-            @page :first {{
-                @bottom-left {{
-                content: none;}}
-            }}
-            html, body {{
-                height: 100%;
-                overflow-y: scroll; /* Always show vertical scrollbar */
-            }}
-            body {{
-                font-family: 'Assistant', sans-serif;
-                direction: rtl;
-                font-size: 16px;
-                line-height: 1.3;
-                color: #000;
-                counter-reset: page 1;
-                margin: 0; /* Ensure no default margin */
-            }}
-            b {{
-                font-weight: bold;
-            }}
-            header {{
-                position: fixed;
-                top: -100px;
-                left: 0;
-                right: 0;
-                text-align: center;
-            }}
-            header img {{
-                height: 70px;
-            }}
-            .page {{
-                page-break-after: always;
-            }}
-            main {{
-                white-space: pre-wrap;
-            }}
-            .first-page {{
-                text-align: center;
-            }}
-            .first-page-title {{
-                font-size: 24px;
-                font-weight: bold;
-                margin-bottom: 50px;
-                color: #333;
-                text-decoration: underline;
-                padding-bottom: 10px;
-            }}
-            main img {{
-                max-width: 100%;
-                display: block;
-                margin: 0 auto;
-            }}
-            b {{
-                font-weight: bold;
-            }}
-        </style>
-    </head>
-    <body>
-    """
-
-    html_body = ""
+    html_pages = []
     page_count = 1
     for index, page in enumerate(pages):
         page_content = re.sub(r"^\d+\s+---\s*", "", page).replace("\n", "<br>")
@@ -181,99 +106,37 @@ def generate_html_content(
             continue
 
         if index == 0:
-            html_body += f"""
-            <div class="page first-page">
-                <header><img src="{header_image_url}" alt="Header Image"></header>
-                <main>
-                    <div class="first-page-title">{first_page_title}</div><p>{page_content}</p>
-                </main>
-            </div>
-            """
-        elif index == 2:
-            html_body += f"""
-            <div class="page page-{page_count}">
-                <header><img src="{header_image_url}" alt="Header Image"></header>
-                <main>
-                    <p>{page_content}</p>
-                    <img src="data:image/png;base64,{image_path_list[0]}" alt="first Graph">
-
-                </main>
-            </div>
-            """
-        elif index == 4:
-            html_body += f"""
-            <div class="page page-{page_count}">
-                <header><img src="{header_image_url}" alt="Header Image"></header>
-                <main>
-                    <img src="data:image/png;base64,{image_path_list[1]}" alt="first Graph">
-                    <p>{page_content}</p>
-                </main>
-            </div>
-            """
-        elif index == 5:
-            html_body += f"""
-            <div class="page page-{page_count}">
-                <header><img src="{header_image_url}" alt="Header Image"></header>
-                <main>
-                    <img src="data:image/png;base64,{image_path_list[4]}" alt="first Graph">
-                    <p>{page_content}</p>
-                </main>
-            </div>
-            """
-        elif index == 6:
-            html_body += f"""
-            <div class="page page-{page_count}">
-                <header><img src="{header_image_url}" alt="Header Image"></header>
-                <main>
-                    <img src="data:image/png;base64,{image_path_list[2]}" alt="first Graph">
-                    <p>{page_content}</p>
-                </main>
-            </div>
-            """
-        elif index == 7:
-            html_body += f"""
-            <div class="page page-{page_count}">
-                <header><img src="{header_image_url}" alt="Header Image"></header>
-                <main>
-                    <img src="data:image/png;base64,{image_path_list[3]}" alt="first Graph">
-                    <p>{page_content}</p>
-                </main>
-            </div>
-            """
-        elif index == 12:
-            html_body += f"""
-            <div class="page page-{page_count}">
-                <header><img src="{header_image_url}" alt="Header Image"></header>
-                <main>
-                    <img src="data:image/png;base64,{image_path_list[5]}" alt="first Graph">
-                    <p>{page_content}</p>
-                </main>
-            </div>
-            """
-        elif index == 15:
-            html_body += f"""
-            <div class="page page-{page_count}">
-                <header><img src="{header_image_url}" alt="Header Image"></header>
-                <main>
-                    <img src="data:image/png;base64,{image_path_list[6]}" alt="first Graph">
-                    <p>{page_content}</p>
-                </main>
-            </div>
-            """
+            page_class = "first-page"
+            main = f'<div class="first-page-title">{first_page_title}</div><p>{page_content}</p>'
+        elif index in GRAPH_AFTER_TEXT_PAGES:
+            page_class = f"page-{page_count}"
+            graph_url = image_path_list[GRAPH_AFTER_TEXT_PAGES[index]]
+            main = f'<p>{page_content}</p>\n<img src="{graph_url}" alt="first Graph">'
+        elif index in GRAPH_BEFORE_TEXT_PAGES:
+            page_class = f"page-{page_count}"
+            graph_url = image_path_list[GRAPH_BEFORE_TEXT_PAGES[index]]
+            main = f'<img src="{graph_url}" alt="first Graph">\n<p>{page_content}</p>'
         else:
-            html_body += f"""
-            <div class="page page-{page_count}">
-                <header><img src="{header_image_url}" alt="Header Image"></header>
-                <main>
-                    <p>{page_content}</p>
-                </main>
-            </div>
-            """
+            page_class = f"page-{page_count}"
+            main = f"<p>{page_content}</p>"
+
+        html_pages.append(
+            render_template(
+                "translated_page",
+                TEMPLATES,
+                page_class=page_class,
+                header_image_url=header_image_url,
+                main=main,
+            )
+        )
         page_count += 1
 
-    html_footer = "</body></html>"
-
-    return html_head + html_body + html_footer
+    return render_template(
+        "translated_report",
+        TEMPLATES,
+        footer_text=footer_static_text,
+        pages="\n".join(html_pages),
+    )
 
 
 if __name__ == "__main__":
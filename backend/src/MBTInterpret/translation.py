@@ -5,11 +5,13 @@ import time
 from dotenv import load_dotenv
 from openai import AsyncOpenAI
 
+from MBTInfo.consts import STAGE_TIMEOUTS
+
 from .constsAI import SYSTEM_PROMPT
 
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+client = AsyncOpenAI(api_key=OPENAI_API_KEY, timeout=STAGE_TIMEOUTS["translation"])
 
 
 def read_text_file(file_path):
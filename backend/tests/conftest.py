@@ -0,0 +1,8 @@
+import os
+from pathlib import Path
+
+# The translation client is created at import and needs a key; tests make no
+# OpenAI calls
+os.environ.setdefault("OPENAI_API_KEY", "test")
+# Media (e.g. the report logo) from this checkout rather than /app
+os.environ.setdefault("PROJECT_BASE_DIR", str(Path(__file__).resolve().parents[2]))
@@ -0,0 +1,81 @@
+"""
+The translate job must render through the API's warm render pool and record
+its stage timings in the API's telemetry.
+
+The Docker image starts the API as ``backend.src.MBTInfo.server`` while
+MBTInterpret is a top-level package, so MBTInfo is imported under that name
+here, as in production.
+"""
+
+import asyncio
+from concurrent.futures import Future
+from datetime import datetime
+
+from backend.src.MBTInfo import background, renderer, telemetry
+from backend.src.MBTInfo.tasks import PIPELINE_STAGES, TaskStatus, task_storage
+from synthetic import generate_reports
+
+import MBTInterpret.main as translate_main
+
+STAGES = PIPELINE_STAGES["translated"]
+
+
+class RecordingPool:
+    """Render pool stand-in that records renders and writes empty PDFs."""
+
+    def __init__(self):
+        self.renders = []
+
+    def submit(self, func, html, output_path, template, base_url, resources):
+        self.renders.append((output_path, template))
+        open(output_path, "wb").close()
+        future = Future()
+        future.set_result(output_path)
+        return future
+
+
+async def untranslated(text):
+    return text
+
+
+def run_translate_job(tmp_path, monkeypatch, pool):
+    monkeypatch.setattr(renderer, "_render_pool", pool)
+    monkeypatch.setattr(background, "TEMP_DIR", str(tmp_path))
+    # No OpenAI call; the English text has no Hebrew type qualities to insert
+    monkeypatch.setattr(translate_main, "translate_to_hebrew", untranslated)
+    monkeypatch.setattr(translate_main, "fixed_text_data", lambda *args: {})
+    pdf_path = generate_reports(str(tmp_path / "input"), 1)[0]
+    task_id = "translate-render-test"
+    monkeypatch.setitem(
+        task_storage,
+        task_id,
+        TaskStatus(
+            task_id=task_id, status="pending", message="", created_at=datetime.now()
+        ),
+    )
+
+    asyncio.run(background.translate_pdf_background(task_id, pdf_path))
+
+    task = task_storage[task_id]
+    assert task.status == "completed", task.message
+    return task
+
+
+def test_translate_job_renders_in_render_pool(tmp_path, monkeypatch):
+    pool = RecordingPool()
+    task = run_translate_job(tmp_path, monkeypatch, pool)
+    assert pool.renders == [(task.file_path, "translated")]
+
+
+def test_translate_job_stages_reach_api_telemetry(tmp_path, monkeypatch):
+    def counts():
+        stats = telemetry.stage_stats()
+        return {stage: stats.get(stage, {}).get("count", 0) for stage in STAGES}
+
+    before = counts()
+    run_translate_job(tmp_path, monkeypatch, RecordingPool())
+    after = counts()
+    # Graph and text extraction are timed separately
+    assert after["extract"] - before["extract"] == 2
+    assert after["translation"] - before["translation"] == 1
+    assert after["render"] - before["render"] == 1
@@ -370,59 +370,97 @@ function resetFormState(formId) {
     }
 }
 
-// Updated pollTaskStatus function with better button management
-async function pollTaskStatus(taskId, statusElementId, formId) {
-    const maxAttempts = 60;
-    let attempts = 0;
+// Show a task status update; returns true once the task has finished
+function applyTaskStatus(taskId, status, statusElementId, formId) {
+    if (status.progress !== undefined) {
+        updateProgress(statusElementId, status.progress);
+    }
 
-    const poll = async () => {
-        try {
-            const response = await fetch(`${BASE_URL}/status/${taskId}`);
-            const status = await response.json();
+    const statusIcon = {
+        'pending': '⏳',
+        'processing': '🔄',
+        'completed': '✅',
+        'failed': '❌',
+        'cancelled': '🚫'
+    };
 
-            if (status.progress !== undefined) {
-                updateProgress(statusElementId, status.progress);
-            }
+    let progressText = '';
+    if (status.status === 'processing') {
+        if (status.items_total) {
+            progressText += ` (${status.items_done}/${status.items_total} files)`;
+        }
+        if (status.eta_seconds !== null && status.eta_seconds !== undefined) {
+            progressText += ` ~${Math.ceil(status.eta_seconds)}s left`;
+        }
+    }
 
-            const statusIcon = {
-                'pending': '⏳',
-                'processing': '🔄',
-                'completed': '✅',
-                'failed': '❌'
-            };
+    if (statusElementId !== 'dualStatus') {
+        showStatus(statusElementId,
+            `${statusIcon[status.status] || '🔄'} <strong>${status.status.toUpperCase()}:</strong> ${status.message}${progressText}`,
+            ['failed', 'cancelled'].includes(status.status) ? 'error' : (status.status === 'completed' ? 'success' : 'processing')
+        );
+    }
+
+    if (status.status === 'completed') {
+        hideLoadingOverlay();
 
-            if (statusElementId !== 'dualStatus') {
-                showStatus(statusElementId,
-                    `${statusIcon[status.status] || '🔄'} <strong>${status.status.toUpperCase()}:</strong> ${status.message}`,
-                    status.status === 'failed' ? 'error' : (status.status === 'completed' ? 'success' : 'processing')
-                );
+        // Handle download button for all form types
+        if (formId === 'personalForm' || formId === 'groupZipForm' || formId === 'dualForm' || formId === 'translateForm') {
+            // Determine which endpoint to use based on available file types
+            let downloadUrl;
+            if (status.excel_path) {
+                // Task has Excel file - use Excel endpoint
+                downloadUrl = `${BASE_URL}/report/${taskId}/excel`;
+            } else {
+                // Task has PDF file - use PDF endpoint
+                downloadUrl = `${BASE_URL}/report/${taskId}/pdf`;
             }
+            showDownloadButton(formId, downloadUrl, null);
+        }
 
-            if (status.status === 'completed') {
-                hideLoadingOverlay();
+        // Enable Get Insight button for PDF reports
+        if (status.file_type === 'pdf_view') {
+            enableGetInsightButton(formId, taskId, statusElementId);
+        }
 
-                // Handle download button for all form types
-                if (formId === 'personalForm' || formId === 'groupZipForm' || formId === 'dualForm' || formId === 'translateForm') {
-                    // Determine which endpoint to use based on available file types
-                    let downloadUrl;
-                    if (status.excel_path) {
-                        // Task has Excel file - use Excel endpoint
-                        downloadUrl = `${BASE_URL}/report/${taskId}/excel`;
-                    } else {
-                        // Task has PDF file - use PDF endpoint
-                        downloadUrl = `${BASE_URL}/report/${taskId}/pdf`;
-                    }
-                    showDownloadButton(formId, downloadUrl, null);
-                }
+        return true;
+    } else if (status.status === 'failed' || status.status === 'cancelled') {
+        hideLoadingOverlay();
+        return true;
+    }
+    return false;
+}
 
-                // Enable Get Insight button for PDF reports
-                if (status.file_type === 'pdf_view') {
-                    enableGetInsightButton(formId, taskId, statusElementId);
-                }
+// Follow a task through the server's event stream, falling back to polling
+function pollTaskStatus(taskId, statusElementId, formId) {
+    if (!window.EventSource) {
+        pollTaskStatusFallback(taskId, statusElementId, formId);
+        return;
+    }
 
-                return;
-            } else if (status.status === 'failed') {
-                hideLoadingOverlay();
+    const source = new EventSource(`${BASE_URL}/events/${taskId}`);
+    source.addEventListener('status', (event) => {
+        if (applyTaskStatus(taskId, JSON.parse(event.data), statusElementId, formId)) {
+            source.close();
+        }
+    });
+    source.onerror = () => {
+        // Stream unavailable or dropped (e.g. a proxy timeout): poll instead
+        source.close();
+        pollTaskStatusFallback(taskId, statusElementId, formId);
+    };
+}
+
+async function pollTaskStatusFallback(taskId, statusElementId, formId) {
+    const maxAttempts = 60;
+    let attempts = 0;
+
+    const poll = async () => {
+        try {
+            const response = await fetch(`${BASE_URL}/status/${taskId}`);
+            const status = await response.json();
+
+            if (applyTaskStatus(taskId, status, statusElementId, formId)) {
                 return;
             }
 
@@ -1000,7 +1038,7 @@ function pollInsightStatus(taskId, statusId, formId, btn) {
                 }
 
                 return;
-            } else if (status.status === 'failed') {
+            } else if (status.status === 'failed' || status.status === 'cancelled') {
                 hideLoadingOverlay();
                 console.log('Task failed');
                 if (btn) {
@@ -1255,7 +1293,7 @@ function pollGroupInsightStatus(taskId) {
                 }
 
                 return;
-            } else if (status.status === 'failed') {
+            } else if (status.status === 'failed' || status.status === 'cancelled') {
                 hideLoadingOverlay();
                 console.log('Group insight failed');
                 return;